@@ -0,0 +1,83 @@
+"""
+Cold-start benchmark: time from launching the game to its first prompt.
+
+Starts `python -m src.main` in a fresh interpreter several times, measures
+how long it takes for the main menu prompt to appear, then answers it with
+Exit. With --imports it also runs the startup under `python -X importtime`
+and lists the slowest imports (cumulative, including their own imports).
+
+The game runs against the project's own data/ as it would for a player,
+but only reads it: choosing Exit at the menu saves nothing.
+
+Usage (from the project root):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --imports
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROMPT = b"Enter your choice (1-3): "
+
+
+def time_to_prompt() -> float:
+    """Launch the game once and return the seconds until its menu prompt is printed."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-u", "-m", "src.main"], cwd=PROJECT_ROOT,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output = b""
+    while not output.endswith(PROMPT):
+        chunk = process.stdout.read1(4096)
+        if not chunk:
+            raise RuntimeError(f"The game exited before showing its menu:\n{output.decode(errors='replace')}")
+        output += chunk
+    elapsed = time.perf_counter() - start
+    process.communicate(b"3\n", timeout=30)
+    return elapsed
+
+
+def slowest_imports(count: int) -> List[Tuple[float, str]]:
+    """Import the game under -X importtime and return the slowest imports as (milliseconds, module)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports.append((int(cumulative) / 1000, module.rstrip()))
+    imports.sort(reverse=True)
+    return imports[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the game's time to first prompt")
+    parser.add_argument("--runs", type=int, default=10, help="Launches to time (default: 10)")
+    parser.add_argument("--imports", action="store_true", help="Also list the slowest imports")
+    args = parser.parse_args()
+
+    timings = [time_to_prompt() for _ in range(args.runs)]
+    print(f"Time to first prompt over {args.runs} launches: "
+          f"best {min(timings) * 1000:.0f} ms, median {statistics.median(timings) * 1000:.0f} ms, "
+          f"worst {max(timings) * 1000:.0f} ms")
+
+    if args.imports:
+        print("\nSlowest imports (cumulative ms):")
+        for milliseconds, module in slowest_imports(15):
+            print(f"{milliseconds:>9.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Shared setup for the benchmarks: generated content and a headless game engine."""
+
+import json
+import math
+import os
+import shutil
+import sys
+from typing import Dict, List
+
+# Allow importing the game engine when run as a script from benchmarks/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from src.data_manager import DataManager
+from src.character_manager import CharacterManager
+from src.world_manager import WorldManager
+from src.combat_manager import CombatManager
+from src.commands import CommandHandler
+
+START_ROOM = "forest_clearing_001"
+HEAVY_ROOM = "heavy_room_001"
+PLAYER = "Bencher"
+
+# Directions used by the generated grid, with the way back
+GRID_DIRECTIONS = {"north": (0, -1, "south"), "south": (0, 1, "north"), "east": (1, 0, "west"), "west": (-1, 0, "east")}
+
+
+def grid_room_id(x: int, y: int) -> str:
+    return START_ROOM if (x, y) == (0, 0) else f"grid_{x}_{y}_001"
+
+
+def make_grid_world(rooms: int, item_ids: List[str]) -> Dict:
+    """
+    A square grid of rooms around the start room (which keeps the merchant),
+    with an item in every seventh room and a storeroom up from the start
+    whose item list the take-all scenario refills.
+    """
+    side = max(2, math.isqrt(max(rooms - 1, 1)) + 1)
+    low = -(side // 2)
+    world = {"name": "Benchmark Grid", "description": "Generated for benchmarks", "rooms": []}
+    count = 0
+    for y in range(low, low + side):
+        for x in range(low, low + side):
+            exits = {}
+            for direction, (dx, dy, _) in GRID_DIRECTIONS.items():
+                if low <= x + dx < low + side and low <= y + dy < low + side:
+                    exits[direction] = grid_room_id(x + dx, y + dy)
+            room = {
+                "id": grid_room_id(x, y),
+                "short_desc": f"Grid room {x},{y}",
+                "long_desc": f"A plain benchmark room at {x},{y}. The walls are featureless and grey.",
+                "exits": exits,
+                "items": [item_ids[count % len(item_ids)]] if count % 7 == 0 else [],
+                "npcs": ["merchant_001"] if (x, y) == (0, 0) else []
+            }
+            world["rooms"].append(room)
+            count += 1
+
+    start = next(room for room in world["rooms"] if room["id"] == START_ROOM)
+    start["exits"]["up"] = HEAVY_ROOM
+    world["rooms"].append({
+        "id": HEAVY_ROOM,
+        "short_desc": "A cluttered storeroom",
+        "long_desc": "Shelves sag under an impossible amount of clutter.",
+        "exits": {"down": START_ROOM},
+        "items": [],
+        "npcs": []
+    })
+    return world
+
+
+def make_data_dir(path: str, rooms: int) -> str:
+    """Create a data directory with the shipped items, NPCs, mobs and classes and a generated world."""
+    source = os.path.join(PROJECT_ROOT, "data")
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(os.path.join(path, "worlds"))
+    for filename in ("items.json", "npcs.json", "mobs.json", "classes.json"):
+        shutil.copy(os.path.join(source, filename), os.path.join(path, filename))
+    with open(os.path.join(path, "characters.json"), 'w') as f:
+        json.dump({"characters": []}, f)
+
+    with open(os.path.join(source, "items.json"), 'r') as f:
+        item_ids = [item["id"] for item in json.load(f)["items"]]
+    with open(os.path.join(path, "worlds", "default.json"), 'w') as f:
+        json.dump(make_grid_world(rooms, item_ids), f)
+    return path
+
+
+class Engine:
+    """The game's managers wired together as in Game.__init__, without the AI helper or any terminal I/O."""
+
+    def __init__(self, data_dir: str, seed: int = 1, save_interval: float = 0):
+        self.data_manager = DataManager(data_dir, save_interval=save_interval)
+        self.character_manager = CharacterManager(self.data_manager)
+        self.world_manager = WorldManager(self.data_manager)
+        self.combat_manager = CombatManager(self.data_manager, self.world_manager, seed=seed)
+        self.command_handler = CommandHandler(self.data_manager, self.character_manager, self.world_manager)
+        self.character_manager.set_world_manager(self.world_manager)
+        self.data_manager.character_manager = self.character_manager
+        self.command_handler.combat_manager = self.combat_manager
+        self.combat_manager.set_character_manager(self.character_manager)
+        self.player = PLAYER
+
+    def create_player(self, name: str = PLAYER) -> Dict:
+        """Create and load a character that can carry and afford anything."""
+        self.player = name
+        self.character_manager.create_character(name, "warrior")
+        self.character_manager.load_character(name)
+        character = self.character_manager.get_character(name)
+        character["stats"]["weight_limit"] = 1_000_000.0
+        character["money"] = 1_000_000_000
+        return character
+
+    async def run(self, command: str):
+        """Run one command as the player, the way the game loop does, with its saves batched."""
+        with self.data_manager.batched_saves():
+            return await self.command_handler.handle_command(self.player, command)
+
+    def flush(self) -> None:
+        self.data_manager.flush_characters()
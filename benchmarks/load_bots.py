@@ -0,0 +1,266 @@
+"""
+Bot load generator for capacity planning.
+
+Spawns many scripted bot sessions as asyncio tasks against one in-process
+game engine and reports throughput, tail latency and error rate every few
+seconds and for the whole run. Each bot picks its next action from a
+behaviour mix:
+
+- explore: walk through a random exit
+- fight:   attack a mob in the room (and keep attacking until the fight ends), else explore
+- trade:   list, buy and sell with a merchant in the room, else explore
+- chat:    talk to and ask an NPC in the room, else look around
+
+The game has no network server, so bots connect in-process: every command
+goes through CommandHandler exactly as typed input would. The engine tracks
+one current character, so each bot makes itself current before its command,
+and commands run one at a time; throughput is therefore that of a single
+engine process.
+
+Usage (from the project root):
+    python benchmarks/load_bots.py --bots 1000 --seconds 30
+    python benchmarks/load_bots.py --mix explore=40,fight=40,trade=10,chat=10 --think-ms 50
+    python benchmarks/load_bots.py --data-dir generated   # content from tools/generate_world.py
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+from harness import PROJECT_ROOT, Engine, grid_room_id, make_data_dir
+
+# The instrumentation histogram is reused for the bots' own latency figures
+from src.instrumentation import LatencyHistogram
+
+BEHAVIOURS = ("explore", "fight", "trade", "chat")
+# Responses that mean a command failed rather than that the game said no
+ERROR_PREFIXES = ("Error", "Character not found", "Unknown command")
+
+
+class Stats:
+    """Latency, command and error counts for one reporting window."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.error_samples: List[str] = []
+
+    def record(self, seconds: float, error: Optional[str]) -> None:
+        self.latency.record(seconds)
+        if error:
+            self.errors += 1
+            if len(self.error_samples) < 5:
+                self.error_samples.append(error)
+
+    def line(self, elapsed: float) -> str:
+        s = self.latency.summary()
+        rate = s["count"] / elapsed if elapsed else 0.0
+        error_rate = self.errors / s["count"] * 100 if s["count"] else 0.0
+        return (f"{rate:>9.0f} cmd/s  p50 {s['p50_ms']:>7.2f}  p95 {s['p95_ms']:>7.2f}  "
+                f"p99 {s['p99_ms']:>7.2f}  max {s['max_ms']:>8.2f} ms  errors {error_rate:5.2f}%")
+
+
+class Bot:
+    """One scripted session."""
+
+    def __init__(self, name: str, engine: Engine, mix: List[Tuple[str, float]], rng: random.Random):
+        self.name = name
+        self.engine = engine
+        self.mix = mix
+        self.rng = rng
+
+    @property
+    def character(self) -> Dict:
+        return self.engine.data_manager.get_character(self.name)
+
+    async def command(self, command: str, window: Stats, total: Stats) -> str:
+        """Run a command as this bot and record its latency and outcome."""
+        character_manager = self.engine.character_manager
+        start = time.perf_counter()
+        error = None
+        try:
+            if character_manager.current_character is not self.character:
+                character_manager.load_character(self.name)
+            with self.engine.data_manager.batched_saves():
+                _, response = await self.engine.command_handler.handle_command(self.name, command)
+            if response.startswith(ERROR_PREFIXES):
+                error = f"{command}: {response.splitlines()[0]}"
+        except Exception as e:
+            response = ""
+            error = f"{command}: {type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+        window.record(elapsed, error)
+        total.record(elapsed, error)
+        return response
+
+    def _room(self) -> Dict:
+        return self.engine.world_manager.get_room(self.character["current_room"]) or {}
+
+    def _pick(self) -> str:
+        roll = self.rng.random()
+        for behaviour, cumulative in self.mix:
+            if roll < cumulative:
+                return behaviour
+        return self.mix[-1][0]
+
+    async def act(self, window: Stats, total: Stats) -> None:
+        """Take one action from the behaviour mix."""
+        behaviour = self._pick()
+        room = self._room()
+        run = lambda command: self.command(command, window, total)
+
+        if self.character["combat_state"].get("in_combat"):
+            await run("attack")
+            return
+
+        if behaviour == "fight" and self.engine.world_manager.get_room_mobs(room.get("id", "")):
+            await run("attack")
+            return
+
+        npcs = [self.engine.data_manager.get_npc(npc_id) for npc_id in room.get("npcs", [])]
+        npcs = [npc for npc in npcs if npc]
+        if behaviour == "trade":
+            merchant = next((npc for npc in npcs if "merchant_data" in npc), None)
+            if merchant:
+                await self._trade(merchant, run)
+                return
+        if behaviour == "chat":
+            if npcs:
+                npc = self.rng.choice(npcs)
+                await run(f"talk {npc['name'].lower()}")
+                topics = list(npc.get("dialogue", {}).get("topics", {}))
+                if topics:
+                    await run(f"ask {npc['name'].lower()} {self.rng.choice(topics)}")
+            else:
+                await run("look")
+            return
+
+        exits = [direction for direction, target in room.get("exits", {}).items() if isinstance(target, str)]
+        await run(self.rng.choice(exits) if exits else "look")
+
+    async def _trade(self, merchant: Dict, run) -> None:
+        name = merchant["name"].lower()
+        if not self.engine.character_manager.get_known_topics(merchant["id"]):
+            topics = [topic_id for topic_id, topic in merchant.get("dialogue", {}).get("topics", {}).items()
+                      if not topic.get("requires_topic")]
+            if topics:
+                await run(f"ask {name} {topics[0]}")
+        await run("list")
+        stock = [item_id for item_id, entry in merchant["merchant_data"]["inventory"].items() if entry["quantity"] > 0]
+        if stock:
+            item = self.engine.data_manager.get_item(self.rng.choice(stock))
+            if item:
+                await run(f"buy {item['short_desc'].lower()}")
+                await run(f"sell {item['short_desc'].lower()}")
+
+
+def parse_mix(text: str) -> List[Tuple[str, float]]:
+    """Turn 'explore=60,fight=20,...' into cumulative probabilities."""
+    weights = {}
+    for part in text.split(","):
+        behaviour, _, weight = part.partition("=")
+        behaviour = behaviour.strip()
+        if behaviour not in BEHAVIOURS:
+            raise argparse.ArgumentTypeError(f"unknown behaviour '{behaviour}' (choose from {', '.join(BEHAVIOURS)})")
+        weights[behaviour] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("behaviour weights must add up to more than zero")
+    mix, cumulative = [], 0.0
+    for behaviour, weight in weights.items():
+        cumulative += weight / total
+        mix.append((behaviour, cumulative))
+    return mix
+
+
+async def run_bots(engine: Engine, args) -> Stats:
+    rng = random.Random(args.seed)
+    names = [f"Bot{i}" for i in range(args.bots)]
+    with contextlib.redirect_stdout(io.StringIO()), engine.data_manager.batched_saves():
+        for name in names:
+            if not engine.data_manager.get_character(name):
+                engine.character_manager.create_character(name, "warrior")
+    bots = [Bot(name, engine, args.mix, random.Random(rng.random())) for name in names]
+
+    total = Stats()
+    window = Stats()
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    think = args.think_ms / 1000
+
+    async def loop(bot: Bot) -> None:
+        # Stagger the start so the bots don't move in lockstep
+        await asyncio.sleep(rng.random() * think)
+        while time.perf_counter() < deadline:
+            await bot.act(window, total)
+            # Yield to the other bots even with no think time
+            await asyncio.sleep(think * bot.rng.uniform(0.5, 1.5) if think else 0)
+
+    async def report() -> None:
+        nonlocal window
+        window_start = start
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(min(args.interval, max(0.0, deadline - time.perf_counter())))
+            now = time.perf_counter()
+            print(f"[{now - start:6.1f}s] {window.line(now - window_start)}")
+            window, window_start = Stats(), now
+
+    print(f"{args.bots} bots for {args.seconds:g}s, mix {', '.join(b for b, _ in args.mix)}, "
+          f"think time {args.think_ms:g} ms\n")
+    tasks = [asyncio.create_task(loop(bot)) for bot in bots]
+    await asyncio.gather(report(), *tasks)
+    elapsed = time.perf_counter() - start
+    engine.flush()
+    print(f"\nTotal    {total.line(elapsed)}  ({total.latency.count} commands)")
+    if total.error_samples:
+        print("Sample errors:")
+        for error in total.error_samples:
+            print(f"  {error}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the game engine with many scripted bots")
+    parser.add_argument("--bots", type=int, default=100, help="Concurrent bot sessions (default: 100)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="How long to run (default: 10)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("explore=50,fight=25,trade=10,chat=15"),
+                        help="Behaviour weights (default: explore=50,fight=25,trade=10,chat=15)")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="Mean pause between a bot's actions (default: 0, as fast as possible)")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between reports (default: 2)")
+    parser.add_argument("--rooms", type=int, default=2500, help="Rooms in the generated grid (default: 2500)")
+    parser.add_argument("--data-dir", help="Use this content instead of a generated grid (bots are added to "
+                                           "its characters.json)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.data_dir:
+            if os.path.abspath(args.data_dir) == os.path.join(PROJECT_ROOT, "data"):
+                parser.error("refusing to add bots to the game's own data directory")
+            data_dir = args.data_dir
+        else:
+            data_dir = make_data_dir(os.path.join(directory, "data"), args.rooms)
+            # Give the fighters something to fight in the rooms around the start
+            mobs_path = os.path.join(data_dir, "mobs.json")
+            with open(mobs_path, 'r') as f:
+                mobs = json.load(f)
+            for mob in mobs.get("mobs", []):
+                mob["spawn_areas"] = [grid_room_id(x, y) for x in range(-3, 4) for y in range(-3, 4)]
+            with open(mobs_path, 'w') as f:
+                json.dump(mobs, f)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = Engine(data_dir, seed=args.seed, save_interval=60)
+        asyncio.run(run_bots(engine, args))
+
+
+if __name__ == "__main__":
+    main()
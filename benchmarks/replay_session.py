@@ -0,0 +1,133 @@
+"""
+Replay a recorded play session.
+
+Sessions are recorded by running the game with MUD_RECORD_DIR set. A
+recording holds the character as it was when the session began, the combat
+RNG seed and every command with the time it was typed. Replaying starts a
+headless engine on a copy of the content with that character, the same seed
+and a clock that reads the recorded times, then runs the commands back to back
+as fast as the engine allows. Combat and loot rolls, respawns and item
+resets therefore happen exactly as they did, which makes a recording both a
+reproducible bug report and a piece of real traffic to benchmark with.
+
+Each command's response is compared against a checksum taken when it was
+recorded, and the first divergence is reported. Responses written by the AI
+helper (which replays run without) and sessions that began after another
+in the same game process (with mobs already fought) can differ legitimately.
+
+Usage (from the project root):
+    python benchmarks/replay_session.py recordings/hero-20260101-120000.jsonl.gz
+    python benchmarks/replay_session.py SESSION --verbose        # print every command and response
+    python benchmarks/replay_session.py SESSION --repeat 20      # replay 20 times for steadier timings
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+from harness import PROJECT_ROOT, Engine
+
+from src.instrumentation import LatencyHistogram
+from src.recording import read_recording, response_checksum
+
+CONTENT_FILES = ("items.json", "npcs.json", "mobs.json", "classes.json")
+
+
+def make_replay_dir(path: str, source: str, character: Dict) -> str:
+    """Copy the content from a data directory, with the recorded character as the only saved one."""
+    os.makedirs(path)
+    for filename in CONTENT_FILES:
+        shutil.copy(os.path.join(source, filename), os.path.join(path, filename))
+    shutil.copytree(os.path.join(source, "worlds"), os.path.join(path, "worlds"))
+    with open(os.path.join(path, "characters.json"), 'w') as f:
+        json.dump({"characters": [character]}, f)
+    return path
+
+
+class RecordedClock:
+    """Game clock that reads whatever time the replay last set."""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def replay(header: Dict, commands: List[Tuple[float, str, Optional[int]]], data_dir: str,
+                 verbose: bool) -> Tuple[LatencyHistogram, Optional[str]]:
+    """Run a recording once. Returns its command latencies and a description of the first divergence, if any."""
+    name = header["character"]["name"]
+    with tempfile.TemporaryDirectory() as directory:
+        replay_dir = make_replay_dir(os.path.join(directory, "data"), data_dir, header["character"])
+        clock = RecordedClock(header["start"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = Engine(replay_dir, seed=header["seed"], save_interval=float("inf"))
+            engine.world_manager.clock = clock
+            engine.character_manager.load_character(name)
+        engine.player = name
+
+        latency = LatencyHistogram()
+        divergence = None
+        for number, (timestamp, command, checksum) in enumerate(commands, 1):
+            clock.now = timestamp
+            start = time.perf_counter()
+            quit_game, response = await engine.run(command)
+            latency.record(time.perf_counter() - start)
+            if verbose:
+                print(f"\n> {command}\n{response}")
+            if divergence is None and checksum is not None and response_checksum(response) != checksum:
+                divergence = f"command {number} ({command!r}) gave a different response:\n{response}"
+            if quit_game:
+                break
+    return latency, divergence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded play session against the engine")
+    parser.add_argument("recording", help="Session recording (.jsonl.gz) written with MUD_RECORD_DIR set")
+    parser.add_argument("--data-dir", default=os.path.join(PROJECT_ROOT, "data"),
+                        help="Content to replay against (default: the game's data/; it is copied, never written)")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay this many times and keep the fastest")
+    parser.add_argument("--verbose", action="store_true", help="Print every command and its response")
+    args = parser.parse_args()
+
+    try:
+        header, commands = read_recording(args.recording)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not commands:
+        print("The recording holds no commands.")
+        return
+
+    recorded_seconds = commands[-1][0] - commands[0][0]
+    print(f"{header['character']['name']}: {len(commands)} commands over {recorded_seconds:.1f}s, seed {header['seed']}")
+
+    best = None
+    for _ in range(max(1, args.repeat)):
+        latency, divergence = asyncio.run(replay(header, commands, args.data_dir, args.verbose))
+        if best is None or latency.total < best.total:
+            best = latency
+
+    summary = best.summary()
+    print(f"Replayed in {best.total * 1000:.1f} ms ({summary['count'] / best.total:.0f} commands/s, "
+          f"{recorded_seconds / best.total:.0f}x real time)")
+    print(f"Latency: mean {summary['mean_ms']:.3f}  p50 {summary['p50_ms']:.3f}  p95 {summary['p95_ms']:.3f}  "
+          f"p99 {summary['p99_ms']:.3f}  max {summary['max_ms']:.3f} ms")
+    if divergence:
+        print(f"\nDiverged from the recording at {divergence}")
+        sys.exit(1)
+    print("Every response matched the recording.")
+
+
+if __name__ == "__main__":
+    main()
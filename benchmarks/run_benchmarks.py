@@ -0,0 +1,288 @@
+"""
+Headless benchmark suite for the game engine.
+
+Drives CommandHandler directly (no stdin, no AI) through scripted scenarios
+on generated content, and reports operations per second (best of five
+rounds) and memory allocated per operation for each. Results can be saved as a baseline and
+later runs compared against it, so every performance change can be measured:
+
+    python benchmarks/run_benchmarks.py --save-baseline
+    ... make a change ...
+    python benchmarks/run_benchmarks.py --check
+
+Baselines are only comparable on the same machine. Character saves are
+batched per command as in the game, and written at most every
+--save-interval seconds (default 60) so disk sync time doesn't drown out the
+engine; pass --save-interval 0 to include it.
+
+Usage (from the project root):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenario look_spam --scenario map_large --rooms 100000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+
+from harness import HEAVY_ROOM, Engine, make_data_dir
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+ROUNDS = 5  # Timing rounds per scenario; the fastest counts
+
+Operation = Callable[[], Awaitable[None]]
+
+
+async def setup_walk_loop(engine: Engine) -> Operation:
+    """One move per operation, walking a square loop."""
+    moves = ["east", "north", "west", "south"]
+    step = 0
+
+    async def op():
+        nonlocal step
+        await engine.run(moves[step % 4])
+        step += 1
+    return op
+
+
+async def setup_look_spam(engine: Engine) -> Operation:
+    async def op():
+        await engine.run("look")
+    return op
+
+
+async def setup_take_all_heavy(engine: Engine) -> Operation:
+    """'take all' in a room holding 200 items, refilled (and the inventory emptied) before each take."""
+    await engine.run("up")
+    item_ids = [item["id"] for item in engine.data_manager.items_data["items"]]
+    heavy_items = [item_ids[i % len(item_ids)] for i in range(200)]
+    room = engine.world_manager.get_room(HEAVY_ROOM)
+    character = engine.character_manager.current_character
+
+    async def op():
+        room["items"][:] = heavy_items
+        engine.world_manager.room_changed(HEAVY_ROOM)
+        character["inventory"].clear()
+        character["world_state"]["removed_items"].clear()  # Or the taken items count as still gone
+        await engine.run("take all")
+    return op
+
+
+async def setup_look_heavy(engine: Engine) -> Operation:
+    """'look' in a room holding 200 items."""
+    await engine.run("up")
+    item_ids = [item["id"] for item in engine.data_manager.items_data["items"]]
+    engine.world_manager.get_room(HEAVY_ROOM)["items"][:] = [item_ids[i % len(item_ids)] for i in range(200)]
+    engine.world_manager.room_changed(HEAVY_ROOM)
+
+    async def op():
+        await engine.run("look")
+    return op
+
+
+async def setup_inventory_1000(engine: Engine) -> Operation:
+    """'inventory' while carrying 1,000 items."""
+    item_ids = [item["id"] for item in engine.data_manager.items_data["items"]]
+    engine.character_manager.current_character["inventory"] = [item_ids[i % len(item_ids)] for i in range(1000)]
+
+    async def op():
+        await engine.run("inventory")
+    return op
+
+
+async def setup_inventory_churn(engine: Engine) -> Operation:
+    """Drop an item and take it back while carrying 1,000, listing the inventory after each (four commands per operation)."""
+    item_ids = [item["id"] for item in engine.data_manager.items_data["items"]]
+    character = engine.character_manager.current_character
+    character["inventory"] = [item_ids[i % len(item_ids)] for i in range(1000)]
+    character["stats"]["weight_limit"] = float("inf")  # Or taking the item back fails
+    name = engine.data_manager.get_item(item_ids[0])["short_desc"]
+
+    # Every inventory follows a change, so each one is a render cache miss
+    async def op():
+        await engine.run(f"drop {name}")
+        await engine.run("inventory")
+        await engine.run(f"take {name}")
+        await engine.run("inventory")
+    return op
+
+
+async def setup_combat_to_death(engine: Engine) -> Operation:
+    """A whole fight per operation: spawn a wolf, attack it and keep attacking until it dies."""
+    character = engine.character_manager.current_character
+    world = engine.world_manager.current_world
+    room = engine.world_manager.get_room(character["current_room"])
+    wolf = engine.data_manager.get_mob("wolf_001")
+    stats = copy.deepcopy(character["stats"])
+
+    async def op():
+        character["stats"] = copy.deepcopy(stats)
+        engine.world_manager._spawn_in_room(world, room, wolf)
+        await engine.run("attack")
+        for _ in range(100):
+            if not character["combat_state"]["in_combat"]:
+                break
+            await engine.run("attack")
+        character["inventory"].clear()
+    return op
+
+
+async def setup_map_large(engine: Engine) -> Operation:
+    """'map' of the whole generated world, after the first (layout-building) call."""
+    await engine.run("map")
+
+    async def op():
+        await engine.run("map")
+    return op
+
+
+async def setup_map_cold(engine: Engine) -> Operation:
+    """'map' with the world layout dropped first, so every call lays out and renders the world."""
+    async def op():
+        engine.world_manager.layouts.clear()
+        await engine.run("map")
+    return op
+
+
+async def setup_merchant_buy_sell(engine: Engine) -> Operation:
+    """Buy a torch and sell it back (two commands per operation)."""
+    await engine.run("talk merchant")
+    await engine.run("ask merchant wares")
+    merchant = engine.data_manager.get_npc("merchant_001")
+
+    async def op():
+        merchant["merchant_data"]["inventory"]["torch_001"]["quantity"] = 10
+        await engine.run("buy torch")
+        await engine.run("sell a wooden torch")
+    return op
+
+
+SCENARIOS: Dict[str, Callable[[Engine], Awaitable[Operation]]] = {
+    "walk_loop": setup_walk_loop,
+    "look_spam": setup_look_spam,
+    "take_all_heavy": setup_take_all_heavy,
+    "look_heavy": setup_look_heavy,
+    "inventory_1000": setup_inventory_1000,
+    "inventory_churn": setup_inventory_churn,
+    "combat_to_death": setup_combat_to_death,
+    "map_large": setup_map_large,
+    "map_cold": setup_map_cold,
+    "merchant_buy_sell": setup_merchant_buy_sell,
+}
+
+
+async def run_scenario(name: str, data_dir: str, seconds: float, save_interval: float) -> Dict[str, float]:
+    """Time a scenario for about the given number of seconds, then sample its allocations."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = Engine(data_dir, save_interval=save_interval)
+        # Scenarios share the data directory, so each gets its own fresh character
+        engine.create_player(f"Bench{name.replace('_', '')}")
+        op = await SCENARIOS[name](engine)
+        for _ in range(3):  # Warm up caches and lazily built state
+            await op()
+
+        # Best of several rounds, which is far less noisy than one long run
+        ops = 0
+        best = float("inf")
+        for _ in range(ROUNDS):
+            round_ops = 0
+            start = time.perf_counter()
+            deadline = start + seconds / ROUNDS
+            while True:
+                await op()
+                round_ops += 1
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+            ops += round_ops
+            best = min(best, (now - start) / round_ops)
+
+        samples = max(1, min(ops, 100))
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(samples):
+            await op()
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        engine.flush()
+
+    return {
+        "ops": ops,
+        "ops_per_sec": 1 / best,
+        "ms_per_op": best * 1000,
+        "peak_kib": (peak - before) / 1024,
+        "retained_bytes_per_op": (after - before) / samples
+    }
+
+
+def load_baseline() -> Dict:
+    try:
+        with open(BASELINE_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the engine benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--rooms", type=int, default=10000, help="Rooms in the generated world (default: 10000)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time to spend on each scenario (default: 1)")
+    parser.add_argument("--save-interval", type=float, default=60.0,
+                        help="Minimum seconds between character saves (default: 60; 0 writes every command)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if any scenario is slower than the baseline by more than --tolerance")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Allowed slowdown in percent (default: 20)")
+    args = parser.parse_args()
+
+    names: List[str] = args.scenario or list(SCENARIOS)
+    baseline = load_baseline()
+    results = {}
+    regressions = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = make_data_dir(os.path.join(directory, "data"), args.rooms)
+        print(f"{args.rooms} rooms, {args.seconds:g}s per scenario\n")
+        print(f"{'Scenario':<20}{'ops/s':>12}{'ms/op':>10}{'peak KiB':>11}{'kept B/op':>11}  vs baseline")
+        for name in names:
+            result = asyncio.run(run_scenario(name, data_dir, args.seconds, args.save_interval))
+            result["rooms"] = args.rooms
+            results[name] = result
+
+            comparison = ""
+            previous = baseline.get(name)
+            if previous and previous.get("rooms") == args.rooms:
+                change = (result["ops_per_sec"] / previous["ops_per_sec"] - 1) * 100
+                comparison = f"{change:+.1f}%"
+                if change < -args.tolerance:
+                    regressions.append(name)
+                    comparison += "  SLOWER"
+            print(f"{name:<20}{result['ops_per_sec']:>12.1f}{result['ms_per_op']:>10.3f}"
+                  f"{result['peak_kib']:>11.1f}{result['retained_bytes_per_op']:>11.0f}  {comparison}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline written to {BASELINE_FILE}")
+
+    if regressions:
+        print(f"\nSlower than baseline by more than {args.tolerance:g}%: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
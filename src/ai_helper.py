@@ -5,7 +5,6 @@ This module provides a base class for AI-powered functionalities.
 
 import os
 from typing import Optional, Dict, Any
-from google import genai
 
 class GeminiHelper:
     """Base class for Gemini 2.0 AI integration."""
@@ -16,6 +15,12 @@ class GeminiHelper:
         if not self.api_key:
             raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable or pass it directly.")
         
+        # The SDK takes a good while to import, so it is only loaded once a helper is actually wanted
+        try:
+            from google import genai
+        except ImportError as e:
+            raise ValueError(f"google-genai is not installed ({e})")
+
         try:
             self.client = genai.Client(api_key=self.api_key)
             self.model_id = model_id
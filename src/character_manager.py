@@ -1,23 +1,26 @@
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from .data_manager import DataManager
-import os
-import json
+from .migrations import CURRENT_SCHEMA_VERSION, SCHEMA_VERSION_KEY
+from .instrumentation import metrics
+
+# Inventory display categories in display order, by item type; other types are MISCELLANEOUS
+INVENTORY_CATEGORIES = {"weapon": "WEAPONS", "armor": "ARMOR", "consumable": "CONSUMABLES",
+                        "quest": "QUEST ITEMS", "valuable": "VALUABLES"}
 
 class CharacterManager:
     def __init__(self, data_manager: DataManager):
         self.data_manager = data_manager
         self.current_character: Optional[Dict] = None
         self.world_manager = None  # Will be set by main.py
-        self.classes_data = self._load_classes()
-
-    def _load_classes(self) -> Dict:
-        """Load character classes data."""
-        try:
-            with open(os.path.join("data", "classes.json"), 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
+        # (Display, lowercase character name) -> ((character version, content version), rendered text)
+        self.render_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], str]] = {}
+        if not self.classes_data:
             print("Warning: classes.json not found!")
-            return {"classes": []}
+
+    @property
+    def classes_data(self) -> Dict:
+        """Character classes data; read through DataManager so content reloads apply."""
+        return self.data_manager.get_classes()
 
     def get_available_classes(self) -> List[Dict]:
         """Get list of available character classes."""
@@ -49,6 +52,7 @@ class CharacterManager:
         base_weight_limit = 20.0 + class_data["base_stats"]["weight_limit_bonus"]
 
         character = {
+            SCHEMA_VERSION_KEY: CURRENT_SCHEMA_VERSION,
             "name": name,
             "class": class_id,
             "current_room": "forest_clearing_001",  # Starting room
@@ -87,7 +91,6 @@ class CharacterManager:
             },
             "known_topics": {},
             "money": 100,
-            "defeated_mobs": {},
             "world_state": {
                 "removed_items": {}
             }
@@ -125,8 +128,73 @@ class CharacterManager:
         """Generate a fancy ASCII-art stats display with class information."""
         if not self.current_character:
             raise RuntimeError("No character is currently loaded")
-        
-        char = self.current_character
+        return self.cached_render("stats", self.current_character, self._render_stats)
+
+    def cached_render(self, display: str, character: Dict, render: Callable[[Dict], str]) -> str:
+        """
+        Render a display of a character, or reuse the last rendering if neither
+        the character (see DataManager.update_character) nor the content has
+        changed since.
+        """
+        cache_key = (display, character["name"].lower())
+        version = (self.data_manager.get_character_version(character["name"]), self.data_manager.content_version)
+        cached = self.render_cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            metrics.count("render_cache_hits")
+            return cached[1]
+        metrics.count("render_cache_misses")
+        text = render(character)
+        self.render_cache[cache_key] = (version, text)
+        return text
+
+    def summarize_inventory(self, character: Dict) -> Tuple[float, List[Tuple[str, Optional[Dict]]], Dict[str, List[str]]]:
+        """
+        Weight carried, equipped items by slot, and display lines for the
+        rest of the inventory by category, grouped by name with counts.
+        Each distinct item is looked up once.
+        """
+        total_weight = 0.0
+        equipped = []
+        equipped_names = set()
+        for slot, equipped_id in character["equipment"].items():
+            if not equipped_id:
+                continue
+            item = self.data_manager.get_item(equipped_id)
+            equipped.append((slot, item))
+            if item:
+                total_weight += item.get("properties", {}).get("weight", 0)
+                equipped_names.add(item["short_desc"])
+
+        id_counts: Dict[str, int] = {}
+        for item_id in character["inventory"]:
+            id_counts[item_id] = id_counts.get(item_id, 0) + 1
+
+        # Group by display name; different items can share one
+        item_counts: Dict[str, int] = {}
+        item_details: Dict[str, Dict] = {}
+        for item_id, count in id_counts.items():
+            item = self.data_manager.get_item(item_id)
+            if not item:
+                continue
+            total_weight += item.get("properties", {}).get("weight", 0) * count
+            display_name = item["short_desc"]
+            item_counts[display_name] = item_counts.get(display_name, 0) + count
+            item_details[display_name] = item
+
+        categories: Dict[str, List[str]] = {category: [] for category in INVENTORY_CATEGORIES.values()}
+        categories["MISCELLANEOUS"] = []
+        for display_name, item in item_details.items():
+            if display_name in equipped_names:
+                continue
+            count = item_counts[display_name]
+            props = item.get("properties", {})
+            count_str = f" (x{count})" if count > 1 else ""
+            weight_str = f" [{props.get('weight', 0):.1f}kg]"
+            category = INVENTORY_CATEGORIES.get(props.get("type", "misc"), "MISCELLANEOUS")
+            categories[category].append(f"  {display_name}{count_str}{weight_str}")
+        return total_weight, equipped, categories
+
+    def _render_stats(self, char: Dict) -> str:
         stats = char["stats"]
         
         # Get class information
@@ -137,27 +205,18 @@ class CharacterManager:
         hp_percent = (stats["current_hp"] / stats["max_hp"]) * 100
         xp_percent = (stats["xp"] / stats["xp_to_next_level"]) * 100
         
-        # Calculate total weight carried
-        total_weight = self.calculate_total_weight()
+        total_weight, equipped, categories = self.summarize_inventory(char)
         
         # Generate health and XP bars
         hp_bar = self._generate_progress_bar(hp_percent, 20)
         xp_bar = self._generate_progress_bar(xp_percent, 20)
         
         # Get equipment info
-        equipment = char["equipment"]
-        equipped_items = {}
-        for slot in ["weapon", "armor", "ring", "amulet"]:
-            item_id = equipment.get(slot)
-            if item_id:
-                item = self.data_manager.get_item(item_id)
-                if item:
-                    weight_str = f" ({item['properties'].get('weight', 0):.1f}kg)"
-                    equipped_items[slot.title()] = (item["short_desc"] + weight_str)[:20]
-                else:
-                    equipped_items[slot.title()] = "None"
-            else:
-                equipped_items[slot.title()] = "None"
+        equipped_items = {slot.title(): "None" for slot in ["weapon", "armor", "ring", "amulet"]}
+        for slot, item in equipped:
+            if item and slot.title() in equipped_items:
+                weight_str = f" ({item['properties'].get('weight', 0):.1f}kg)"
+                equipped_items[slot.title()] = (item["short_desc"] + weight_str)[:20]
         
         # Format the stats display with proper spacing and class information
         stats_display = f"""
@@ -180,64 +239,7 @@ class CharacterManager:
 ║                                Ring:    {equipped_items['Ring']:<14}║
 ║                                Amulet:  {equipped_items['Amulet']:<14}║"""
 
-        # Add inventory section
         sections = [stats_display]
-        
-        # Group items and count quantities
-        item_counts = {}
-        item_details = {}  # Store full item details for display
-        
-        for item_id in char["inventory"]:
-            item = self.data_manager.get_item(item_id)
-            if not item:
-                continue
-            
-            # Use short_desc as the display key
-            display_name = item["short_desc"]
-            item_counts[display_name] = item_counts.get(display_name, 0) + 1
-            item_details[display_name] = item
-
-        # Categorize items
-        categories = {
-            "WEAPONS": [],
-            "ARMOR": [],
-            "CONSUMABLES": [],
-            "QUEST ITEMS": [],
-            "VALUABLES": [],
-            "MISCELLANEOUS": []
-        }
-
-        for display_name, item in item_details.items():
-            # Skip if item is equipped
-            is_equipped = False
-            for equipped_id in char["equipment"].values():
-                if equipped_id and self.data_manager.get_item(equipped_id)["short_desc"] == display_name:
-                    is_equipped = True
-                    break
-            if is_equipped:
-                continue
-
-            count = item_counts[display_name]
-            weight = item["properties"].get("weight", 0)
-            count_str = f" (x{count})" if count > 1 else ""
-            weight_str = f" [{weight:.1f}kg]"
-            item_line = f"  {display_name}{count_str}{weight_str}"
-
-            props = item.get("properties", {})
-            item_type = props.get("type", "misc")
-
-            if item_type == "weapon":
-                categories["WEAPONS"].append(item_line)
-            elif item_type == "armor":
-                categories["ARMOR"].append(item_line)
-            elif item_type == "consumable":
-                categories["CONSUMABLES"].append(item_line)
-            elif item_type == "quest":
-                categories["QUEST ITEMS"].append(item_line)
-            elif item_type == "valuable":
-                categories["VALUABLES"].append(item_line)
-            else:
-                categories["MISCELLANEOUS"].append(item_line)
 
         # Add inventory header
         sections.append("╠══════════════════════════════════════════════════════════╣")
@@ -275,30 +277,12 @@ class CharacterManager:
             print(f"Character '{name}' not found.")
             return False
 
-        # Ensure character has required fields
-        if "known_topics" not in character:
-            character["known_topics"] = {}
-        if "money" not in character:
-            character["money"] = 100
-        if "defeated_mobs" not in character:
-            character["defeated_mobs"] = {}
-        if "world_state" not in character:
-            character["world_state"] = {"removed_items": {}}
-            
-        # Add weight limit if missing (20kg base + 2kg per level above 1)
-        if "weight_limit" not in character["base_stats"]:
-            character["base_stats"]["weight_limit"] = 20.0
-        if "weight_limit" not in character["stats"]:
-            level = character["stats"]["level"]
-            character["stats"]["weight_limit"] = 20.0 + ((level - 1) * 2.0)
-            self.data_manager.update_character(character)
-
         self.current_character = character
 
         # Sync world manager with character's location
         if self.world_manager:
             current_world = self.determine_world_from_room(character["current_room"])
-            self.world_manager.change_world(current_world)
+            self.world_manager.change_world(current_world, character["name"])
 
         return True
 
@@ -318,10 +302,6 @@ class CharacterManager:
         if not self.current_character:
             raise RuntimeError("No character is currently loaded")
         
-        # Clear defeated mobs when changing rooms
-        if room_id != self.current_character["current_room"]:
-            self.current_character["defeated_mobs"] = {}
-            
         self.current_character["current_room"] = room_id
         self.save_character()
 
@@ -422,26 +402,6 @@ class CharacterManager:
             return self.current_character
         return self.data_manager.get_character(name) 
 
-    def add_defeated_mob(self, mob_id: str) -> None:
-        """Add a mob to the defeated list for current room."""
-        if not self.current_character:
-            raise RuntimeError("No character is currently loaded")
-        
-        current_room = self.current_character["current_room"]
-        if current_room not in self.current_character["defeated_mobs"]:
-            self.current_character["defeated_mobs"][current_room] = []
-            
-        self.current_character["defeated_mobs"][current_room].append(mob_id)
-        self.save_character()
-
-    def is_mob_defeated(self, mob_id: str) -> bool:
-        """Check if a mob has been defeated in current room."""
-        if not self.current_character:
-            raise RuntimeError("No character is currently loaded")
-            
-        current_room = self.current_character["current_room"]
-        return mob_id in self.current_character["defeated_mobs"].get(current_room, []) 
-
     def _generate_progress_bar(self, percentage: float, length: int = 20) -> str:
         """Generate a progress bar with custom characters."""
         fill_length = int((percentage / 100) * length)
@@ -1,89 +1,225 @@
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from .data_manager import DataManager
 from .world_manager import WorldManager
+from .encounter import Encounter
+from .mob import MobInstance
 import random
+import time
 
 class CombatManager:
-    def __init__(self, data_manager: DataManager, world_manager: WorldManager):
+    ROUND_TIMEOUT = 3.0  # Seconds a round waits for fighters who haven't attacked before resolving without them
+
+    def __init__(self, data_manager: DataManager, world_manager: WorldManager, seed: Optional[int] = None):
         self.data_manager = data_manager
         self.world_manager = world_manager
         self.character_manager = None  # Will be set by main.py
+        self.rng = random.Random(seed)  # Per-session RNG for damage and loot rolls
+        self.seed = seed
+        self.encounters: Dict[Tuple[str, str], Encounter] = {}  # (world, room) -> encounter
+        self.character_encounters: Dict[str, Encounter] = {}  # Character name -> encounter
+        # Character name -> combat log lines from rounds that character hasn't been shown yet
+        self.pending_logs: Dict[str, List[str]] = {}
         
     def set_character_manager(self, character_manager) -> None:
         """Set the character manager reference."""
         self.character_manager = character_manager
-        
-    def load_mob(self, mob_id):
-        """Load a mob from the mobs.json file."""
-        mobs_data = self.data_manager.load_json("mobs.json")
-        for mob in mobs_data["mobs"]:
-            if mob["id"] == mob_id:
-                # Create a deep copy of the mob to prevent shared state
-                mob_copy = {
-                    "id": mob["id"],
-                    "name": mob["name"],
-                    "short_desc": mob["short_desc"],
-                    "long_desc": mob["long_desc"],
-                    "level": mob["level"],
-                    "stats": {
-                        "max_hp": mob["stats"]["max_hp"],
-                        "current_hp": mob["stats"]["max_hp"],  # Reset HP to max
-                        "attack": mob["stats"]["attack"],
-                        "defense": mob["stats"]["defense"],
-                        "xp_value": mob["stats"]["xp_value"]
-                    },
-                    "loot_table": dict(mob["loot_table"]),
-                    "spawn_areas": list(mob["spawn_areas"])
-                }
-                return mob_copy
-        return None
-        
+
+    def seed_rng(self, seed: Optional[int]) -> None:
+        """Reseed the combat RNG so fights can be reproduced."""
+        self.seed = seed
+        self.rng.seed(seed)
+
     def calculate_damage(self, attacker_stats, defender_stats):
         """Calculate damage based on attack and defense stats."""
         base_damage = attacker_stats["attack"] - defender_stats["defense"]
         if base_damage < 1:
             base_damage = 1
         # Add some randomness
-        damage = random.randint(base_damage - 2, base_damage + 2)
+        damage = self.rng.randint(base_damage - 2, base_damage + 2)
         return max(1, damage)  # Minimum 1 damage
         
+    def _join_encounter(self, character: Dict, mob_id: str, mob_state: Optional[Dict] = None) -> Optional[Encounter]:
+        """
+        Put a character into the encounter in their room, targeting a mob.
+        Joins an existing mob of that type if one is already being fought.
+        """
+        room_key = (self.world_manager.current_world, character["current_room"])
+        encounter = self.encounters.get(room_key)
+        mob_key = encounter.find_mob(mob_id) if encounter else None
+
+        if mob_key is None:
+            # Pick up a live mob of that type from the room
+            room_mobs = self.world_manager.get_room_mobs(character["current_room"])
+            mob = next((m for m in room_mobs if m.id == mob_id), None)
+            if not mob:
+                return None
+            if mob_state and mob_state["id"] == mob_id:
+                mob.apply_state(mob_state)
+            if not encounter:
+                encounter = Encounter(*room_key)
+                self.encounters[room_key] = encounter
+            mob_key = encounter.add_mob(mob)
+
+        encounter.add_character(character)
+        encounter.set_target(character["name"], mob_key)
+        self.character_encounters[character["name"]] = encounter
+        return encounter
+
+    def _get_encounter(self, character: Dict, mob_id: str) -> Optional[Encounter]:
+        """Get a character's encounter, rebuilding it from saved combat state if needed."""
+        encounter = self.character_encounters.get(character["name"])
+        if encounter:
+            return encounter
+        return self._join_encounter(character, mob_id, character["combat_state"].get("mob_state"))
+
+    def _leave_combat(self, encounter: Encounter, character: Dict) -> None:
+        """Take a character out of an encounter and clear their combat state."""
+        encounter.remove_character(character["name"])
+        self.character_encounters.pop(character["name"], None)
+        character["combat_state"]["in_combat"] = False
+        character["combat_state"]["target"] = None
+        character["combat_state"]["turns_in_combat"] = 0
+        character["combat_state"]["mob_state"] = None  # Clear mob state
+
+    def _end_encounter_if_over(self, encounter: Encounter) -> None:
+        """Dissolve an encounter once either side is empty."""
+        if not encounter.is_over():
+            return
+        for character in list(encounter.characters.values()):
+            self._leave_combat(encounter, character)
+        self.encounters.pop((encounter.world, encounter.room_id), None)
+
     def process_combat_turn(self, character_name, mob_id):
-        """Process one turn of combat between character and mob."""
+        """
+        Declare the character's attack for this round. The round is resolved
+        once everyone in the encounter has attacked; until then the character
+        waits, and the others see the round's outcome with their next command.
+        """
         character = self.data_manager.get_character(character_name)
         if not character:
             return "Character not found."
-            
-        # Get mob state from combat state
-        mob = character["combat_state"].get("mob_state")
-        if not mob or mob["id"] != mob_id:
-            mob = self.load_mob(mob_id)
+
+        encounter = self._get_encounter(character, mob_id)
+        if not encounter:
+            return "Mob not found."
+
+        if not encounter.act(character_name, time.monotonic()):
+            return "You are already attacking; waiting for the others in the fight."
+        if not encounter.all_acted():
+            waiting = len(encounter.characters) - len(encounter.acted)
+            return f"You ready your attack, waiting for {waiting} other fighter{'s' if waiting > 1 else ''}."
+
+        self._finish_round(encounter)
+        return self.take_messages(character_name)
+
+    def process_rounds(self) -> None:
+        """Resolve rounds that have waited too long on fighters who haven't attacked (called between commands)."""
+        now = time.monotonic()
+        for encounter in list(self.encounters.values()):
+            if encounter.acted and now - encounter.round_started >= self.ROUND_TIMEOUT:
+                self._finish_round(encounter)
+
+    def take_messages(self, character_name: str) -> str:
+        """Hand over, and forget, the combat log a character hasn't seen yet."""
+        return "\n".join(self.pending_logs.pop(character_name, []))
+
+    def _finish_round(self, encounter: Encounter) -> None:
+        """Resolve an encounter's round, save everyone in it and queue each fighter's log."""
+        logs = self.resolve_round(encounter)
+
+        # Save everyone who fought this round (their state includes the mob state)
+        for name, log in logs.items():
+            fighter = self.data_manager.get_character(name)
+            if fighter:
+                self.data_manager.update_character(fighter)
+            if log:
+                self.pending_logs.setdefault(name, []).extend(log)
+
+    def resolve_round(self, encounter: Encounter) -> Dict[str, List[str]]:
+        """
+        Resolve one round for everyone in an encounter as a single batch:
+        every character who attacked hits their target, then every surviving
+        mob hits the character at the top of its aggro table. Returns a combat
+        log per character.
+        """
+        logs = {name: [] for name in encounter.characters}
+        attackers = set(encounter.acted)
+        encounter.end_round()
+
+        # Characters strike first
+        for name, character in list(encounter.characters.items()):
+            if name not in encounter.characters or name not in attackers:
+                continue  # Left combat earlier this round, or didn't attack in time
+            mob_key = encounter.targets.get(name)
+            mob = encounter.mobs.get(mob_key) if mob_key is not None else None
             if not mob:
-                return "Mob not found."
-            character["combat_state"]["mob_state"] = mob
-            
-        # Character attacks mob
-        damage_to_mob = self.calculate_damage(character["stats"], mob["stats"])
-        mob["stats"]["current_hp"] -= damage_to_mob
-        
-        combat_log = [f"You hit {mob['name']} for {damage_to_mob} damage!"]
-        
-        # Show health bars
-        char_health_percent = (character["stats"]["current_hp"] / character["stats"]["max_hp"]) * 100
-        mob_health_percent = (mob["stats"]["current_hp"] / mob["stats"]["max_hp"]) * 100
-        
-        combat_log.append(f"\nYour health: [{self.generate_health_bar(char_health_percent)}] {character['stats']['current_hp']}/{character['stats']['max_hp']}")
-        combat_log.append(f"{mob['name']}'s health: [{self.generate_health_bar(mob_health_percent)}] {mob['stats']['current_hp']}/{mob['stats']['max_hp']}\n")
-        
-        # Check if mob is defeated
-        if mob["stats"]["current_hp"] <= 0:
-            combat_log.append(f"You have defeated {mob['name']}!")
+                continue
+
+            damage_to_mob = self.calculate_damage(character["stats"], mob.stats)
+            mob.current_hp -= damage_to_mob
+            encounter.add_threat(mob_key, name, damage_to_mob)
+
+            combat_log = logs[name]
+            combat_log.append(f"You hit {mob.name} for {damage_to_mob} damage!")
+
+            # Show health bars
+            char_health_percent = (character["stats"]["current_hp"] / character["stats"]["max_hp"]) * 100
+            mob_health_percent = (mob.current_hp / mob.max_hp) * 100
+
+            combat_log.append(f"\nYour health: [{self.generate_health_bar(char_health_percent)}] {character['stats']['current_hp']}/{character['stats']['max_hp']}")
+            combat_log.append(f"{mob.name}'s health: [{self.generate_health_bar(mob_health_percent)}] {mob.current_hp}/{mob.max_hp}\n")
+
+            # Check if mob is defeated
+            if mob.current_hp <= 0:
+                self._handle_kill(encounter, mob_key, character, logs)
+
+        # Surviving mobs strike back at whoever they hate most
+        for mob_key, mob in list(encounter.mobs.items()):
+            name = encounter.mob_target(mob_key)
+            character = encounter.characters.get(name)
+            if not character:
+                continue
+
+            damage_to_char = self.calculate_damage(mob.stats, character["stats"])
+            character["stats"]["current_hp"] -= damage_to_char
+            logs[name].append(f"{mob.name} hits you for {damage_to_char} damage!")
+
+            # Check if character is defeated
+            if character["stats"]["current_hp"] <= 0:
+                self._handle_character_defeat(encounter, character, logs[name])
+
+        # Everyone still fighting carries their target's state into the next round
+        for name, character in encounter.characters.items():
+            target = encounter.get_target(name)
+            if not target:
+                continue
+            character["combat_state"]["target"] = target.id
+            character["combat_state"]["mob_state"] = target.to_state()
+            character["combat_state"]["turns_in_combat"] += 1
+
+        self._end_encounter_if_over(encounter)
+        return logs
+
+    def _handle_kill(self, encounter: Encounter, mob_key: int, killer: Dict, logs: Dict[str, List[str]]) -> None:
+        """Handle a mob killed in combat: XP for everyone who fought it, loot for the killer."""
+        mob = encounter.mobs[mob_key]
+        logs[killer["name"]].append(f"You have defeated {mob.name}!")
+        xp_value = mob.prototype.xp_value
+
+        for name in encounter.aggro[mob_key]:
+            character = encounter.characters.get(name)
+            if not character:
+                continue
+            combat_log = logs[name]
+            if character is not killer:
+                combat_log.append(f"{mob.name} has been defeated!")
+
             # Award XP
-            character["stats"]["xp"] += mob["stats"]["xp_value"]
-            combat_log.append(f"You gained {mob['stats']['xp_value']} experience!")
-            
+            character["stats"]["xp"] += xp_value
+            combat_log.append(f"You gained {xp_value} experience!")
+
             # Check for level up
             if character["stats"]["xp"] >= character["stats"]["xp_to_next_level"]:
-                old_level = character["stats"]["level"]
                 self.level_up(character)
                 combat_log.append(f"\nLevel up! You are now level {character['stats']['level']}!")
                 combat_log.append("Your stats have increased:")
@@ -91,53 +227,45 @@ class CombatManager:
                 combat_log.append("  +2 Attack")
                 combat_log.append("  +1 Defense")
                 combat_log.append("You are fully healed!")
-            
-            # Roll for loot
-            loot = self.roll_loot(mob["loot_table"])
-            if loot:
-                character["inventory"].extend(loot)
-                combat_log.append(f"You found: {', '.join(loot)}")
-            
-            # Mark mob as defeated in current room
-            self.character_manager.add_defeated_mob(mob_id)
-            
-            character["combat_state"]["in_combat"] = False
-            character["combat_state"]["target"] = None
-            character["combat_state"]["turns_in_combat"] = 0
-            character["combat_state"]["mob_state"] = None  # Clear mob state
-        else:
-            # Mob attacks character
-            damage_to_char = self.calculate_damage(mob["stats"], character["stats"])
-            character["stats"]["current_hp"] -= damage_to_char
-            combat_log.append(f"{mob['name']} hits you for {damage_to_char} damage!")
-            
-            # Check if character is defeated
-            if character["stats"]["current_hp"] <= 0:
-                # Death penalties
-                character["stats"]["current_hp"] = character["stats"]["max_hp"] // 2  # Respawn with half HP
-                character["current_room"] = "forest_clearing_001"  # Respawn at starting area
-                character["combat_state"]["in_combat"] = False
-                character["combat_state"]["target"] = None
-                character["combat_state"]["turns_in_combat"] = 0
-                character["combat_state"]["mob_state"] = None  # Clear mob state
-                
-                # XP penalty - lose 10% of XP to next level
-                xp_penalty = character["stats"]["xp_to_next_level"] // 10
-                character["stats"]["xp"] = max(0, character["stats"]["xp"] - xp_penalty)
-                
-                # Money penalty - lose 10% of money
-                money_penalty = character["money"] // 10
-                character["money"] = max(0, character["money"] - money_penalty)
-                
-                combat_log.append("\nYou have been defeated!")
-                combat_log.append(f"You lose {xp_penalty} XP and {money_penalty} coins.")
-                combat_log.append("You wake up at the forest clearing with half health...")
+
+        # Roll for loot
+        loot = self.roll_loot(mob.id)
+        if loot:
+            killer["inventory"].extend(loot)
+            logs[killer["name"]].append(f"You found: {', '.join(loot)}")
+
+        # Take it out of the world until it respawns
+        self.world_manager.despawn_mob(encounter.room_id, mob, encounter.world)
+
+        # Anyone who was fighting it moves on to the next mob, or out of combat
+        for name in encounter.remove_mob(mob_key):
+            character = encounter.characters[name]
+            next_key = encounter.next_target(name)
+            if next_key is None:
+                self._leave_combat(encounter, character)
             else:
-                character["combat_state"]["turns_in_combat"] += 1
-        
-        # Save character state (which includes mob state)
-        self.data_manager.update_character(character)
-        return "\n".join(combat_log)
+                encounter.set_target(name, next_key)
+                logs[name].append(f"You turn to fight {encounter.mobs[next_key].name}!")
+
+    def _handle_character_defeat(self, encounter: Encounter, character: Dict, combat_log: List[str]) -> None:
+        """Apply death penalties and send the character back to the starting area."""
+        self._leave_combat(encounter, character)
+
+        # Death penalties
+        character["stats"]["current_hp"] = character["stats"]["max_hp"] // 2  # Respawn with half HP
+        character["current_room"] = "forest_clearing_001"  # Respawn at starting area
+
+        # XP penalty - lose 10% of XP to next level
+        xp_penalty = character["stats"]["xp_to_next_level"] // 10
+        character["stats"]["xp"] = max(0, character["stats"]["xp"] - xp_penalty)
+
+        # Money penalty - lose 10% of money
+        money_penalty = character["money"] // 10
+        character["money"] = max(0, character["money"] - money_penalty)
+
+        combat_log.append("\nYou have been defeated!")
+        combat_log.append(f"You lose {xp_penalty} XP and {money_penalty} coins.")
+        combat_log.append("You wake up at the forest clearing with half health...")
     
     def generate_health_bar(self, percentage, length=20):
         """Generate a text-based health bar."""
@@ -154,13 +282,12 @@ class CombatManager:
         character["stats"]["xp"] -= character["stats"]["xp_to_next_level"]
         character["stats"]["xp_to_next_level"] = int(character["stats"]["xp_to_next_level"] * 1.5)
     
-    def roll_loot(self, loot_table):
-        """Roll for loot drops based on loot table probabilities."""
-        loot = []
-        for item, probability in loot_table.items():
-            if random.random() < probability:
-                loot.append(item)
-        return loot
+    def roll_loot(self, mob_id: str) -> List[str]:
+        """Roll for loot drops using the mob's compiled loot table."""
+        prototype = self.data_manager.get_mob(mob_id)
+        if not prototype:
+            return []
+        return prototype.loot_table.roll(self.rng)
     
     def flee(self, character_name: str) -> str:
         """Handle fleeing from combat."""
@@ -168,31 +295,38 @@ class CombatManager:
         if not character:
             return "Character not found."
             
-        # End combat
-        character["combat_state"]["in_combat"] = False
-        character["combat_state"]["target"] = None
-        character["combat_state"]["turns_in_combat"] = 0
-        character["combat_state"]["mob_state"] = None  # Clear mob state
+        # End combat; the rest of the room fights on without us
+        encounter = self.character_encounters.get(character_name)
+        if encounter:
+            self._leave_combat(encounter, character)
+            self._end_encounter_if_over(encounter)
+            if encounter.all_acted():
+                self._finish_round(encounter)  # Everyone left had only been waiting on us
+        else:
+            character["combat_state"]["in_combat"] = False
+            character["combat_state"]["target"] = None
+            character["combat_state"]["turns_in_combat"] = 0
+            character["combat_state"]["mob_state"] = None  # Clear mob state
         self.data_manager.update_character(character)
         
         return "You flee from combat!"
 
-    def _handle_mob_defeat(self, character: Dict, mob: Dict) -> List[str]:
+    def _handle_mob_defeat(self, character: Dict, mob: MobInstance) -> List[str]:
         """Handle mob defeat, including XP gain and loot drops."""
         response = []
         
         # Award XP
-        xp_gain = mob["stats"]["xp_value"]
+        xp_gain = mob.prototype.xp_value
         character["stats"]["xp"] += xp_gain
         response.append(f"You gain {xp_gain} XP!")
         
         # Check for level up
         while character["stats"]["xp"] >= character["stats"]["xp_to_next_level"]:
-            self._handle_level_up(character)
+            self.level_up(character)
             response.append(f"Level up! You are now level {character['stats']['level']}!")
         
         # Handle loot drops
-        loot = self._generate_loot(mob)
+        loot = self.roll_loot(mob.id)
         if loot:
             # Add items to the room using world_manager
             current_room = character["current_room"]
@@ -200,10 +334,6 @@ class CombatManager:
                 self.world_manager.add_item_to_room(current_room, item_id)
             response.append(f"\nLoot dropped: {', '.join(loot)}")
         
-        # Mark mob as defeated in this room
-        if hasattr(self.data_manager, 'character_manager'):
-            self.data_manager.character_manager.add_defeated_mob(mob["id"])
-        
         return response
 
     def instant_kill(self, character_name: str, mob_id: str) -> str:
@@ -218,27 +348,32 @@ class CombatManager:
         if character["combat_state"]["target"] != mob_id:
             return "That's not your current target."
             
-        # Get mob data
-        mobs_data = self.data_manager.load_json("mobs.json")
-        mob = None
-        for m in mobs_data["mobs"]:
-            if m["id"] == mob_id:
-                mob = m
-                break
-                
-        if not mob:
+        encounter = self._get_encounter(character, mob_id)
+        if not encounter:
             return "Invalid mob ID."
+        mob_key = encounter.targets[character_name]
+        mob = encounter.mobs[mob_key]
             
         response = ["You instantly defeat the enemy!"]
         
         # Handle loot and XP
         response.extend(self._handle_mob_defeat(character, mob))
+        self.world_manager.despawn_mob(encounter.room_id, mob, encounter.world)
         
-        # End combat
-        character["combat_state"]["in_combat"] = False
-        character["combat_state"]["target"] = None
-        character["combat_state"]["turns_in_combat"] = 0
-        character["combat_state"]["mob_state"] = None
+        # Remove the mob; move on to the next one or end combat
+        for name in encounter.remove_mob(mob_key):
+            fighter = encounter.characters[name]
+            next_key = encounter.next_target(name)
+            if next_key is None:
+                self._leave_combat(encounter, fighter)
+            else:
+                encounter.set_target(name, next_key)
+                next_mob = encounter.mobs[next_key]
+                fighter["combat_state"]["target"] = next_mob.id
+                fighter["combat_state"]["mob_state"] = next_mob.to_state()
+                if fighter is character:
+                    response.append(f"You turn to fight {next_mob.name}!")
+        self._end_encounter_if_over(encounter)
         
         # Save character data
         self.data_manager.update_character(character)
@@ -254,14 +389,43 @@ class CombatManager:
         if character["combat_state"]["in_combat"]:
             return "You are already in combat!"
             
-        mob = self.load_mob(mob_id)
-        if not mob:
+        encounter = self._join_encounter(character, mob_id)
+        if not encounter:
             return "Mob not found."
+        mob = encounter.get_target(character_name)
+        others = len(encounter.characters) - 1
         
         character["combat_state"]["in_combat"] = True
         character["combat_state"]["target"] = mob_id
         character["combat_state"]["turns_in_combat"] = 0
-        character["combat_state"]["mob_state"] = mob  # Store mob state
+        character["combat_state"]["mob_state"] = mob.to_state()  # Store mob state
         
         self.data_manager.update_character(character)
-        return f"You engage in combat with {mob['name']}!"
\ No newline at end of file
+        if others:
+            return f"You join the fight against {mob.name}!"
+        return f"You engage in combat with {mob.name}!"
+
+    def switch_target(self, character_name: str, mob_id: str) -> str:
+        """Turn on another mob in the room mid-fight, then fight a round."""
+        character = self.data_manager.get_character(character_name)
+        if not character:
+            return "Character not found."
+
+        if not character["combat_state"]["in_combat"]:
+            return "You are not in combat."
+
+        encounter = self._get_encounter(character, character["combat_state"]["target"])
+        if not encounter:
+            return "Mob not found."
+
+        current = encounter.get_target(character_name)
+        if current and current.id == mob_id:
+            return self.process_combat_turn(character_name, mob_id)
+
+        # Pull a new mob of that type into the fight if none is engaged yet
+        if not self._join_encounter(character, mob_id):
+            return "Mob not found."
+        mob = encounter.get_target(character_name)
+        character["combat_state"]["target"] = mob.id
+        character["combat_state"]["mob_state"] = mob.to_state()
+        return f"You turn to attack {mob.name}!\n" + self.process_combat_turn(character_name, mob.id)
\ No newline at end of file
@@ -3,8 +3,23 @@ from .data_manager import DataManager
 from .character_manager import CharacterManager
 from .world_manager import WorldManager
 from .combat_manager import CombatManager
+from .mob import MobInstance
+from .instrumentation import metrics
+from .profiling import profiler
 import asyncio
 
+# Canonical name of every command word, aliases included, for per-command metrics
+COMMAND_NAMES = {
+    "l": "look", "i": "inventory", "eq": "equip", "uneq": "unequip", "a": "attack", "kill": "attack",
+    "k": "attack", "st": "stats", "sac": "sacrifice", "q": "quit", "f": "flee", "gk": "godkill", "god": "godkill"
+}
+COMMAND_NAMES.update({word: "go" for word in (
+    "go", "north", "n", "south", "s", "east", "e", "west", "w", "up", "u", "down", "d")})
+COMMAND_NAMES.update({word: word for word in (
+    "look", "inventory", "examine", "equip", "unequip", "use", "take", "drop", "talk", "list", "buy", "sell",
+    "attack", "stats", "map", "path", "travel", "help", "sacrifice", "ask", "reload", "stats-server", "profile",
+    "quit", "flee", "godkill")})
+
 class CommandHandler:
     def __init__(self, data_manager: DataManager, character_manager: CharacterManager, world_manager: WorldManager):
         self.data_manager = data_manager
@@ -20,7 +35,22 @@ class CommandHandler:
             
         cmd = parts[0]
         args = parts[1:]
-        
+        name = COMMAND_NAMES.get(cmd, "unknown")
+        with metrics.command(name):
+            if profiler.enabled:
+                with profiler.command(name):
+                    quit_game, response = await self._dispatch(character_name, cmd, args)
+            else:
+                quit_game, response = await self._dispatch(character_name, cmd, args)
+
+        # Show any combat rounds resolved by other fighters since the character's last command
+        messages = self.combat_manager.take_messages(character_name)
+        if messages:
+            response = f"{messages.rstrip()}\n\n{response}" if response else messages
+        return quit_game, response
+
+    async def _dispatch(self, character_name: str, cmd: str, args: List[str]) -> Tuple[bool, str]:
+        """Run a parsed command."""
         # Get fresh character data
         character = self.character_manager.get_character(character_name)
         if not character:
@@ -68,10 +98,15 @@ class CommandHandler:
             "stats": lambda args: self.cmd_stats(character_name, args),
             "st": lambda args: self.cmd_stats(character_name, args),
             "map": lambda args: self.cmd_map(character_name, args),
+            "path": lambda args: self.cmd_path(character_name, args),
+            "travel": lambda args: self.cmd_travel(character_name, args),
             "help": lambda args: self.cmd_help(character_name, args),
             "sacrifice": lambda args: self.cmd_sacrifice(character_name, args),
             "sac": lambda args: self.cmd_sacrifice(character_name, args),
             "ask": lambda args: self.cmd_ask(character_name, args),
+            "reload": lambda args: self.cmd_reload(character_name, args),
+            "stats-server": lambda args: self.cmd_stats_server(character_name, args),
+            "profile": lambda args: self.cmd_profile(character_name, args),
             "quit": lambda args: self.cmd_quit(character_name, args),
             "q": lambda args: self.cmd_quit(character_name, args)
         }
@@ -90,7 +125,19 @@ class CommandHandler:
         if not args:
             return False, "Go where? Please specify a direction."
 
-        direction = args[0].lower()
+        moved, message = self._move(character_name, args[0].lower())
+        if not moved:
+            return False, message
+
+        description = await self.world_manager.get_room_description(
+            self.character_manager.get_current_room(), show_long=True)
+        return False, f"{message}\n\n{description}" if message else description
+
+    def _move(self, character_name: str, direction: str) -> Tuple[bool, str]:
+        """
+        Move through an exit without describing where it leads. Returns whether
+        the character moved, and the portal's message or why they couldn't.
+        """
         current_room = self.character_manager.get_current_room()
         exit_data = self.world_manager.get_exit_room_id(current_room, direction)
 
@@ -111,17 +158,15 @@ class CommandHandler:
                 return False, reason
 
             # Change world and move to new room
-            if not self.world_manager.change_world(exit_data["target_world"]):
+            if not self.world_manager.change_world(exit_data["target_world"], character_name):
                 return False, "Error: Could not load target world."
 
             self.character_manager.set_current_room(exit_data["target_room"])
-            description = await self.world_manager.get_room_description(exit_data["target_room"], show_long=True)
-            return False, f"{exit_data['description']}\n\n{description}"
+            return True, exit_data["description"]
 
         # Handle regular room movement
         self.character_manager.set_current_room(exit_data["target"])
-        description = await self.world_manager.get_room_description(exit_data["target"], show_long=True)
-        return False, description
+        return True, ""
 
     async def cmd_look(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
         """Handle the look command."""
@@ -141,37 +186,12 @@ class CommandHandler:
         if not inventory:
             return False, "Your inventory is empty."
 
-        # Calculate total weight carried
-        total_weight = 0.0
-        
-        # Add weights from inventory
-        for item_id in inventory:
-            item = self.data_manager.get_item(item_id)
-            if item and "weight" in item.get("properties", {}):
-                total_weight += item["properties"]["weight"]
-        
-        # Add weights from equipped items
-        for slot, equipped_id in character["equipment"].items():
-            if equipped_id:
-                item = self.data_manager.get_item(equipped_id)
-                if item and "weight" in item.get("properties", {}):
-                    total_weight += item["properties"]["weight"]
-
-        # Group items and count quantities
-        item_counts = {}
-        item_details = {}  # Store full item details for display
-        
-        for item_id in inventory:
-            item = self.data_manager.get_item(item_id)
-            if not item:
-                continue
-            
-            # Use short_desc as the display key
-            display_name = item["short_desc"]
-            item_counts[display_name] = item_counts.get(display_name, 0) + 1
-            item_details[display_name] = item
+        return False, self.character_manager.cached_render("inventory", character, self._render_inventory)
+
+    def _render_inventory(self, character: Dict) -> str:
+        """Build the fancy inventory display."""
+        total_weight, equipped, categories = self.character_manager.summarize_inventory(character)
 
-        # Build the fancy inventory display
         sections = []
         sections.append("╔══════════════════════════════╦═════════════════════╗")
         sections.append(f"║                     INVENTORY                           ║")
@@ -180,63 +200,16 @@ class CommandHandler:
         sections.append("║                                                          ║")
 
         # Equipment Section
-        equipped_found = False
-        for slot, equipped_id in character["equipment"].items():
-            if equipped_id:
-                if not equipped_found:
-                    sections.append("║  EQUIPPED ITEMS                                         ║")
-                    sections.append("║  ──────────────                                        ║")
-                    equipped_found = True
-                item = self.data_manager.get_item(equipped_id)
+        if equipped:
+            sections.append("║  EQUIPPED ITEMS                                         ║")
+            sections.append("║  ──────────────                                        ║")
+            for slot, item in equipped:
                 if item:
                     weight_str = f" ({item['properties'].get('weight', 0):.1f}kg)"
                     item_str = f"{slot.title():<8}: {item['short_desc']}{weight_str}"
                     sections.append(f"║  {item_str:<52}║")
-        if equipped_found:
             sections.append("║                                                          ║")
 
-        # Categorize remaining items
-        categories = {
-            "WEAPONS": [],
-            "ARMOR": [],
-            "CONSUMABLES": [],
-            "QUEST ITEMS": [],
-            "VALUABLES": [],
-            "MISCELLANEOUS": []
-        }
-
-        for display_name, item in item_details.items():
-            # Skip if item is equipped
-            is_equipped = False
-            for equipped_id in character["equipment"].values():
-                if equipped_id and self.data_manager.get_item(equipped_id)["short_desc"] == display_name:
-                    is_equipped = True
-                    break
-            if is_equipped:
-                continue
-
-            count = item_counts[display_name]
-            weight = item["properties"].get("weight", 0)
-            count_str = f" (x{count})" if count > 1 else ""
-            weight_str = f" [{weight:.1f}kg]"
-            item_line = f"  {display_name}{count_str}{weight_str}"
-
-            props = item.get("properties", {})
-            item_type = props.get("type", "misc")
-
-            if item_type == "weapon":
-                categories["WEAPONS"].append(item_line)
-            elif item_type == "armor":
-                categories["ARMOR"].append(item_line)
-            elif item_type == "consumable":
-                categories["CONSUMABLES"].append(item_line)
-            elif item_type == "quest":
-                categories["QUEST ITEMS"].append(item_line)
-            elif item_type == "valuable":
-                categories["VALUABLES"].append(item_line)
-            else:
-                categories["MISCELLANEOUS"].append(item_line)
-
         # Add categories to display
         for category, items in categories.items():
             if items:
@@ -252,7 +225,7 @@ class CommandHandler:
         sections.append(f"║  Money: {money:<47} coins ��")
         sections.append("╚══════════════════════════════════════════════════════════╝")
 
-        return False, "\n".join(sections)
+        return "\n".join(sections)
 
     def cmd_drop(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
         """Handle the drop command."""
@@ -445,31 +418,43 @@ class CommandHandler:
         if not character:
             return False, "Character not found."
             
-        # Load mobs data
-        mobs_data = self.data_manager.load_json("mobs.json")
-        current_room = character["current_room"]
-        
-        # Find mobs that can spawn in this room
-        possible_mobs = []
-        for mob in mobs_data["mobs"]:
-            if current_room in mob["spawn_areas"]:
-                possible_mobs.append(mob)
-        
+        possible_mobs = self._get_room_mobs(character["current_room"])
         if not possible_mobs:
             return False, "There are no enemies here."
         
         # If a specific target was given, try to match it
         if args:
-            target_name = " ".join(args).lower()
-            for mob in possible_mobs:
-                if mob["name"].lower() == target_name:
-                    return False, self.combat_manager.start_combat(character_name, mob["id"])
+            mob = self._match_mob(possible_mobs, args)
+            if mob:
+                return False, self.combat_manager.start_combat(character_name, mob.id)
             # If no match found, use first mob (default behavior)
             
         # For now, just pick the first possible mob
         target_mob = possible_mobs[0]
         
-        return False, self.combat_manager.start_combat(character_name, target_mob["id"])
+        return False, self.combat_manager.start_combat(character_name, target_mob.id)
+
+    def _get_room_mobs(self, room_id: str) -> List[MobInstance]:
+        """Get the mobs that can be fought in a room."""
+        return self.world_manager.get_room_mobs(room_id)
+
+    def _match_mob(self, mobs: List[MobInstance], args: List[str]) -> Optional[MobInstance]:
+        """Find a mob by its exact name."""
+        target_name = " ".join(args).lower()
+        for mob in mobs:
+            if mob.name.lower() == target_name:
+                return mob
+        return None
+
+    def cmd_combat_attack(self, character_name: str, args: List[str]) -> str:
+        """Attack the current target, or switch to another mob in the room."""
+        character = self.character_manager.get_character(character_name)
+        target = character["combat_state"]["target"]
+        if args:
+            mob = self._match_mob(self._get_room_mobs(character["current_room"]), args)
+            if mob and mob.id != target:
+                return self.combat_manager.switch_target(character_name, mob.id)
+        return self.combat_manager.process_combat_turn(character_name, target)
 
     def cmd_stats(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
         """Show character stats."""
@@ -553,7 +538,9 @@ class CommandHandler:
             "Looking:",
             "  look (l) - Look around",
             "  examine <target> - Examine an item, mob, or NPC",
-            "  map - Show world map with your location",
+            "  map [radius] - Show world map with your location (optionally only rooms within radius steps)",
+            "  path <room> - Show the shortest route to a room",
+            "  travel <room> - Walk the shortest route to a room",
             "",
             "Items:",
             "  inventory (i) - Show inventory",
@@ -572,13 +559,16 @@ class CommandHandler:
             "  sell <item> - Sell an item to a merchant",
             "",
             "Combat:",
-            "  attack (a) <target> - Attack a target",
+            "  attack (a) <target> - Attack a target, or switch targets mid-fight",
             "  flee (f) - Try to escape from combat",
             "  stats (st) - Show your character stats",
             "  godkill (gk/god) - Instantly defeat target (cheat)",
             "",
             "Other:",
             "  help - Show this help message",
+            "  reload [force] - Reload content files edited since the game started",
+            "  stats-server [reset] - Show command latency and I/O statistics",
+            "  profile [on [commands]|off|dump] - Profile commands to disk with cProfile and tracemalloc",
             "  quit - Exit the game"
         ]
         return False, "\n".join(commands)
@@ -594,8 +584,8 @@ class CommandHandler:
             return self.cmd_stats(character_name, args)
 
         combat_commands = {
-            "attack": lambda: self.combat_manager.process_combat_turn(character_name, character["combat_state"]["target"]),
-            "a": lambda: self.combat_manager.process_combat_turn(character_name, character["combat_state"]["target"]),
+            "attack": lambda: self.cmd_combat_attack(character_name, args),
+            "a": lambda: self.cmd_combat_attack(character_name, args),
             "flee": lambda: self.combat_manager.flee(character_name),
             "f": lambda: self.combat_manager.flee(character_name),
             "godkill": lambda: self.combat_manager.instant_kill(character_name, character["combat_state"]["target"]),
@@ -861,26 +851,24 @@ class CommandHandler:
             return False, npc["long_desc"]
 
         # Check for mobs in room
-        mobs_data = self.data_manager.load_json("mobs.json")
-        for mob in mobs_data.get("mobs", []):
-            if current_room in mob.get("spawn_areas", []):
-                # Check both name and short description with flexible matching
-                mob_name = mob["name"].lower()
-                mob_desc = mob["short_desc"].lower()
-                if (all(term in mob_name for term in search_terms) or 
-                    all(term in mob_desc for term in search_terms)):
-                    # Format mob stats
-                    stats = mob["stats"]
-                    mob_info = [
-                        f"{mob['name']}",
-                        mob["long_desc"],
-                        f"\nLevel: {mob['level']}",
-                        f"HP: {stats['max_hp']}",
-                        f"Attack: {stats['attack']}",
-                        f"Defense: {stats['defense']}",
-                        f"XP Value: {stats['xp_value']}"
-                    ]
-                    return False, "\n".join(mob_info)
+        for instance in self.world_manager.get_room_mobs(current_room):
+            mob = instance.prototype
+            # Check both name and short description with flexible matching
+            mob_name = mob.name.lower()
+            mob_desc = mob.short_desc.lower()
+            if (all(term in mob_name for term in search_terms) or 
+                all(term in mob_desc for term in search_terms)):
+                # Format mob stats
+                mob_info = [
+                    f"{mob.name}",
+                    mob.long_desc,
+                    f"\nLevel: {mob.level}",
+                    f"HP: {mob.max_hp}",
+                    f"Attack: {mob.attack}",
+                    f"Defense: {mob.defense}",
+                    f"XP Value: {mob.xp_value}"
+                ]
+                return False, "\n".join(mob_info)
 
         return False, "You don't see that here."
 
@@ -890,122 +878,109 @@ class CommandHandler:
         if not character:
             return False, "Character not found."
 
+        radius = None
+        if args:
+            if not args[0].isdigit():
+                return False, "Usage: map [radius]"
+            radius = int(args[0])
+
         current_room = character["current_room"]
         current_world = self.world_manager.current_world
-        rooms = self.world_manager.loaded_worlds[current_world].get("rooms", [])
-
-        # Create a grid to hold room positions
-        grid = {}
-        room_positions = {}
-        
-        # Start with the current room at (0,0)
-        to_visit = [(current_room, 0, 0)]  # (room_id, x, y)
-        visited = set()
-
-        # Map directions to coordinate changes
-        dir_to_coords = {
-            "north": (0, -1),
-            "south": (0, 1),
-            "east": (1, 0),
-            "west": (-1, 0),
-            "up": (0, -1),  # Treat up as north for 2D representation
-            "down": (0, 1)  # Treat down as south for 2D representation
-        }
-
-        # First pass: Assign coordinates to rooms
-        while to_visit:
-            room_id, x, y = to_visit.pop(0)
-            if room_id in visited:
-                continue
+        world_map = self.world_manager.render_map(current_room, radius=radius)
+        if world_map is None:
+            return False, f"Could not generate map - room {current_room} not found in world {current_world}."
 
-            visited.add(room_id)
-            room_positions[room_id] = (x, y)
-            grid[(x, y)] = room_id
+        return False, world_map
 
-            # Find the room data
-            room = None
-            for r in rooms:
-                if r["id"] == room_id:
-                    room = r
-                    break
+    async def _find_route(self, character: Dict, args: List[str]) -> Tuple[Optional[List[str]], str]:
+        """Find the directions to the room named in args, or an error message."""
+        if not args:
+            return None, "Where to? Please specify a room."
+
+        matches = await self.world_manager.find_rooms(" ".join(args))
+        if not matches:
+            return None, "You don't know of any such place."
+        if len(matches) > 1:
+            names = ", ".join(room_id for _, room_id in matches[:5])
+            return None, f"Which place do you mean? {names}"
+
+        world, room_id = matches[0]
+        path = await self.world_manager.find_path(character, room_id, world)
+        if path is None:
+            return None, "You can't find a way there from here."
+        if not path:
+            return None, "You are already there."
+        return path, room_id
+
+    async def cmd_path(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
+        """Show the shortest route to a room."""
+        character = self.character_manager.get_character(character_name)
+        if not character:
+            return False, "Character not found."
 
-            if not room:
-                continue
+        path, message = await self._find_route(character, args)
+        if path is None:
+            return False, message
+        return False, f"Route to {message} ({len(path)} steps): {', '.join(path)}"
 
-            # Add connected rooms to visit
-            for direction, target in room.get("exits", {}).items():
-                if isinstance(target, dict):  # Skip portal exits
-                    continue
-                if direction in dir_to_coords:
-                    dx, dy = dir_to_coords[direction]
-                    new_x, new_y = x + dx, y + dy
-                    if (new_x, new_y) not in grid:
-                        to_visit.append((target, new_x, new_y))
-
-        # If no rooms were mapped, return an error
-        if not grid:
-            return False, f"Could not generate map - room {current_room} not found in world {current_world}."
+    async def cmd_travel(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
+        """Walk the shortest route to a room."""
+        character = self.character_manager.get_character(character_name)
+        if not character:
+            return False, "Character not found."
 
-        # Find grid boundaries
-        min_x = min(x for x, y in grid.keys())
-        max_x = max(x for x, y in grid.keys())
-        min_y = min(y for x, y in grid.keys())
-        max_y = max(y for x, y in grid.keys())
-
-        # Build the ASCII map
-        map_lines = []
-        map_lines.append(f"\nWorld Map: {current_world.title()}")
-        map_lines.append("=" * 40)
-        map_lines.append("Legend: * = You are here")
-        map_lines.append("       → ↑ ↓ = Regular connections")
-        map_lines.append("       ⊗ = Portal to another realm")
-        map_lines.append("")
-
-        # Create the map with connections
-        for y in range(min_y, max_y + 1):
-            # Room ID line
-            room_line = ""
-            connection_line = ""
-            for x in range(min_x, max_x + 1):
-                if (x, y) in grid:
-                    room_id = grid[(x, y)]
-                    marker = "*" if room_id == current_room else " "
-                    room_line += f"{marker}{room_id:<20}"
-                    
-                    # Add horizontal connections
-                    room = next((r for r in rooms if r["id"] == room_id), None)
-                    if room and "east" in room.get("exits", {}):
-                        if (x + 1, y) in grid:
-                            connection_line += "----" + "─" * 16
-                        else:
-                            connection_line += " " * 20
-                    else:
-                        connection_line += " " * 20
-                else:
-                    room_line += " " * 20
-                    connection_line += " " * 20
-
-            map_lines.append(room_line)
-            if y < max_y:
-                # Add vertical connections
-                vertical_line = ""
-                for x in range(min_x, max_x + 1):
-                    if (x, y) in grid:
-                        room_id = grid[(x, y)]
-                        room = next((r for r in rooms if r["id"] == room_id), None)
-                        if room and ("south" in room.get("exits", {}) or "down" in room.get("exits", {})):
-                            if (x, y + 1) in grid:
-                                vertical_line += "     |" + " " * 14
-                            else:
-                                vertical_line += " " * 20
-                        else:
-                            vertical_line += " " * 20
-                    else:
-                        vertical_line += " " * 20
-                map_lines.append(connection_line)
-                map_lines.append(vertical_line)
-
-        return False, "\n".join(map_lines)
+        path, message = await self._find_route(character, args)
+        if path is None:
+            return False, message
+
+        # Walk it one exit at a time so every move goes through the normal checks,
+        # describing only the room it ends in
+        portal_messages = []
+        for steps, direction in enumerate(path):
+            moved, message = self._move(character_name, direction)
+            if not moved:
+                return False, f"You travel {', '.join(path[:steps])} and stop: {message}"
+            if message:
+                portal_messages.append(message)
+        description = await self.world_manager.get_room_description(character["current_room"], show_long=True)
+        return False, "\n\n".join([f"You travel {', '.join(path)}."] + portal_messages + [description])
+
+    async def cmd_reload(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
+        """Reload content files that changed on disk ('reload force' reloads regardless)."""
+        force = bool(args) and args[0] == "force"
+        if not force and not self.data_manager.content_changed():
+            return False, "Content is up to date."
+
+        worlds = await self.world_manager.reload_content()
+        return False, (f"Content reloaded (version {self.data_manager.content_version}); "
+                       f"worlds refreshed: {', '.join(worlds) or 'none'}.")
+
+    def cmd_stats_server(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
+        """Show per-command latency and I/O counters ('stats-server reset' starts over)."""
+        if args and args[0] == "reset":
+            metrics.reset()
+            return False, "Server stats reset."
+        return False, metrics.report()
+
+    def cmd_profile(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
+        """Turn profiling on (for every command or the named ones) or off, or write the profiles now."""
+        if not args:
+            return False, profiler.status()
+        if args[0] == "on":
+            names = set()
+            for word in args[1:]:
+                if word not in COMMAND_NAMES:
+                    return False, f"Unknown command '{word}'."
+                names.add(COMMAND_NAMES[word])
+            profiler.start(names)
+            return False, profiler.status()
+        if args[0] in ("off", "dump"):
+            if not profiler.enabled:
+                return False, "Profiling is off."
+            written = profiler.stop() if args[0] == "off" else profiler.roll()
+            stopped = "Profiling stopped. " if args[0] == "off" else ""
+            return False, f"{stopped}Wrote {', '.join(written) or 'nothing'}."
+        return False, "Usage: profile [on [command ...]|off|dump]"
 
     def cmd_sacrifice(self, character_name: str, args: List[str]) -> Tuple[bool, str]:
         """Handle sacrificing items for XP."""
@@ -0,0 +1,80 @@
+"""Asynchronous console input, so background tasks keep running while the player types."""
+
+import asyncio
+import os
+import signal
+import sys
+from typing import BinaryIO, Optional
+
+
+class AsyncConsole:
+    """
+    Reads lines from stdin without blocking the event loop. On a Unix
+    terminal a duplicate of stdin's descriptor is attached to the loop with
+    connect_read_pipe, so closing the pipe leaves sys.stdin open; anywhere
+    else (Windows, or input piped or redirected from a file, which input()
+    may already have buffered) each line is read in a worker thread.
+
+    While open, Ctrl-C reprints the prompt with a hint instead of
+    interrupting the game. Close it before using input() again.
+    """
+
+    def __init__(self, interrupt_message: str = ""):
+        self.interrupt_message = interrupt_message
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.transport: Optional[asyncio.BaseTransport] = None
+        self.pipe: Optional[BinaryIO] = None
+        self.prompt = ""
+        self._signal_installed = False
+
+    async def open(self) -> None:
+        loop = asyncio.get_running_loop()
+        if sys.platform != "win32" and sys.stdin.isatty():
+            self.reader = asyncio.StreamReader()
+            protocol = asyncio.StreamReaderProtocol(self.reader)
+            # The transport closes the file it reads, so give it its own descriptor
+            self.pipe = os.fdopen(os.dup(sys.stdin.fileno()), 'rb', buffering=0)
+            try:
+                self.transport, _ = await loop.connect_read_pipe(lambda: protocol, self.pipe)
+            except (OSError, ValueError):
+                self.pipe.close()
+                self.pipe = None
+                self.reader = None
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._on_interrupt)
+            self._signal_installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # Windows, or not the main thread: Ctrl-C behaves as usual
+
+    def close(self) -> None:
+        if self.transport:
+            self.transport.close()  # Closes only the duplicate descriptor
+            self.transport = None
+            self.pipe = None
+            # The pipe transport made the shared file non-blocking, which would break input()
+            os.set_blocking(sys.stdin.fileno(), True)
+        self.reader = None
+        if self._signal_installed:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGINT)
+            self._signal_installed = False
+
+    async def readline(self, prompt: str = "") -> str:
+        """Show a prompt and wait for a line, without its newline. Raises EOFError at end of input, like input()."""
+        self.prompt = prompt
+        print(prompt, end="", flush=True)
+        if self.reader:
+            line = (await self.reader.readline()).decode(errors="replace")
+        else:
+            line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            raise EOFError
+        return line.rstrip("\r\n")
+
+    def notify(self, message: str) -> None:
+        """Print a message that arrived while waiting for input, then the prompt again."""
+        print(f"\n{message}")
+        print(self.prompt, end="", flush=True)
+
+    def _on_interrupt(self) -> None:
+        print(f"\n{self.interrupt_message}" if self.interrupt_message else "")
+        print(self.prompt, end="", flush=True)
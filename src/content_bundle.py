@@ -0,0 +1,103 @@
+"""Pre-indexed content bundle compiled from the JSON data files for fast startup."""
+
+import json
+import os
+import pickle
+from typing import Dict, Optional
+from .storage import write_bytes_atomic
+from .records import ItemRecord, NpcRecord, RoomRecord, intern_strings, to_records
+
+BUNDLE_VERSION = 2
+BUNDLE_FILE = "content.bundle"
+
+# Static content that goes into the bundle; characters.json is save data and is never bundled
+CONTENT_FILES = ("items.json", "npcs.json", "mobs.json", "classes.json")
+
+
+def source_files(data_dir: str) -> Dict[str, int]:
+    """Map every content file (relative to data_dir) to its modification time."""
+    sources = {}
+    for filename in CONTENT_FILES:
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(path):
+            sources[filename] = os.stat(path).st_mtime_ns
+    worlds_dir = os.path.join(data_dir, "worlds")
+    if os.path.isdir(worlds_dir):
+        for filename in sorted(os.listdir(worlds_dir)):
+            if filename.endswith('.json'):
+                sources[os.path.join("worlds", filename)] = os.stat(os.path.join(worlds_dir, filename)).st_mtime_ns
+    return sources
+
+
+def compile_bundle(data_dir: str = "data") -> Dict:
+    """Read every content file and build the bundle, records and indexes included."""
+    def load(filename: str) -> Dict:
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return intern_strings(json.load(f))
+
+    items = load("items.json")
+    items["items"] = to_records(items.get("items", []), ItemRecord)
+    npcs = load("npcs.json")
+    npcs["npcs"] = to_records(npcs.get("npcs", []), NpcRecord)
+
+    # Worlds are pickled individually: each load_world gets a fresh, mutable copy
+    # and worlds that are never visited are never unpickled
+    worlds = {}
+    worlds_dir = os.path.join(data_dir, "worlds")
+    if os.path.isdir(worlds_dir):
+        for filename in sorted(os.listdir(worlds_dir)):
+            if filename.endswith('.json'):
+                world_data = load(os.path.join("worlds", filename))
+                world_data["rooms"] = to_records(world_data.get("rooms", []), RoomRecord)
+                worlds[filename[:-5]] = pickle.dumps(world_data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return {
+        "version": BUNDLE_VERSION,
+        "sources": source_files(data_dir),
+        "items": items,
+        "item_index": {item["id"]: item for item in items.get("items", [])},
+        "npcs": npcs,
+        "npc_index": {npc["id"]: npc for npc in npcs.get("npcs", [])},
+        "mobs": load("mobs.json"),
+        "classes": load("classes.json"),
+        "worlds": worlds
+    }
+
+
+def write_bundle(bundle: Dict, data_dir: str = "data") -> str:
+    """Write a compiled bundle into the data directory and return its path."""
+    path = os.path.join(data_dir, BUNDLE_FILE)
+    # Fsynced before the rename, so a crash can't leave a truncated bundle with a current mtime
+    write_bytes_atomic(path, pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL))
+    return path
+
+
+def load_bundle(data_dir: str = "data") -> Optional[Dict]:
+    """
+    Load the compiled bundle if there is one and it is current. Returns None
+    (so callers fall back to the JSON files) when the bundle is missing, was
+    written by a different bundle version, or any content file changed since
+    it was compiled.
+    """
+    path = os.path.join(data_dir, BUNDLE_FILE)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            bundle = pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+        print(f"Warning: {BUNDLE_FILE} could not be read ({e}); loading JSON content instead.")
+        return None
+
+    if not isinstance(bundle, dict) or bundle.get("version") != BUNDLE_VERSION:
+        print(f"Warning: {BUNDLE_FILE} is from another version; loading JSON content instead.")
+        return None
+    if bundle.get("sources") != source_files(data_dir):
+        print(f"Warning: {BUNDLE_FILE} is out of date; loading JSON content instead. "
+              "Run tools/compile_content.py to rebuild it.")
+        return None
+    return bundle
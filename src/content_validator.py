@@ -0,0 +1,288 @@
+"""Whole-content validation: one exit graph across every world plus item, NPC and mob references."""
+
+import json
+import os
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Where new characters start (see CharacterManager.create_character)
+START_WORLD = "default"
+START_ROOM = "forest_clearing_001"
+
+# Regular exits that are expected to have a matching exit back
+OPPOSITE_DIRECTIONS = {
+    "north": "south",
+    "south": "north",
+    "east": "west",
+    "west": "east",
+    "up": "down",
+    "down": "up",
+    "northeast": "southwest",
+    "southwest": "northeast",
+    "northwest": "southeast",
+    "southeast": "northwest"
+}
+
+
+class ContentIssue:
+    """A single validation finding."""
+
+    __slots__ = ("severity", "world", "message")
+
+    ERROR = "error"
+    WARNING = "warning"
+
+    def __init__(self, severity: str, message: str, world: Optional[str] = None):
+        self.severity = severity
+        self.world = world
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"[{self.world}] {self.message}" if self.world else self.message
+
+
+class ContentValidator:
+    """
+    Validates game content as a whole.
+
+    Every world is folded into one graph of (world, room) nodes connected by
+    regular exits and portals, so reachability is a single BFS from the start
+    room. Item, NPC and mob references are checked against ID sets. All checks
+    are linear in the size of the content.
+
+    Errors are broken references that will misbehave in game; warnings are
+    content that is legal but probably unintended (one-way exits, unreachable
+    rooms, items and NPCs nothing refers to).
+    """
+
+    def __init__(self, worlds: Dict[str, Dict], items: Optional[Dict] = None, npcs: Optional[Dict] = None,
+                 mobs: Optional[Dict] = None, classes: Optional[Dict] = None):
+        self.worlds = worlds  # World name -> world data
+        self.items = items or {}
+        self.npcs = npcs or {}
+        self.mobs = mobs or {}
+        self.classes = classes or {}
+        self.issues: List[ContentIssue] = []
+
+    @classmethod
+    def from_directory(cls, data_dir: str = "data") -> "ContentValidator":
+        """Load every content file from a data directory."""
+        def load(path: str) -> Dict:
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return {}
+
+        worlds = {}
+        worlds_dir = os.path.join(data_dir, "worlds")
+        if os.path.isdir(worlds_dir):
+            for file in sorted(os.listdir(worlds_dir)):
+                if file.endswith('.json'):
+                    worlds[file[:-5]] = load(os.path.join(worlds_dir, file))
+
+        return cls(
+            worlds,
+            items=load(os.path.join(data_dir, "items.json")),
+            npcs=load(os.path.join(data_dir, "npcs.json")),
+            mobs=load(os.path.join(data_dir, "mobs.json")),
+            classes=load(os.path.join(data_dir, "classes.json"))
+        )
+
+    @property
+    def errors(self) -> List[ContentIssue]:
+        return [issue for issue in self.issues if issue.severity == ContentIssue.ERROR]
+
+    @property
+    def warnings(self) -> List[ContentIssue]:
+        return [issue for issue in self.issues if issue.severity == ContentIssue.WARNING]
+
+    def _error(self, message: str, world: Optional[str] = None) -> None:
+        self.issues.append(ContentIssue(ContentIssue.ERROR, message, world))
+
+    def _warning(self, message: str, world: Optional[str] = None) -> None:
+        self.issues.append(ContentIssue(ContentIssue.WARNING, message, world))
+
+    def validate(self) -> List[ContentIssue]:
+        """Run every check and return all issues found."""
+        self.issues = []
+        item_ids = self._collect_ids(self.items.get("items", []), "item")
+        npc_ids = self._collect_ids(self.npcs.get("npcs", []), "NPC")
+        # Nothing refers to mobs by ID, but duplicate mob IDs are still reported
+        self._collect_ids(self.mobs.get("mobs", []), "mob")
+
+        rooms = self._index_rooms()
+        graph = self._build_graph(rooms)
+        self._check_one_way_exits(rooms)
+        self._check_reachability(rooms, graph)
+
+        used_items: Set[str] = set()
+        used_npcs: Set[str] = set()
+        self._check_room_contents(rooms, item_ids, npc_ids, used_items, used_npcs)
+        self._check_mobs(rooms, item_ids, used_items)
+        self._check_npcs(item_ids, used_items)
+        self._check_classes(item_ids, used_items)
+
+        for item_id in item_ids - used_items:
+            self._warning(f"Item {item_id} is never placed, dropped, sold or given out")
+        for npc_id in npc_ids - used_npcs:
+            self._warning(f"NPC {npc_id} is not placed in any room")
+        return self.issues
+
+    def _collect_ids(self, entries: Iterable[Dict], kind: str) -> Set[str]:
+        """Collect the IDs of a content type, reporting duplicates."""
+        ids = set()
+        for entry in entries:
+            entry_id = entry.get("id")
+            if not entry_id:
+                self._error(f"A {kind} has no ID")
+            elif entry_id in ids:
+                self._error(f"Duplicate {kind} ID: {entry_id}")
+            ids.add(entry_id)
+        return ids
+
+    def _index_rooms(self) -> Dict[Tuple[str, str], Dict]:
+        """Map every (world, room ID) to its room, reporting duplicate rooms."""
+        rooms = {}
+        for world, world_data in self.worlds.items():
+            for room in world_data.get("rooms", []):
+                room_id = room.get("id")
+                if not room_id:
+                    self._error("A room has no ID", world)
+                    continue
+                if (world, room_id) in rooms:
+                    self._error(f"Duplicate room ID: {room_id}", world)
+                rooms[(world, room_id)] = room
+        return rooms
+
+    def _build_graph(self, rooms: Dict[Tuple[str, str], Dict]) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
+        """Build the exit graph, reporting dangling exits and bad portal targets."""
+        graph = {}
+        for (world, room_id), room in rooms.items():
+            edges = []
+            for direction, target in room.get("exits", {}).items():
+                if isinstance(target, dict):
+                    if target.get("type") != "world_transition":
+                        self._error(f"Room {room_id} has exit {direction} of unknown type {target.get('type')}", world)
+                        continue
+                    target_world = target.get("target_world")
+                    node = (target_world, target.get("target_room"))
+                    if target_world not in self.worlds:
+                        self._error(f"Room {room_id} has portal {direction} to non-existent world {target_world}", world)
+                        continue
+                    if node not in rooms:
+                        self._error(f"Room {room_id} has portal {direction} to non-existent room "
+                                    f"{node[1]} in world {target_world}", world)
+                        continue
+                else:
+                    node = (world, target)
+                    if node not in rooms:
+                        self._error(f"Room {room_id} has invalid exit {direction} to non-existent room {target}", world)
+                        continue
+                edges.append(node)
+            graph[(world, room_id)] = edges
+        return graph
+
+    def _check_one_way_exits(self, rooms: Dict[Tuple[str, str], Dict]) -> None:
+        """Warn about regular exits with no exit leading back."""
+        for (world, room_id), room in rooms.items():
+            for direction, target in room.get("exits", {}).items():
+                if isinstance(target, dict) or (world, target) not in rooms:
+                    continue
+                back_exits = rooms[(world, target)].get("exits", {})
+                opposite = OPPOSITE_DIRECTIONS.get(direction)
+                if opposite and back_exits.get(opposite) == room_id:
+                    continue
+                if room_id not in back_exits.values():
+                    self._warning(f"One-way exit: {room_id} {direction} -> {target} has no way back", world)
+
+    def _check_reachability(self, rooms: Dict[Tuple[str, str], Dict],
+                            graph: Dict[Tuple[str, str], List[Tuple[str, str]]]) -> None:
+        """Warn about rooms that can't be reached from the start room."""
+        start = (START_WORLD, START_ROOM)
+        if start not in rooms:
+            self._error(f"Start room {START_ROOM} does not exist", START_WORLD)
+            return
+
+        reached = {start}
+        queue = deque([start])
+        while queue:
+            for node in graph[queue.popleft()]:
+                if node not in reached:
+                    reached.add(node)
+                    queue.append(node)
+
+        for world, room_id in rooms:
+            if (world, room_id) not in reached:
+                self._warning(f"Room {room_id} is unreachable from the start room", world)
+
+    def _check_room_contents(self, rooms: Dict[Tuple[str, str], Dict], item_ids: Set[str], npc_ids: Set[str],
+                             used_items: Set[str], used_npcs: Set[str]) -> None:
+        """Check item and NPC references in rooms and portal requirements."""
+        for (world, room_id), room in rooms.items():
+            for item_id in room.get("items", []):
+                used_items.add(item_id)
+                if item_id not in item_ids:
+                    self._error(f"Room {room_id} contains unknown item {item_id}", world)
+            for npc_id in room.get("npcs", []):
+                used_npcs.add(npc_id)
+                if npc_id not in npc_ids:
+                    self._error(f"Room {room_id} contains unknown NPC {npc_id}", world)
+            for direction, target in room.get("exits", {}).items():
+                if isinstance(target, dict):
+                    item_id = target.get("requirements", {}).get("item")
+                    if item_id and item_id not in item_ids:
+                        self._error(f"Room {room_id} portal {direction} requires unknown item {item_id}", world)
+
+    def _check_mobs(self, rooms: Dict[Tuple[str, str], Dict], item_ids: Set[str], used_items: Set[str]) -> None:
+        """Check mob loot tables and spawn areas."""
+        room_ids = {room_id for _, room_id in rooms}
+        for mob in self.mobs.get("mobs", []):
+            for item_id in mob.get("loot_table", {}):
+                used_items.add(item_id)
+                if item_id not in item_ids:
+                    self._error(f"Mob {mob.get('id')} drops unknown item {item_id}")
+            spawn_areas = mob.get("spawn_areas", [])
+            for room_id in spawn_areas:
+                if room_id not in room_ids:
+                    self._error(f"Mob {mob.get('id')} spawns in non-existent room {room_id}")
+            if not any(room_id in room_ids for room_id in spawn_areas):
+                self._warning(f"Mob {mob.get('id')} never spawns anywhere")
+
+    def _check_npcs(self, item_ids: Set[str], used_items: Set[str]) -> None:
+        """Check merchant stock, quest items and dialogue topic links."""
+        for npc in self.npcs.get("npcs", []):
+            npc_id = npc.get("id")
+            merchant = npc.get("merchant_data", {})
+            for inventory in ("inventory", "premium_inventory"):
+                for item_id in merchant.get(inventory, {}):
+                    used_items.add(item_id)
+                    if item_id not in item_ids:
+                        self._error(f"NPC {npc_id} sells unknown item {item_id}")
+
+            topics = npc.get("dialogue", {}).get("topics", {})
+            for topic_id, topic in topics.items():
+                if not isinstance(topic, dict):
+                    continue
+                referenced = [topic.get("item_requirement"), topic.get("effects", {}).get("add_item")]
+                for item_id in referenced:
+                    if not item_id:
+                        continue
+                    used_items.add(item_id)
+                    if item_id not in item_ids:
+                        self._error(f"NPC {npc_id} topic '{topic_id}' refers to unknown item {item_id}")
+                linked = list(topic.get("leads_to", [])) + list(topic.get("effects", {}).get("unlock_topics", []))
+                if topic.get("requires_topic"):
+                    linked.append(topic["requires_topic"])
+                for other in linked:
+                    if other not in topics:
+                        # Harmless in game (the topic just never appears), so only a warning
+                        self._warning(f"NPC {npc_id} topic '{topic_id}' refers to unknown topic '{other}'")
+
+    def _check_classes(self, item_ids: Set[str], used_items: Set[str]) -> None:
+        """Check class starting equipment."""
+        for class_data in self.classes.get("classes", []):
+            for slot, item_id in class_data.get("starting_equipment", {}).items():
+                used_items.add(item_id)
+                if item_id not in item_ids:
+                    self._error(f"Class {class_data.get('id')} starts with unknown item {item_id} in slot {slot}")
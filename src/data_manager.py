@@ -1,53 +1,195 @@
-import json
 import os
-from typing import Dict, List, Optional, Any
+import time
+import pickle
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any
+from .mob import MobPrototype
+from .content_bundle import BUNDLE_FILE, load_bundle, source_files
+from .records import ItemRecord, NpcRecord, to_records
+from .storage import read_json_with_backups, write_json_atomic
+from .migrations import migrate_characters
+from .instrumentation import metrics
 
 class DataManager:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", save_interval: float = 0):
         self.data_dir = data_dir
         self.items_data: Dict = {}
         self.characters_data: Dict = {}
         self.npcs_data: Dict = {}
+        self.classes_data: Dict = {}
+        self.item_index: Dict[str, Dict] = {}  # Item ID -> item
+        self.npc_index: Dict[str, Dict] = {}  # NPC ID -> NPC
+        self.character_index: Dict[str, Dict] = {}  # Lowercase character name -> character
+        # Lowercase character name -> version, renewed on every update so renders of the old state can be reused
+        self.character_versions: Dict[str, int] = {}
+        self._last_character_version = 0
+        self.mob_prototypes: Dict[str, MobPrototype] = {}
+        self.bundle: Optional[Dict] = None  # Compiled content, if data/content.bundle is current
+        self.content_sources: Dict[str, int] = {}  # Content file -> mtime when it was loaded
+        self.content_version = 0  # Bumped every time content is (re)loaded
+        # Character saves are coalesced: inside batched_saves() they only mark the data dirty,
+        # and characters.json is written at most once every save_interval seconds
+        self.save_interval = save_interval
+        self.characters_dirty = False
+        self._last_save = 0.0
+        self._batch_depth = 0
         self.load_all_data()
 
     def load_all_data(self) -> None:
-        """Load all JSON data files into memory."""
-        self.items_data = self._load_json_file("items.json")
-        self.characters_data = self._load_json_file("characters.json")
-        self.npcs_data = self._load_json_file("npcs.json")
+        """Load all content, from the compiled bundle when available, otherwise from JSON."""
+        self.apply_content(self.read_content())
+        self.characters_data = self._load_characters()
+        # Upgrade old saves once, up front, so loading a character is a plain lookup
+        migrated = migrate_characters(self.characters_data)
+        if migrated:
+            print(f"Upgraded {migrated} saved characters to the current format.")
+            self.characters_dirty = True
+            self.flush_characters()
+        self._index_characters()
+
+    def read_content(self) -> Dict:
+        """
+        Read and index all static content without touching the live data, so it
+        can run in a worker thread while commands keep using the current content.
+        """
+        sources = self._content_mtimes()
+        bundle = load_bundle(self.data_dir)
+        if bundle:
+            items_data = bundle["items"]
+            npcs_data = bundle["npcs"]
+            mobs_data = bundle["mobs"]
+            classes_data = bundle["classes"]
+            item_index = bundle["item_index"]
+            npc_index = bundle["npc_index"]
+        else:
+            items_data = self._load_json_file("items.json")
+            items_data["items"] = to_records(items_data.get("items", []), ItemRecord)
+            npcs_data = self._load_json_file("npcs.json")
+            npcs_data["npcs"] = to_records(npcs_data.get("npcs", []), NpcRecord)
+            mobs_data = self._load_json_file("mobs.json")
+            classes_data = self._load_json_file("classes.json")
+            item_index = {item["id"]: item for item in items_data.get("items", [])}
+            npc_index = {npc["id"]: npc for npc in npcs_data.get("npcs", [])}
+
+        return {
+            "bundle": bundle,
+            "sources": sources,
+            "items_data": items_data,
+            "npcs_data": npcs_data,
+            "classes_data": classes_data,
+            "item_index": item_index,
+            "npc_index": npc_index,
+            "mob_prototypes": {mob["id"]: MobPrototype(mob) for mob in mobs_data.get("mobs", [])}
+        }
+
+    def apply_content(self, content: Dict) -> None:
+        """Swap in freshly read content. Anything still holding the old objects keeps working on them."""
+        self.bundle = content["bundle"]
+        self.content_sources = content["sources"]
+        self.items_data = content["items_data"]
+        self.npcs_data = content["npcs_data"]
+        self.classes_data = content["classes_data"]
+        self.item_index = content["item_index"]
+        self.npc_index = content["npc_index"]
+        self.mob_prototypes = content["mob_prototypes"]
+        self.content_version += 1
+
+    def _content_mtimes(self) -> Dict[str, int]:
+        """Modification times of every content file, including a compiled bundle."""
+        mtimes = source_files(self.data_dir)
+        bundle_path = os.path.join(self.data_dir, BUNDLE_FILE)
+        if os.path.exists(bundle_path):
+            mtimes[BUNDLE_FILE] = os.stat(bundle_path).st_mtime_ns
+        return mtimes
+
+    def content_changed(self) -> bool:
+        """Check whether any content file was added, removed or modified since it was loaded."""
+        return self._content_mtimes() != self.content_sources
+
+    def get_classes(self) -> Dict:
+        """Get the character class definitions."""
+        return self.classes_data
+
+    def get_world_data(self, world_name: str, bundle: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Get a fresh copy of a world from the compiled bundle (or another bundle,
+        such as one read for a reload), or None to load its JSON file.
+        """
+        bundle = bundle if bundle is not None else self.bundle
+        if not bundle or world_name not in bundle["worlds"]:
+            return None
+        return pickle.loads(bundle["worlds"][world_name])
 
     def _load_json_file(self, filename: str) -> Dict:
         """Load a JSON file and return its contents."""
         filepath = os.path.join(self.data_dir, filename)
         try:
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            return read_json_with_backups(filepath)
         except FileNotFoundError:
             print(f"Warning: {filename} not found. Creating empty structure.")
             return {}
-        except json.JSONDecodeError:
-            print(f"Error: {filename} is not valid JSON.")
+        except ValueError as e:
+            print(f"Error: {e}")
             return {}
 
-    def save_characters(self) -> None:
-        """Save the current characters data back to file."""
+    def _load_characters(self) -> Dict:
+        """Load characters.json. Unlike content, unreadable save data is fatal rather than treated as empty."""
         filepath = os.path.join(self.data_dir, "characters.json")
-        with open(filepath, 'w') as f:
-            json.dump(self.characters_data, f, indent=2)
+        try:
+            return read_json_with_backups(filepath)
+        except FileNotFoundError:
+            print("Warning: characters.json not found. Creating empty structure.")
+            return {}
+        except ValueError as e:
+            # Carrying on with no characters would overwrite every player on the next save
+            raise RuntimeError(f"{e}. Restore characters.json before starting the game.") from e
+
+    def _index_characters(self) -> None:
+        """Rebuild the character name index."""
+        self.character_index = {char["name"].lower(): char for char in self.characters_data.get("characters", [])}
+
+    def save_characters(self) -> None:
+        """Mark the characters data as changed and write it unless saves are being batched."""
+        self.characters_dirty = True
+        if self._batch_depth == 0 and time.monotonic() - self._last_save >= self.save_interval:
+            self.flush_characters()
+
+    def flush_characters(self) -> None:
+        """Write characters.json now if there are unsaved changes."""
+        if not self.characters_dirty:
+            return
+        write_json_atomic(os.path.join(self.data_dir, "characters.json"), self.characters_data)
+        self.characters_dirty = False
+        self._last_save = time.monotonic()
+
+    @contextmanager
+    def batched_saves(self) -> Iterator[None]:
+        """Coalesce every character save made inside the block (e.g. one command) into a single write."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self.characters_dirty:
+                self.save_characters()
 
     def get_item(self, item_id: str) -> Optional[Dict]:
         """Get item data by ID."""
-        for item in self.items_data.get("items", []):
-            if item["id"] == item_id:
-                return item
-        return None
+        metrics.count("get_item")
+        return self.item_index.get(item_id)
 
     def get_npc(self, npc_id: str) -> Optional[Dict]:
         """Get NPC data by ID."""
-        for npc in self.npcs_data.get("npcs", []):
-            if npc["id"] == npc_id:
-                return npc
-        return None
+        metrics.count("get_npc")
+        return self.npc_index.get(npc_id)
+
+    def get_mob_prototypes(self) -> Dict[str, MobPrototype]:
+        """Get all mob prototypes by ID."""
+        return self.mob_prototypes
+
+    def get_mob(self, mob_id: str) -> Optional[MobPrototype]:
+        """Get a shared mob prototype by ID."""
+        return self.get_mob_prototypes().get(mob_id)
 
     def get_npc_by_name(self, name: str) -> Optional[Dict]:
         """Get NPC data by name (case-insensitive)."""
@@ -59,27 +201,39 @@ class DataManager:
 
     def get_character(self, name: str) -> Optional[Dict]:
         """Get character data by name."""
-        for char in self.characters_data.get("characters", []):
-            if char["name"].lower() == name.lower():
-                return char
-        return None
+        return self.character_index.get(name.lower())
 
     def add_character(self, character_data: Dict) -> None:
         """Add a new character to the data."""
         if "characters" not in self.characters_data:
             self.characters_data["characters"] = []
         self.characters_data["characters"].append(character_data)
+        self.character_index[character_data["name"].lower()] = character_data
+        self.character_changed(character_data)
         self.save_characters()
 
     def update_character(self, character_data: Dict) -> None:
         """Update an existing character's data."""
-        chars = self.characters_data.get("characters", [])
-        for i, char in enumerate(chars):
-            if char["name"] == character_data["name"]:
-                chars[i] = character_data
-                break
+        # Characters are usually updated in place, in which case the stored one is already this one
+        if self.character_index.get(character_data["name"].lower()) is not character_data:
+            chars = self.characters_data.get("characters", [])
+            for i, char in enumerate(chars):
+                if char["name"] == character_data["name"]:
+                    chars[i] = character_data
+                    self.character_index[character_data["name"].lower()] = character_data
+                    break
+        self.character_changed(character_data)
         self.save_characters()
 
+    def character_changed(self, character_data: Dict) -> None:
+        """Give a character a new version number; versions are never reused, even across deletions."""
+        self._last_character_version += 1
+        self.character_versions[character_data["name"].lower()] = self._last_character_version
+
+    def get_character_version(self, name: str) -> int:
+        """Current version of a character, for caching anything derived from its state."""
+        return self.character_versions.get(name.lower(), 0)
+
     def list_characters(self) -> List[str]:
         """Return a list of all character names."""
         return [char["name"] for char in self.characters_data.get("characters", [])]
@@ -133,8 +287,7 @@ class DataManager:
         filename = os.path.basename(filepath)
         filepath = os.path.join(self.data_dir, filename)
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            write_json_atomic(filepath, data)
         except Exception as e:
             print(f"Error saving {filename}: {str(e)}") 
 
@@ -146,6 +299,8 @@ class DataManager:
                 char for char in self.characters_data.get("characters", [])
                 if char["name"].lower() != name.lower()
             ]
+            self.character_index.pop(name.lower(), None)
+            self.character_versions.pop(name.lower(), None)
             # Save updated characters file
             self.save_characters()
             return True
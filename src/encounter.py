@@ -0,0 +1,130 @@
+"""Room-wide combat encounters between any number of characters and mobs."""
+
+from typing import Dict, List, Optional, Set, Tuple
+from .mob import MobInstance
+
+
+class Encounter:
+    """
+    All combat in one room: the characters fighting, the mobs they fight,
+    each character's target and each mob's aggro (threat) table.
+
+    Mobs are keyed by an encounter-local integer so that two mobs from the
+    same prototype can fight side by side. Each mob's top-threat character is
+    tracked incrementally, so resolving a round costs O(characters + mobs).
+
+    A round is resolved once every character has declared an attack, so each
+    fighter strikes once per round however often the others type.
+    """
+
+    def __init__(self, world: str, room_id: str):
+        self.world = world
+        self.room_id = room_id
+        self.characters: Dict[str, Dict] = {}  # Character name -> character data
+        self.mobs: Dict[int, MobInstance] = {}
+        self.targets: Dict[str, int] = {}  # Character name -> mob key
+        self.aggro: Dict[int, Dict[str, float]] = {}  # Mob key -> character name -> threat
+        self.top_threat: Dict[int, Tuple[str, float]] = {}  # Mob key -> (character name, threat)
+        self.rounds = 0
+        self.acted: Set[str] = set()  # Characters who have attacked in the round being gathered
+        self.round_started: Optional[float] = None  # When the first of them attacked (monotonic)
+        self._next_mob_key = 0
+
+    def add_character(self, character: Dict) -> None:
+        """Add a character to the encounter."""
+        self.characters[character["name"]] = character
+
+    def add_mob(self, mob: MobInstance) -> int:
+        """Add a mob to the encounter and return its key."""
+        key = self._next_mob_key
+        self._next_mob_key += 1
+        self.mobs[key] = mob
+        self.aggro[key] = {}
+        return key
+
+    def act(self, character_name: str, now: float) -> bool:
+        """Declare a character's attack this round; False if they already have."""
+        if character_name in self.acted:
+            return False
+        if not self.acted:
+            self.round_started = now
+        self.acted.add(character_name)
+        return True
+
+    def all_acted(self) -> bool:
+        """Whether every character still fighting has attacked this round."""
+        return bool(self.acted) and self.characters.keys() <= self.acted
+
+    def end_round(self) -> None:
+        """Start gathering the next round."""
+        self.rounds += 1
+        self.acted.clear()
+        self.round_started = None
+
+    def find_mob(self, mob_id: str) -> Optional[int]:
+        """Find the key of a living mob in the encounter by prototype ID."""
+        for key, mob in self.mobs.items():
+            if mob.id == mob_id:
+                return key
+        return None
+
+    def set_target(self, character_name: str, mob_key: int) -> None:
+        """Point a character at a mob; the mob now knows about the character."""
+        self.targets[character_name] = mob_key
+        self.add_threat(mob_key, character_name, 0)
+
+    def get_target(self, character_name: str) -> Optional[MobInstance]:
+        """Get the mob a character is currently attacking."""
+        key = self.targets.get(character_name)
+        return self.mobs.get(key) if key is not None else None
+
+    def add_threat(self, mob_key: int, character_name: str, amount: float) -> None:
+        """Add threat against a character to a mob's aggro table."""
+        table = self.aggro[mob_key]
+        threat = table.get(character_name, 0) + amount
+        table[character_name] = threat
+        top = self.top_threat.get(mob_key)
+        if top is None or threat > top[1] or top[0] == character_name:
+            self.top_threat[mob_key] = (character_name, threat)
+
+    def mob_target(self, mob_key: int) -> Optional[str]:
+        """Get the character a mob is attacking (highest threat)."""
+        top = self.top_threat.get(mob_key)
+        return top[0] if top else None
+
+    def remove_mob(self, mob_key: int) -> List[str]:
+        """Remove a mob; return the characters that had it as their target."""
+        self.mobs.pop(mob_key, None)
+        self.aggro.pop(mob_key, None)
+        self.top_threat.pop(mob_key, None)
+        orphaned = [name for name, key in self.targets.items() if key == mob_key]
+        for name in orphaned:
+            del self.targets[name]
+        return orphaned
+
+    def remove_character(self, character_name: str) -> None:
+        """Remove a character (fled or defeated) from the encounter."""
+        self.characters.pop(character_name, None)
+        self.targets.pop(character_name, None)
+        self.acted.discard(character_name)
+        for key, table in self.aggro.items():
+            if table.pop(character_name, None) is None:
+                continue
+            top = self.top_threat.get(key)
+            if top and top[0] == character_name:
+                if table:
+                    name = max(table, key=table.get)
+                    self.top_threat[key] = (name, table[name])
+                else:
+                    del self.top_threat[key]
+
+    def next_target(self, character_name: str) -> Optional[int]:
+        """Find another mob still fighting this character."""
+        for key, table in self.aggro.items():
+            if character_name in table:
+                return key
+        return None
+
+    def is_over(self) -> bool:
+        """An encounter ends when either side is empty."""
+        return not self.characters or not self.mobs
@@ -0,0 +1,187 @@
+"""Lightweight in-process metrics: per-command latency histograms and operation counters."""
+
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Histogram buckets are spaced 2^(1/4) apart (about 19%), starting at one microsecond
+BUCKETS_PER_DOUBLING = 4
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram; percentiles are accurate to one bucket (about 19%)."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        micros = seconds * 1_000_000
+        bucket = int(math.log2(micros) * BUCKETS_PER_DOUBLING) if micros > 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """Latency in seconds below which percent of the samples fall (upper edge of the bucket)."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** ((bucket + 1) / BUCKETS_PER_DOUBLING) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class Metrics:
+    """
+    Process-wide metrics registry.
+
+    Managers call count() on hot paths (item, NPC and room lookups, JSON
+    loads and saves, AI calls, cache hits), so it does as little as possible
+    and nothing at all when disabled. Counts are kept both in total and per
+    command: while a command runs (see command()), they are also attributed to
+    it, so the report shows e.g. how many get_item calls one inventory costs.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = time.time()
+        self.latency: Dict[str, LatencyHistogram] = {}  # Command -> latency histogram
+        self.counters: Dict[str, int] = {}
+        self.command_counters: Dict[str, Dict[str, int]] = {}  # Command -> counter -> total
+        self.current_command: Optional[str] = None
+        self.dump_path: Optional[str] = None
+        self.dump_interval = 60.0
+        self._last_dump = time.monotonic()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter, attributing it to the running command if there is one."""
+        if not self.enabled:
+            return
+        counters = self.counters
+        counters[name] = counters.get(name, 0) + amount
+        if self.current_command is not None:
+            counters = self.command_counters.setdefault(self.current_command, {})
+            counters[name] = counters.get(name, 0) + amount
+
+    @contextmanager
+    def command(self, name: str) -> Iterator[None]:
+        """Time a command and attribute the counts made while it runs to it."""
+        if not self.enabled:
+            yield
+            return
+        outer = self.current_command
+        self.current_command = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latency.setdefault(name, LatencyHistogram()).record(time.perf_counter() - start)
+            self.current_command = outer
+            self.maybe_dump()
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Time an operation other than a command (e.g. an AI call) into its own histogram."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latency.setdefault(name, LatencyHistogram()).record(time.perf_counter() - start)
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self.latency.clear()
+        self.counters.clear()
+        self.command_counters.clear()
+
+    def snapshot(self) -> Dict:
+        """All metrics as plain data."""
+        return {
+            "time": time.time(),
+            "uptime": time.time() - self.started,
+            "latency": {name: histogram.summary() for name, histogram in self.latency.items()},
+            "counters": dict(self.counters),
+            "per_command": {name: dict(counters) for name, counters in self.command_counters.items() if counters}
+        }
+
+    def report(self) -> str:
+        """Human-readable report for the stats-server command."""
+        if not self.enabled:
+            return "Metrics are disabled (MUD_METRICS=0)."
+        lines = [f"Server stats (last {time.time() - self.started:.0f}s):", ""]
+
+        lines.append(f"{'Latency':<20}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name, histogram in sorted(self.latency.items(), key=lambda entry: -entry[1].total):
+            s = histogram.summary()
+            lines.append(f"{name:<20}{s['count']:>8}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+                         f"{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}")
+
+        if self.counters:
+            lines.extend(["", "Counters (total; command with the most per call):"])
+            for name, total in sorted(self.counters.items()):
+                heaviest = self._heaviest_command(name)
+                detail = f"  ({heaviest[0]}: {heaviest[1]:.1f}/call)" if heaviest else ""
+                lines.append(f"  {name:<22}{total:>10}{detail}")
+        if self.dump_path:
+            lines.extend(["", f"Dumping every {self.dump_interval:.0f}s to {self.dump_path}"])
+        return "\n".join(lines)
+
+    def _heaviest_command(self, counter: str) -> Optional[Tuple[str, float]]:
+        best = None
+        for name, counters in self.command_counters.items():
+            calls = self.latency[name].count if name in self.latency else 0
+            if counter in counters and calls:
+                per_call = counters[counter] / calls
+                if best is None or per_call > best[1]:
+                    best = (name, per_call)
+        return best
+
+    def maybe_dump(self) -> None:
+        """Append a snapshot to the dump file if one is configured and the interval has passed."""
+        if not self.dump_path or time.monotonic() - self._last_dump < self.dump_interval:
+            return
+        self._last_dump = time.monotonic()
+        try:
+            with open(self.dump_path, 'a') as f:
+                f.write(json.dumps(self.snapshot()) + "\n")
+        except OSError as e:
+            print(f"Warning: could not write metrics to {self.dump_path}: {e}")
+
+
+def configure_from_env() -> None:
+    """Apply MUD_METRICS, MUD_METRICS_FILE and MUD_METRICS_INTERVAL."""
+    metrics.enabled = os.getenv("MUD_METRICS", "1") != "0"
+    metrics.dump_path = os.getenv("MUD_METRICS_FILE") or None
+    interval = os.getenv("MUD_METRICS_INTERVAL")
+    if interval:
+        metrics.dump_interval = float(interval)
+
+
+# The process-wide registry
+metrics = Metrics()
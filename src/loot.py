@@ -0,0 +1,94 @@
+"""Compiled loot tables for fast, reproducible loot rolls."""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+
+class LootTable:
+    """
+    A mob loot table compiled into an alias table over its possible drop sets.
+
+    Every entry in a loot table drops independently with its own probability,
+    so a table with n entries has up to 2**n distinct outcomes. For small tables
+    those outcomes are enumerated once at compile time and sampled with Walker's
+    alias method, which costs a single random draw per kill. Tables with more
+    than MAX_ENUMERATED_ENTRIES entries fall back to one draw per entry.
+    """
+
+    MAX_ENUMERATED_ENTRIES = 10
+
+    __slots__ = ("entries", "outcomes", "probabilities", "alias_prob", "alias")
+
+    def __init__(self, loot_table: Dict[str, float]):
+        self.entries: Tuple[Tuple[str, float], ...] = tuple(
+            (item_id, float(probability)) for item_id, probability in loot_table.items()
+        )
+        self.outcomes: Optional[List[Tuple[str, ...]]] = None
+        self.probabilities: List[float] = []
+        self.alias_prob: List[float] = []
+        self.alias: List[int] = []
+
+        if len(self.entries) <= self.MAX_ENUMERATED_ENTRIES:
+            self._compile()
+
+    def _compile(self) -> None:
+        """Enumerate every possible drop set and build the alias table."""
+        # Entries that always or never drop don't split the outcome space
+        always = tuple(item_id for item_id, p in self.entries if p >= 1.0)
+        variable = [(item_id, p) for item_id, p in self.entries if 0.0 < p < 1.0]
+
+        outcomes = []
+        probabilities = []
+        for mask in range(1 << len(variable)):
+            drops = list(always)
+            probability = 1.0
+            for bit, (item_id, p) in enumerate(variable):
+                if mask & (1 << bit):
+                    drops.append(item_id)
+                    probability *= p
+                else:
+                    probability *= 1.0 - p
+            outcomes.append(tuple(drops))
+            probabilities.append(probability)
+
+        self.outcomes = outcomes
+        self.probabilities = probabilities
+        self.alias_prob, self.alias = self._build_alias(probabilities)
+
+    @staticmethod
+    def _build_alias(probabilities: List[float]) -> Tuple[List[float], List[int]]:
+        """Build Vose's alias table for a discrete distribution."""
+        n = len(probabilities)
+        total = sum(probabilities)
+        scaled = [p * n / total for p in probabilities]
+        alias_prob = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            alias_prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is 1.0 up to floating point error
+        for i in small + large:
+            alias_prob[i] = 1.0
+        return alias_prob, alias
+
+    def roll(self, rng: random.Random) -> List[str]:
+        """Roll one kill's worth of loot."""
+        if self.outcomes is None:
+            return [item_id for item_id, p in self.entries if rng.random() < p]
+
+        u = rng.random() * len(self.outcomes)
+        slot = int(u)
+        if u - slot >= self.alias_prob[slot]:
+            slot = self.alias[slot]
+        return list(self.outcomes[slot])
@@ -2,6 +2,9 @@
 
 import os
 import sys
+import time
+import threading
+import random
 import asyncio
 from typing import Optional, Tuple
 from dotenv import load_dotenv
@@ -11,19 +14,46 @@ from .world_manager import WorldManager
 from .combat_manager import CombatManager
 from .commands import CommandHandler
 from .ai_helper import GeminiHelper
+from .instrumentation import metrics, configure_from_env
+from .profiling import profiler, configure_from_env as configure_profiler_from_env
+from .recording import SessionRecorder
+from .console import AsyncConsole
 
 # Load environment variables from .env file
 load_dotenv()
+configure_from_env()
+configure_profiler_from_env()
 
 class Game:
     """Main game class."""
+    UPKEEP_SECONDS = 1.0  # How often background upkeep runs while the player reads and types
+    CONTENT_CHECK_SECONDS = 10.0  # How often content files are checked for edits
     
     def __init__(self):
         """Initialize the game."""
-        self.data_manager = DataManager()
+        # Optional minimum seconds between character saves; changes in between are written together
+        save_interval = os.getenv("MUD_SAVE_INTERVAL")
+        self.data_manager = DataManager(save_interval=float(save_interval) if save_interval else 0)
         self.character_manager = CharacterManager(self.data_manager)
-        self.world_manager = WorldManager(self.data_manager)
-        self.combat_manager = CombatManager(self.data_manager, self.world_manager)
+        # Optional limits on how much world data stays loaded
+        max_rooms = os.getenv("MUD_MAX_LOADED_ROOMS")
+        idle_seconds = os.getenv("MUD_WORLD_IDLE_SECONDS")
+        self.world_manager = WorldManager(
+            self.data_manager,
+            max_loaded_rooms=int(max_rooms) if max_rooms else None,
+            world_idle_seconds=float(idle_seconds) if idle_seconds else None
+        )
+        # Optional fixed seed makes combat and loot rolls reproducible
+        seed = os.getenv("MUD_RNG_SEED")
+        self.seed = int(seed) if seed else None
+        self.combat_manager = CombatManager(
+            self.data_manager,
+            self.world_manager,
+            seed=self.seed
+        )
+        # Optional directory to record each play session to, for replaying with benchmarks/replay_session.py
+        self.record_dir = os.getenv("MUD_RECORD_DIR") or None
+        self.recorder: Optional[SessionRecorder] = None
         self.command_handler = CommandHandler(
             self.data_manager,
             self.character_manager,
@@ -31,6 +61,7 @@ class Game:
         )
         self.current_character = None
         self.running = True
+        self.command_running = False
         
         # Set up cross-references
         self.character_manager.set_world_manager(self.world_manager)
@@ -38,16 +69,33 @@ class Game:
         self.command_handler.combat_manager = self.combat_manager
         self.combat_manager.set_character_manager(self.character_manager)
         
-        # Initialize AI helper
-        print("\nInitializing Gemini AI...", end="", flush=True)
+        # The AI helper is initialised in the background once the menu is showing
+        self.ai_helper = None
+        self.ai_status: Optional[str] = None  # How initialising it went, until that has been shown
+        self._ai_thread: Optional[threading.Thread] = None
+
+    def _start_ai_init(self) -> None:
+        """Initialize the AI helper in a background thread; AI features switch on once it is ready."""
+        if self._ai_thread:
+            return
+        self._ai_thread = threading.Thread(target=self._init_ai, name="ai-init", daemon=True)
+        self._ai_thread.start()
+
+    def _init_ai(self) -> None:
         try:
-            self.ai_helper = GeminiHelper()
-            self.world_manager.set_ai_helper(self.ai_helper)
-            print("\033[32m [OK]\033[0m")  # Green OK
+            ai_helper = GeminiHelper()
         except Exception as e:
-            print("\033[31m [FAILED]\033[0m")  # Red FAILED
-            print(f"Warning: AI features not available - {e}")
-            self.ai_helper = None
+            self.ai_status = f"Gemini AI\033[31m [FAILED]\033[0m\nWarning: AI features not available - {e}"  # Red FAILED
+            return
+        self.ai_helper = ai_helper
+        self.world_manager.set_ai_helper(ai_helper)
+        self.ai_status = "Gemini AI\033[32m [OK]\033[0m"  # Green OK
+
+    def _show_ai_status(self) -> None:
+        """Report how initialising the AI helper went, once it has finished."""
+        if self.ai_status:
+            print(f"\n{self.ai_status}")
+            self.ai_status = None
             
     def show_welcome_banner(self):
         """Display the welcome banner with ASCII art."""
@@ -72,22 +120,72 @@ class Game:
         if not command:
             return False, ""
             
+        issued = time.time()
+        self.command_running = True
         try:
-            # Use the command handler's handle_command method and await it
-            quit_game, response = await self.command_handler.handle_command(self.current_character, command)
-            return quit_game, response
-            
+            # Use the command handler's handle_command method and await it;
+            # all saves a command makes are written to disk once when it finishes
+            with self.data_manager.batched_saves():
+                quit_game, response = await self.command_handler.handle_command(self.current_character, command)
         except Exception as e:
-            return False, f"Error executing command: {e}"
+            quit_game, response = False, f"Error executing command: {e}"
+        finally:
+            self.command_running = False
+
+        if self.recorder:
+            self.recorder.record(command, response, issued)
+        return quit_game, response
+
+    async def _background_upkeep(self, console: AsyncConsole) -> None:
+        """Housekeeping between commands: saves, respawns, overdue combat rounds, world unloading, metrics and content edits."""
+        last_content_check = time.monotonic()
+        content_notice_shown = False
+        while True:
+            await asyncio.sleep(self.UPKEEP_SECONDS)
+            if self.command_running:
+                continue  # A command is waiting on the AI; leave the world alone until it finishes
+            try:
+                # Writes changes held back by MUD_SAVE_INTERVAL once the interval has passed
+                if self.data_manager.characters_dirty:
+                    self.data_manager.save_characters()
+                self.world_manager.process_respawns()
+                self.combat_manager.process_rounds()
+                messages = self.combat_manager.take_messages(self.current_character)
+                if messages:
+                    console.notify(messages)
+                self.world_manager.evict_worlds()
+                metrics.maybe_dump()
+
+                if time.monotonic() - last_content_check >= self.CONTENT_CHECK_SECONDS:
+                    last_content_check = time.monotonic()
+                    changed = await asyncio.to_thread(self.data_manager.content_changed)
+                    if changed and not content_notice_shown:
+                        console.notify("Content files have been edited; type 'reload' to load them.")
+                    content_notice_shown = changed
+            except Exception as e:
+                console.notify(f"Warning: background upkeep failed - {e}")
+
+    def _start_recording(self) -> None:
+        """Record this session, reseeding combat rolls with a seed the recording keeps."""
+        seed = self.seed if self.seed is not None else random.randrange(2 ** 32)
+        self.combat_manager.rng.seed(seed)
+        character = self.character_manager.get_character(self.current_character)
+        try:
+            self.recorder = SessionRecorder.for_session(
+                self.record_dir, character, seed, self.world_manager.current_world)
+        except OSError as e:
+            print(f"Warning: could not start session recording - {e}")
 
     async def start(self):
         """Start the game."""
         while True:
             self.show_welcome_banner()
+            self._show_ai_status()
             print("\nMain Menu:")
             print("1. Play Game")
             print("2. Content Editors")
             print("3. Exit")
+            self._start_ai_init()
             
             choice = input("\nEnter your choice (1-3): ").strip()
             
@@ -262,30 +360,49 @@ class Game:
             else:
                 print("Invalid choice. Please try again.")
 
+        self._show_ai_status()
+        if self.record_dir:
+            self._start_recording()
+
         # Initial look at the room (without welcome message)
         _, description = await self.process_command("look")
         print(f"\nWelcome, {self.current_character}!")  # Single welcome message
         print(f"\n{description}")
         
-        # Main game loop
+        # Main game loop; input is read asynchronously so upkeep runs while the player types
         self.running = True
-        while self.running:
-            try:
-                command = input("\n> ").strip()
-                if not command:
-                    continue
-                    
-                quit_game, response = await self.process_command(command)
-                if response:
-                    print(f"\n{response}")
-                if quit_game:
-                    self.running = False
-                    
-            except KeyboardInterrupt:
-                print("\nUse 'quit' to exit the game.")
-            except Exception as e:
-                print(f"\nError: {e}")
-                
+        console = AsyncConsole("Use 'quit' to exit the game.")
+        await console.open()
+        upkeep = asyncio.create_task(self._background_upkeep(console))
+        try:
+            while self.running:
+                try:
+                    command = (await console.readline("\n> ")).strip()
+                    if not command:
+                        continue
+
+                    quit_game, response = await self.process_command(command)
+                    if response:
+                        print(f"\n{response}")
+                    if quit_game:
+                        self.running = False
+
+                except EOFError:
+                    self.running = False  # Input closed
+                except KeyboardInterrupt:
+                    print("\nUse 'quit' to exit the game.")
+                except Exception as e:
+                    print(f"\nError: {e}")
+        finally:
+            upkeep.cancel()
+            console.close()
+
+        self.data_manager.flush_characters()
+        if profiler.enabled:
+            profiler.roll()  # Don't lose the end of the session's profile
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
         if self.ai_helper:
             await self.ai_helper.close_session()
 
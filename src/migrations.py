@@ -0,0 +1,125 @@
+"""Versioned schema migrations for stored characters."""
+
+import json
+from typing import Callable, Dict, IO, Iterator, List
+
+# Each stored character carries the version of the schema it was saved with;
+# characters saved before versioning existed count as version 0
+SCHEMA_VERSION_KEY = "schema_version"
+
+
+def _add_missing_fields(character: Dict) -> None:
+    """0 -> 1: fields added after the first characters were saved."""
+    character.setdefault("known_topics", {})
+    character.setdefault("money", 100)
+    character.setdefault("world_state", {"removed_items": {}})
+    # Weight limit: 20kg base + 2kg per level above 1
+    character["base_stats"].setdefault("weight_limit", 20.0)
+    if "weight_limit" not in character["stats"]:
+        character["stats"]["weight_limit"] = 20.0 + ((character["stats"]["level"] - 1) * 2.0)
+
+
+def _drop_defeated_mobs(character: Dict) -> None:
+    """1 -> 2: mobs are live room instances now, so per-character kill lists are obsolete."""
+    character.pop("defeated_mobs", None)
+    character["world_state"].pop("defeated_mobs", None)
+    character["world_state"].setdefault("removed_items", {})
+    character.setdefault("combat_state", {
+        "in_combat": False,
+        "target": None,
+        "turns_in_combat": 0,
+        "mob_state": None
+    })
+
+
+# MIGRATIONS[n] upgrades a character from version n to n + 1. Append new steps; never edit old ones.
+MIGRATIONS: List[Callable[[Dict], None]] = [
+    _add_missing_fields,
+    _drop_defeated_mobs,
+]
+
+CURRENT_SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate_character(character: Dict) -> bool:
+    """Upgrade a character in place to the current schema. Returns True if anything changed."""
+    version = character.get(SCHEMA_VERSION_KEY, 0)
+    if version >= CURRENT_SCHEMA_VERSION:
+        return False
+    for migration in MIGRATIONS[version:]:
+        migration(character)
+    character[SCHEMA_VERSION_KEY] = CURRENT_SCHEMA_VERSION
+    return True
+
+
+def migrate_characters(characters_data: Dict) -> int:
+    """Upgrade every character in a characters.json structure. Returns how many changed."""
+    return sum(migrate_character(character) for character in characters_data.get("characters", []))
+
+
+def iter_characters(f: IO[str], chunk_size: int = 1 << 20) -> Iterator[Dict]:
+    """
+    Stream the characters out of a characters.json file one at a time, so a
+    store far larger than memory can be processed. Expects the usual
+    {"characters": [...]} layout with "characters" as the only key.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def skip_whitespace() -> None:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or not fill():
+                return
+
+    def skip(chars: str) -> str:
+        """Skip whitespace and one of chars, returning the character skipped."""
+        nonlocal position
+        skip_whitespace()
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of characters file")
+        found = buffer[position]
+        if found not in chars:
+            raise ValueError(f"Expected one of {chars!r} in characters file, found {found!r}")
+        position += 1
+        return found
+
+    def decode():
+        """Decode the next JSON value, reading more of the file until it is complete."""
+        nonlocal position
+        skip_whitespace()
+        while True:
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+                return value
+            except json.JSONDecodeError:
+                if not fill():
+                    raise ValueError("Characters file ends in the middle of a value")
+
+    skip("{")
+    key = decode()
+    if key != "characters":
+        raise ValueError(f"Expected \"characters\" as the first key, found {key!r}")
+    skip(":")
+    skip("[")
+    skip_whitespace()
+    if buffer[position:position + 1] == "]":
+        return
+    while True:
+        yield decode()
+        if skip(",]") == "]":
+            return
@@ -0,0 +1,109 @@
+"""Shared mob prototypes and lightweight per-fight mob instances."""
+
+from types import MappingProxyType
+from typing import Dict, Optional
+from .loot import LootTable
+
+
+class MobPrototype:
+    """
+    Immutable definition of a mob, built once from its mobs.json template.
+
+    Prototypes are shared by every fight against that mob; anything that
+    changes during a fight lives on a MobInstance instead.
+    """
+
+    __slots__ = ("id", "name", "short_desc", "long_desc", "level", "max_hp",
+                 "attack", "defense", "xp_value", "stats", "loot_table", "spawn_areas",
+                 "max_per_room", "respawn_time")
+
+    DEFAULT_MAX_PER_ROOM = 1
+    DEFAULT_RESPAWN_TIME = 300  # Seconds
+
+    def __init__(self, template: Dict):
+        stats = template["stats"]
+        values = {
+            "id": template["id"],
+            "name": template["name"],
+            "short_desc": template["short_desc"],
+            "long_desc": template["long_desc"],
+            "level": template["level"],
+            "max_hp": stats["max_hp"],
+            "attack": stats["attack"],
+            "defense": stats["defense"],
+            "xp_value": stats["xp_value"],
+            # Read-only view in the shape calculate_damage expects
+            "stats": MappingProxyType({
+                "max_hp": stats["max_hp"],
+                "attack": stats["attack"],
+                "defense": stats["defense"],
+                "xp_value": stats["xp_value"]
+            }),
+            "loot_table": LootTable(template.get("loot_table", {})),
+            "spawn_areas": tuple(template.get("spawn_areas", [])),
+            "max_per_room": template.get("max_per_room", self.DEFAULT_MAX_PER_ROOM),
+            "respawn_time": template.get("respawn_time", self.DEFAULT_RESPAWN_TIME)
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"MobPrototype is immutable (tried to set '{name}')")
+
+    def __repr__(self) -> str:
+        return f"MobPrototype({self.id!r})"
+
+
+class MobInstance:
+    """The mutable state of one mob in one fight: current HP and stat modifiers."""
+
+    __slots__ = ("prototype", "current_hp", "modifiers")
+
+    def __init__(self, prototype: MobPrototype, current_hp: Optional[int] = None,
+                 modifiers: Optional[Dict[str, int]] = None):
+        self.prototype = prototype
+        self.current_hp = prototype.max_hp if current_hp is None else current_hp
+        self.modifiers = modifiers or {}
+
+    @property
+    def id(self) -> str:
+        return self.prototype.id
+
+    @property
+    def name(self) -> str:
+        return self.prototype.name
+
+    @property
+    def max_hp(self) -> int:
+        return self.prototype.max_hp
+
+    @property
+    def stats(self):
+        """Combat stats with any modifiers applied."""
+        if not self.modifiers:
+            return self.prototype.stats
+        stats = dict(self.prototype.stats)
+        for stat, bonus in self.modifiers.items():
+            if stat in stats:
+                stats[stat] += bonus
+        return stats
+
+    def to_state(self) -> Dict:
+        """Return the minimal dict stored in a character's combat_state."""
+        state = {"id": self.prototype.id, "current_hp": self.current_hp}
+        if self.modifiers:
+            state["modifiers"] = dict(self.modifiers)
+        return state
+
+    def apply_state(self, state: Dict) -> None:
+        """Restore HP and modifiers from saved combat state."""
+        current_hp = state.get("current_hp")
+        if current_hp is None:
+            # Saves from before prototypes stored a full mob copy
+            current_hp = state.get("stats", {}).get("current_hp")
+        if current_hp is not None:
+            self.current_hp = current_hp
+        self.modifiers = dict(state.get("modifiers", {}))
+
+    def __repr__(self) -> str:
+        return f"MobInstance({self.prototype.id!r}, hp={self.current_hp}/{self.prototype.max_hp})"
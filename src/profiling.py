@@ -0,0 +1,176 @@
+"""Opt-in cProfile and tracemalloc profiling of commands, written to disk on a rolling basis."""
+
+import cProfile
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Set
+
+DEFAULT_DIR = "profiles"
+DEFAULT_INTERVAL = 60.0  # Seconds between rolls to a new pair of files
+DEFAULT_KEEP = 10  # Files of each kind kept before the oldest are deleted
+TOP_ALLOCATIONS = 25  # Lines listed in each section of an allocation report
+
+
+class Profiler:
+    """
+    Profiles commands with cProfile while tracemalloc traces allocations.
+    Either every command is profiled (a whole session) or only commands
+    with the given names. Every interval the aggregated profile is written
+    as profile-*.prof (open it with pstats or snakeviz) together with
+    alloc-*.txt, listing the lines holding the most memory and the growth
+    since the previous report, and the oldest files beyond keep are deleted.
+
+    CommandHandler checks enabled before anything else, so nothing is paid
+    while profiling is off.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.commands: Optional[Set[str]] = None  # None profiles every command
+        self.output_dir = DEFAULT_DIR
+        self.interval = DEFAULT_INTERVAL
+        self.keep = DEFAULT_KEEP
+        self.profile: Optional[cProfile.Profile] = None
+        self.profiled = 0  # Commands profiled since the last roll
+        self.written: List[str] = []
+        self._started_tracemalloc = False
+        self._previous_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_roll = time.monotonic()
+        self._active = False
+        self._sequence = 0
+
+    def start(self, commands: Optional[Set[str]] = None) -> None:
+        """Profile the given commands, or every command if none are given."""
+        if self.enabled:
+            self.stop()
+        self.commands = commands or None
+        self.profile = cProfile.Profile()
+        self.profiled = 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._previous_snapshot = None
+        self._last_roll = time.monotonic()
+        self.enabled = True
+
+    def stop(self) -> List[str]:
+        """Write what has been collected and stop. Returns the files written."""
+        if not self.enabled:
+            return []
+        written = self.roll()
+        self.enabled = False
+        self.profile = None
+        self._previous_snapshot = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return written
+
+    def wants(self, name: str) -> bool:
+        # The profile command itself starts and stops profiles, so it is never profiled
+        return self.enabled and name != "profile" and (self.commands is None or name in self.commands)
+
+    @contextmanager
+    def command(self, name: str) -> Iterator[None]:
+        """Profile a command if it is selected, rolling the files over when the interval has passed."""
+        if not self.wants(name) or self._active:
+            yield
+            return
+        self._active = True
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            self.profile.disable()
+            self._active = False
+            self.profiled += 1
+            if time.monotonic() - self._last_roll >= self.interval:
+                self.roll()
+
+    def roll(self) -> List[str]:
+        """Write the profile and an allocation report now and start aggregating afresh."""
+        self._last_roll = time.monotonic()
+        if not self.enabled:
+            return []
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._sequence += 1
+            stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{self._sequence}"
+            written = []
+            if self.profiled:
+                path = os.path.join(self.output_dir, f"profile-{stamp}.prof")
+                self.profile.dump_stats(path)
+                written.append(path)
+            path = os.path.join(self.output_dir, f"alloc-{stamp}.txt")
+            with open(path, 'w') as f:
+                f.write(self._allocation_report())
+            written.append(path)
+        except OSError as e:
+            print(f"Warning: could not write profile to {self.output_dir}: {e}")
+            return []
+        finally:
+            self.profile = cProfile.Profile()
+            self.profiled = 0
+
+        self.written.extend(written)
+        self._prune()
+        return written
+
+    def _allocation_report(self) -> str:
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            # Leave out the profilers' own bookkeeping
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Traced memory: {current / 1024:.0f} KiB now, {peak / 1024:.0f} KiB peak",
+                 f"Commands profiled: {self.profiled} ({', '.join(sorted(self.commands)) if self.commands else 'all'})",
+                 "", "Largest allocations by line:"]
+        lines.extend(f"  {stat}" for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS])
+        if self._previous_snapshot is not None:
+            lines.extend(["", "Growth since the previous report:"])
+            growth = [stat for stat in snapshot.compare_to(self._previous_snapshot, "lineno") if stat.size_diff > 0]
+            lines.extend(f"  {stat}" for stat in growth[:TOP_ALLOCATIONS])
+        self._previous_snapshot = snapshot
+        return "\n".join(lines) + "\n"
+
+    def _prune(self) -> None:
+        """Delete the oldest files of each kind beyond keep."""
+        for prefix in ("profile-", "alloc-"):
+            files = [path for path in self.written if os.path.basename(path).startswith(prefix)]
+            for path in files[:-self.keep]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                self.written.remove(path)
+
+    def status(self) -> str:
+        if not self.enabled:
+            return "Profiling is off."
+        selected = ", ".join(sorted(self.commands)) if self.commands else "every command"
+        return (f"Profiling {selected}: {self.profiled} profiled since the last write; "
+                f"writing to {self.output_dir}/ every {self.interval:g}s, keeping the last {self.keep}.")
+
+
+def configure_from_env() -> None:
+    """Apply MUD_PROFILE (all, or comma-separated command names), MUD_PROFILE_DIR, _INTERVAL and _KEEP."""
+    profiler.output_dir = os.getenv("MUD_PROFILE_DIR") or DEFAULT_DIR
+    interval = os.getenv("MUD_PROFILE_INTERVAL")
+    if interval:
+        profiler.interval = float(interval)
+    keep = os.getenv("MUD_PROFILE_KEEP")
+    if keep:
+        profiler.keep = max(1, int(keep))
+    selection = os.getenv("MUD_PROFILE")
+    if selection:
+        names = {name.strip() for name in selection.split(",") if name.strip()}
+        profiler.start(None if "all" in names else names)
+
+
+# The process-wide profiler
+profiler = Profiler()
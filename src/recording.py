@@ -0,0 +1,81 @@
+"""Session recording: a compact log of a play session's commands, RNG seed and timestamps for exact replay."""
+
+import copy
+import gzip
+import json
+import os
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+RECORDING_FORMAT = "mud-session"
+RECORDING_VERSION = 1
+
+
+def response_checksum(response: str) -> int:
+    """Short fingerprint of a response, so a replay can tell where it diverged."""
+    return zlib.crc32(response.encode("utf-8"))
+
+
+class SessionRecorder:
+    """
+    Writes one play session to a gzipped JSON-lines file. The first line is
+    a header holding the character as it was when the session began, the
+    combat RNG seed and the start time; every later line is
+    [milliseconds since start, command, response checksum].
+    """
+
+    def __init__(self, path: str, character: Dict, seed: int, world: str):
+        self.path = path
+        self.start = time.time()
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        header = {
+            "format": RECORDING_FORMAT,
+            "version": RECORDING_VERSION,
+            "start": self.start,
+            "seed": seed,
+            "world": world,
+            "character": copy.deepcopy(character)
+        }
+        self.file.write(json.dumps(header, separators=(',', ':')) + "\n")
+        self.file.flush()
+
+    @classmethod
+    def for_session(cls, directory: str, character: Dict, seed: int, world: str) -> "SessionRecorder":
+        """Start a recording named after the character and the time, in the given directory."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(directory, f"{character['name'].lower()}-{stamp}.jsonl.gz")
+        return cls(path, character, seed, world)
+
+    def record(self, command: str, response: str, timestamp: float) -> None:
+        """Log a command with the time it was issued. Flushed at once so a crash keeps everything before it."""
+        entry = [round((timestamp - self.start) * 1000), command, response_checksum(response)]
+        self.file.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def read_recording(path: str) -> Tuple[Dict, List[Tuple[float, str, Optional[int]]]]:
+    """Read a recording: its header, and (absolute timestamp, command, response checksum) per command."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        lines: Iterator[str] = iter(f)
+        try:
+            header = json.loads(next(lines))
+        except (StopIteration, OSError, ValueError):
+            raise ValueError(f"{path} is not a session recording")
+        if header.get("format") != RECORDING_FORMAT:
+            raise ValueError(f"{path} is not a session recording")
+        if header.get("version", 0) > RECORDING_VERSION:
+            raise ValueError(f"{path} was recorded by a newer version (format {header['version']})")
+
+        commands = []
+        try:
+            for line in lines:
+                offset, command, checksum = json.loads(line)
+                commands.append((header["start"] + offset / 1000, command, checksum))
+        except (EOFError, ValueError):
+            pass  # A session cut short by a crash can end in a partial line or an unfinished stream
+    return header, commands
@@ -0,0 +1,150 @@
+"""Compact read-only records for items, NPCs and rooms."""
+
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+_MISSING = object()  # Marks a field the source data didn't have
+
+
+def intern_strings(value: Any) -> Any:
+    """Intern every string in a JSON-like value so repeated keys and IDs share one object."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: intern_strings(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [intern_strings(v) for v in value]
+    return value
+
+
+class Record:
+    """
+    Base for content records: the common fields live in __slots__ instead of a
+    per-entity dict, and any other keys go in a small overflow dict.
+
+    Records read like the dicts they replace (record["short_desc"],
+    record.get("properties", {}), "weight" in record) so existing call sites
+    keep working; attribute access (record.short_desc) is the fast path.
+    Records are read-only: fields can't be reassigned, although nested
+    containers such as a room's item list stay mutable. to_dict() gives back
+    plain data for editors and persistence.
+    """
+
+    __slots__ = ("_extra",)
+    FIELDS: Tuple[str, ...] = ()
+    DEFAULTS: Dict[str, Any] = {}  # Fields that are always present, with a factory for missing ones
+
+    def __init__(self, data: Dict):
+        for name in self.FIELDS:
+            if name in data:
+                value = self._convert(name, intern_strings(data[name]))
+            elif name in self.DEFAULTS:
+                value = self.DEFAULTS[name]()
+            else:
+                value = _MISSING
+            object.__setattr__(self, name, value)
+        extra = {sys.intern(k): intern_strings(v) for k, v in data.items() if k not in self.FIELDS}
+        object.__setattr__(self, "_extra", extra or None)
+
+    def _convert(self, name: str, value: Any) -> Any:
+        """Hook for subclasses that turn nested data into records."""
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only (tried to set '{name}')")
+
+    def __setitem__(self, key, value):
+        raise TypeError(f"{type(self).__name__} is read-only (tried to set '{key}')")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self._extra:
+            return self._extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self) -> List[str]:
+        names = [name for name in self.FIELDS if getattr(self, name) is not _MISSING]
+        if self._extra:
+            names.extend(self._extra)
+        return names
+
+    def _pairs(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    # Like dict.items(); RoomRecord's "items" field shadows it, use to_dict() there
+    items = _pairs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def to_dict(self) -> Dict:
+        """Convert back to plain JSON-compatible data."""
+        return {key: value.to_dict() if isinstance(value, Record) else value for key, value in self._pairs()}
+
+    def __getstate__(self):
+        # The _MISSING sentinel can't survive pickling, so missing fields are left out
+        state = {name: getattr(self, name) for name in self.FIELDS if getattr(self, name) is not _MISSING}
+        state["_extra"] = self._extra
+        return state
+
+    def __setstate__(self, state):
+        for name in self.FIELDS:
+            object.__setattr__(self, name, state.get(name, _MISSING))
+        object.__setattr__(self, "_extra", state.get("_extra"))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.get('id')!r})"
+
+
+class ItemProperties(Record):
+    """The properties block of an item."""
+
+    __slots__ = ("type", "weight", "respawnable", "respawn_time", "value")
+    FIELDS = __slots__
+
+
+class ItemRecord(Record):
+    """An item definition from items.json."""
+
+    __slots__ = ("id", "short_desc", "long_desc", "properties", "use_effect")
+    FIELDS = __slots__
+
+    def _convert(self, name: str, value: Any) -> Any:
+        if name == "properties" and isinstance(value, dict):
+            return ItemProperties(value)
+        return value
+
+
+class NpcRecord(Record):
+    """An NPC definition from npcs.json. merchant_data stays a plain, mutable dict."""
+
+    __slots__ = ("id", "name", "short_desc", "long_desc", "dialogue", "merchant_data")
+    FIELDS = __slots__
+
+
+class RoomRecord(Record):
+    """A room in a loaded world. Exits, items and NPCs are always present, possibly empty."""
+
+    __slots__ = ("id", "short_desc", "long_desc", "exits", "items", "npcs")
+    FIELDS = __slots__
+    DEFAULTS = {"exits": dict, "items": list, "npcs": list}
+
+
+def to_records(entries: List[Dict], record_type: type) -> List[Record]:
+    """Convert a list of content dicts to records."""
+    return [entry if isinstance(entry, Record) else record_type(entry) for entry in entries]
+
@@ -0,0 +1,113 @@
+"""Crash-safe JSON persistence: atomic replace with rotated backups."""
+
+import json
+import os
+import tempfile
+from typing import Any, List
+from .instrumentation import metrics
+
+BACKUP_COUNT = 3  # How many previous versions of each file to keep
+
+
+def backup_path(path: str, generation: int) -> str:
+    """Path of a backup; generation 1 is the most recent."""
+    return f"{path}.bak{generation}"
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flush a rename to disk. Not every platform can open a directory, so failures are ignored."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path: str, data: Any, backups: int = BACKUP_COUNT, fsync: bool = True) -> int:
+    """
+    Write JSON so that a crash at any point leaves either the old file or the
+    new one, never a partial mix. The previous version is kept as path.bak1,
+    and older ones shift up to path.bak<backups>. Returns the number of bytes written.
+    """
+    payload = json.dumps(data, indent=2).encode("utf-8")
+    write_bytes_atomic(path, payload, backups, fsync)
+    metrics.count("json_saves")
+    return len(payload)
+
+
+def write_bytes_atomic(path: str, payload: bytes, backups: int = 0, fsync: bool = True) -> None:
+    """
+    Write a file atomically: the data goes to a temp file in the same
+    directory, is fsynced, and is then renamed over the target, keeping
+    the given number of backups.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    replace_with_backups(temp_path, path, backups, fsync)
+    metrics.count("bytes_written", len(payload))
+
+
+def replace_with_backups(temp_path: str, path: str, backups: int = BACKUP_COUNT, fsync: bool = True) -> None:
+    """Rename a fully written (and fsynced) temp file over path, rotating the old version into the backups."""
+    if backups > 0 and os.path.exists(path):
+        for generation in range(backups - 1, 0, -1):
+            if os.path.exists(backup_path(path, generation)):
+                os.replace(backup_path(path, generation), backup_path(path, generation + 1))
+        # A hard link keeps the current file in place until the rename below replaces it
+        try:
+            if os.path.exists(backup_path(path, 1)):
+                os.unlink(backup_path(path, 1))
+            os.link(path, backup_path(path, 1))
+        except OSError:
+            os.replace(path, backup_path(path, 1))
+
+    os.replace(temp_path, path)
+    if fsync:
+        _fsync_directory(os.path.dirname(path) or ".")
+
+
+def read_json_with_backups(path: str, backups: int = BACKUP_COUNT) -> Any:
+    """
+    Read a JSON file, falling back to its newest readable backup if the file
+    is missing or corrupt. A corrupt file is moved aside to path.corrupt so the
+    next save can't rotate the good backups away. Raises FileNotFoundError if
+    neither the file nor any backup exists, and ValueError if none is readable.
+    """
+    candidates: List[str] = [path] + [backup_path(path, n) for n in range(1, backups + 1)]
+    failures = []
+    for candidate in candidates:
+        try:
+            with open(candidate, "r") as f:
+                data = json.load(f)
+            metrics.count("json_loads")
+        except FileNotFoundError:
+            continue
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            failures.append(f"{os.path.basename(candidate)}: {e}")
+            continue
+
+        if candidate != path:
+            print(f"Warning: {os.path.basename(path)} could not be read; recovered it from {os.path.basename(candidate)}.")
+            if os.path.exists(path):
+                os.replace(path, path + ".corrupt")
+                print(f"The damaged file was kept as {os.path.basename(path)}.corrupt.")
+        return data
+
+    if failures:
+        raise ValueError(f"{os.path.basename(path)} and its backups are unreadable ({'; '.join(failures)})")
+    raise FileNotFoundError(path)
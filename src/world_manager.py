@@ -1,59 +1,457 @@
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 from .data_manager import DataManager
+from .mob import MobInstance, MobPrototype
+from .world_map import WorldLayout
+from .content_validator import ContentValidator
+from .records import RoomRecord, to_records
+from .instrumentation import metrics
 import os
 import json
 import time
+import heapq
+import asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 class WorldManager:
-    def __init__(self, data_manager: DataManager):
+    MAX_PATH_ENTRIES = 200000  # Rooms held across cached path searches before the least recently used are dropped
+    PATH_STEPS_PER_YIELD = 1000  # Rooms a path search visits before letting other commands run
+    DEFAULT_MAX_LOADED_ROOMS = 50000  # Room budget for loaded worlds, a proxy for their memory use
+    DEFAULT_WORLD_IDLE_SECONDS = 600  # Unoccupied worlds unused this long are unloaded
+
+    def __init__(self, data_manager: DataManager, max_loaded_rooms: Optional[int] = None,
+                 world_idle_seconds: Optional[float] = None):
         self.data_manager = data_manager
-        self.worlds_dir = os.path.join("data", "worlds")
-        self.loaded_worlds = {}  # Cache for loaded world files
+        self.worlds_dir = os.path.join(data_manager.data_dir, "worlds")
+        self.loaded_worlds: "OrderedDict[str, Dict]" = OrderedDict()  # Loaded world files, least recently used first
+        self.world_last_used: Dict[str, float] = {}
+        self.world_occupants: Dict[str, Set[str]] = {}  # World -> names of characters in it
+        self.max_loaded_rooms = max_loaded_rooms or self.DEFAULT_MAX_LOADED_ROOMS
+        self.world_idle_seconds = world_idle_seconds or self.DEFAULT_WORLD_IDLE_SECONDS
+        self.room_index: Dict[str, Dict[str, Dict]] = {}  # World -> room ID -> room
+        self.layouts: Dict[str, WorldLayout] = {}  # World -> map layout
+        self.layout_builds: Dict[str, Future] = {}  # World -> build of its layout, until it has been waited for
+        self._layout_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="world-layout")
+        self.portals: Dict[str, List[Tuple[str, str, Dict]]] = {}  # World -> (room ID, direction, exit data)
+        # (world, room ID, usable portals) -> (search tree, frontier), least recently used first
+        self.path_searches: "OrderedDict[Tuple, Tuple[Dict, deque]]" = OrderedDict()
+        self._path_entries = 0  # Rooms in all cached search trees
         self.current_world = "default"  # Track current active world
-        self.original_items = {}  # Track original item locations
+        self.original_items: Dict[str, Dict[str, str]] = {}  # World -> item ID -> room it was placed in
+        self.item_changed_rooms: Dict[str, Set[str]] = {}  # World -> rooms whose items differ from the world file
+        self.unloaded_room_items: Dict[str, Dict[str, List[str]]] = {}  # Unloaded world -> room ID -> its items
         self.last_load_time = {}
         self.ai_helper = None  # Will be set after initialization
+        self.spawn_index: Optional[Dict[str, List[MobPrototype]]] = None  # Room ID -> mobs that spawn there
+        self.mob_instances: Dict[str, Dict[str, List[MobInstance]]] = {}  # World -> room ID -> live mobs
+        self.respawn_queue: List[Tuple[float, str, str, str]] = []  # Heap of (due time, world, room ID, mob ID)
+        self.clock: Callable[[], float] = time.time  # Game time; session replays substitute a recorded clock
+        # World -> room ID -> version, renewed whenever a rendered room's items or mobs change; never reused
+        self.room_versions: Dict[str, Dict[str, int]] = {}
+        self._last_room_version = 0
+        # World -> room ID -> (room, content version, exits text, room version, contents text)
+        self.room_renders: Dict[str, Dict[str, Tuple[Dict, int, str, int, str]]] = {}
         self.load_world(self.current_world)
 
     def load_world(self, world_name: str) -> Dict:
         """Load a world file."""
         if world_name in self.loaded_worlds:
+            self._touch_world(world_name)
             return self.loaded_worlds[world_name]
 
         try:
-            world_path = os.path.join(self.worlds_dir, f"{world_name}.json")
-            with open(world_path, 'r') as f:
-                world_data = json.load(f)
-                self.loaded_worlds[world_name] = world_data
-                
-                # Track original item locations
-                for room in world_data.get("rooms", []):
-                    if "items" in room:
-                        for item_id in room["items"]:
-                            self.original_items[item_id] = {
-                                "world": world_name,
-                                "room": room["id"]
-                            }
-                
-                return world_data
+            world_data = self._read_world(world_name)
         except FileNotFoundError:
             print(f"Warning: World '{world_name}' not found. Creating empty world.")
-            empty_world = {"rooms": []}
-            self.loaded_worlds[world_name] = empty_world
-            return empty_world
+            world_data = {"rooms": []}
         except json.JSONDecodeError:
             print(f"Error: {world_name}.json is not valid JSON.")
             return {"rooms": []}
 
-    def _validate_world(self) -> None:
+        self._install_world(world_name, world_data)
+        return world_data
+
+    def _read_world(self, world_name: str, bundle: Optional[Dict] = None) -> Dict:
+        """Read a world from the compiled bundle or its JSON file without touching loaded state."""
+        world_data = self.data_manager.get_world_data(world_name, bundle)
+        if world_data is None:
+            world_path = os.path.join(self.worlds_dir, f"{world_name}.json")
+            with open(world_path, 'r') as f:
+                world_data = json.load(f)
+            metrics.count("json_loads")
+            world_data["rooms"] = to_records(world_data.get("rooms", []), RoomRecord)
+        return world_data
+
+    def _install_world(self, world_name: str, world_data: Dict) -> None:
+        """Make world data live: index it, record item origins and spawn its mobs."""
+        self.loaded_worlds[world_name] = world_data
+        self._touch_world(world_name)
+        self._index_world(world_name, world_data)
+        # Laying out a big world takes a while, so it happens off the command path
+        layout = WorldLayout(world_name, self.room_index[world_name])
+        self.layouts[world_name] = layout
+        self.layout_builds[world_name] = self._layout_executor.submit(layout.build)
+
+        # Track original item locations
+        original_items = {}
+        for room in world_data.get("rooms", []):
+            if "items" in room:
+                for item_id in room["items"]:
+                    original_items[item_id] = room["id"]
+        self.original_items[world_name] = original_items
+
+        # A world unloaded with taken or dropped items gets them back as they were
+        rooms = self.room_index[world_name]
+        saved_items = self.unloaded_room_items.pop(world_name, {})
+        for room_id, items in saved_items.items():
+            if room_id in rooms:
+                rooms[room_id]["items"][:] = items
+                self.item_changed_rooms.setdefault(world_name, set()).add(room_id)
+
+        self._spawn_world_mobs(world_name, world_data)
+        self._hold_back_respawns(world_name)
+
+    async def reload_content(self) -> List[str]:
+        """
+        Reload content files. The content and every loaded world whose file
+        changed are read together in one worker call, then swapped in at once,
+        so no command sees new content alongside old worlds. A reloaded world
+        keeps the items of rooms changed in play and its live mobs, and fights
+        already in progress finish against the mobs they started with. Returns
+        the reloaded worlds.
+        """
+        world_names = list(self.loaded_worlds)
+        old_sources = (self.data_manager.bundle, self.data_manager.content_sources)
+        content, new_worlds = await asyncio.to_thread(self._read_content_and_worlds, world_names, old_sources)
+
+        self.data_manager.apply_content(content)
+        self.spawn_index = None  # Mob prototypes or spawn areas may have changed
+        # Worlds first loaded while the files were being read came from the old content
+        for world_name in list(self.loaded_worlds):
+            if world_name not in world_names and self._world_changed(world_name, old_sources, content):
+                new_worlds.update(self._read_worlds([world_name], content["bundle"]))
+
+        reloaded = []
+        for world_name, world_data in new_worlds.items():
+            if world_data is not None and world_name in self.loaded_worlds:
+                self._reinstall_world(world_name, world_data)
+                reloaded.append(world_name)
+        return reloaded
+
+    def _read_content_and_worlds(self, world_names: List[str],
+                                 old_sources: Tuple) -> Tuple[Dict, Dict[str, Optional[Dict]]]:
+        """Read all content, and those of the given worlds whose files changed, without touching loaded state."""
+        content = self.data_manager.read_content()
+        changed = [name for name in world_names if self._world_changed(name, old_sources, content)]
+        return content, self._read_worlds(changed, content["bundle"])
+
+    @staticmethod
+    def _world_changed(world_name: str, old_sources: Tuple, content: Dict) -> bool:
+        """Compare a world's compiled bytes, or else its JSON file's mtime, between loaded and freshly read content."""
+        def source(bundle: Optional[Dict], mtimes: Dict[str, int]) -> Any:
+            if bundle and world_name in bundle["worlds"]:
+                return bundle["worlds"][world_name]
+            return mtimes.get(os.path.join("worlds", f"{world_name}.json"))
+        return source(*old_sources) != source(content["bundle"], content["sources"])
+
+    def _read_worlds(self, world_names: List[str], bundle: Optional[Dict] = None) -> Dict[str, Optional[Dict]]:
+        """Read several worlds, keeping the old copy of any that fail to load."""
+        worlds = {}
+        for world_name in world_names:
+            try:
+                worlds[world_name] = self._read_world(world_name, bundle)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                print(f"Warning: could not reload world '{world_name}' ({e}); keeping the loaded copy.")
+                worlds[world_name] = None
+        return worlds
+
+    def _reinstall_world(self, world_name: str, world_data: Dict) -> None:
+        """Install new data for a loaded world, carrying over changed rooms' items and the mobs of rooms that remain."""
+        live_mobs = self.mob_instances.get(world_name, {})
+        self._set_aside_room_items(world_name)
+        self._install_world(world_name, world_data)
+        rooms = self.room_index[world_name]
+        world_mobs = self.mob_instances[world_name]
+        for room_id, mobs in live_mobs.items():
+            if room_id in rooms:
+                world_mobs[room_id] = mobs
+
+    def _touch_world(self, world_name: str) -> None:
+        """Mark a world as just used."""
+        self.loaded_worlds.move_to_end(world_name)
+        self.world_last_used[world_name] = self.clock()
+
+    def evict_worlds(self) -> List[str]:
+        """
+        Unload least recently used worlds that nobody is in, first any idle for
+        longer than world_idle_seconds, then more until the loaded worlds fit
+        in the room budget. Returns the names of the unloaded worlds.
+        """
+        now = self.clock()
+        loaded_rooms = self._loaded_rooms()
+        evicted = []
+        for world_name in list(self.loaded_worlds):
+            if world_name == self.current_world or self.world_occupants.get(world_name):
+                continue
+            idle = now - self.world_last_used.get(world_name, 0) > self.world_idle_seconds
+            if not idle and loaded_rooms <= self.max_loaded_rooms:
+                continue
+            loaded_rooms -= len(self.room_index.get(world_name, {}))
+            self._unload_world(world_name)
+            evicted.append(world_name)
+        return evicted
+
+    def _set_aside_room_items(self, world_name: str) -> None:
+        """Keep the item lists of a world's changed rooms until it is installed again."""
+        rooms = self.room_index.get(world_name, {})
+        changed_rooms = self.item_changed_rooms.pop(world_name, set())
+        if changed_rooms:
+            self.unloaded_room_items[world_name] = {
+                room_id: rooms[room_id]["items"] for room_id in changed_rooms if room_id in rooms
+            }
+
+    def _loaded_rooms(self) -> int:
+        return sum(len(rooms) for rooms in self.room_index.values())
+
+    def _unload_world(self, world_name: str) -> None:
+        """
+        Drop a world and everything derived from it; it is reloaded from disk on
+        next use. The items of rooms that changed are kept aside for then, and
+        mobs still waiting in the respawn queue stay dead when it is reloaded.
+        """
+        self._set_aside_room_items(world_name)
+        self.loaded_worlds.pop(world_name, None)
+        self.world_last_used.pop(world_name, None)
+        self.room_index.pop(world_name, None)
+        self.portals.pop(world_name, None)
+        self._drop_layout(world_name)
+        self.mob_instances.pop(world_name, None)
+        self.original_items.pop(world_name, None)
+        self.room_renders.pop(world_name, None)
+        self.room_versions.pop(world_name, None)
+        self._clear_path_searches()
+
+    def _index_world(self, world_name: str, world_data: Dict) -> None:
+        """Index a world's rooms by ID and drop any layout built from older data."""
+        self.room_index[world_name] = {room["id"]: room for room in world_data.get("rooms", [])}
+        self.portals[world_name] = [
+            (room["id"], direction, exit_data)
+            for room in world_data.get("rooms", [])
+            for direction, exit_data in room.get("exits", {}).items()
+            if isinstance(exit_data, dict) and exit_data.get("type") == "world_transition"
+        ]
+        self._drop_layout(world_name)
+        self._clear_path_searches()
+
+    def _drop_layout(self, world_name: str) -> None:
+        self.layouts.pop(world_name, None)
+        build = self.layout_builds.pop(world_name, None)
+        if build:
+            build.cancel()
+
+    def get_world_layout(self, world: Optional[str] = None) -> WorldLayout:
+        """Get the built map layout of a world, waiting for its background build if that hasn't finished."""
+        world = world or self.current_world
+        build = self.layout_builds.pop(world, None)
+        if build:
+            return build.result()
+        layout = self.layouts.get(world)
+        if layout is None:
+            layout = WorldLayout(world, self.room_index.get(world, {})).build()
+            self.layouts[world] = layout
+        return layout
+
+    def render_map(self, room_id: str, world: Optional[str] = None, radius: Optional[int] = None) -> Optional[str]:
+        """Render the ASCII map around a room, or None if the room isn't in the world."""
+        world = world or self.current_world
+        if radius is not None and world in self.layouts:
+            # Radius maps lay out only the rooms in range, so they needn't wait for the build
+            return self.layouts[world].render(room_id, radius)
+        return self.get_world_layout(world).render(room_id, radius)
+
+    def _unloaded_portal_worlds(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Read each world reachable through portals that isn't loaded, nearest first,
+        without loading it. What is loaded is noted up front, so the worlds can be
+        read in a worker thread.
+        """
+        seen = set(self.loaded_worlds)
+        pending = deque(exit_data["target_world"] for portals in self.portals.values() for _, _, exit_data in portals)
+        return self._read_portal_worlds(seen, pending)
+
+    def _read_portal_worlds(self, seen: Set[str], pending: deque) -> Iterator[Tuple[str, Dict]]:
+        while pending:
+            world_name = pending.popleft()
+            if world_name in seen:
+                continue
+            seen.add(world_name)
+            try:
+                world_data = self._read_world(world_name)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            yield world_name, world_data
+            for room in world_data.get("rooms", []):
+                for exit_data in room.get("exits", {}).values():
+                    if isinstance(exit_data, dict) and exit_data.get("type") == "world_transition":
+                        pending.append(exit_data["target_world"])
+
+    async def find_rooms(self, search: str) -> List[Tuple[str, str]]:
+        """
+        Find (world, room ID) pairs by exact room ID, or by words in the ID or
+        short description. Loaded worlds are searched first, the current one
+        ahead of the rest; only if none matches are the worlds beyond their
+        portals read and searched in a worker thread, without being loaded.
+        """
+        worlds = [self.current_world] + [w for w in self.room_index if w != self.current_world]
+        matches = self._match_rooms(search, [(world, self.room_index[world]) for world in worlds])
+        if matches:
+            return matches
+        return await asyncio.to_thread(self._match_unloaded_rooms, search, self._unloaded_portal_worlds())
+
+    @classmethod
+    def _match_unloaded_rooms(cls, search: str, worlds: Iterator[Tuple[str, Dict]]) -> List[Tuple[str, str]]:
+        for world_name, world_data in worlds:
+            rooms = {room["id"]: room for room in world_data.get("rooms", [])}
+            matches = cls._match_rooms(search, [(world_name, rooms)])
+            if matches:
+                return matches
+        return []
+
+    @staticmethod
+    def _match_rooms(search: str, worlds: List[Tuple[str, Dict[str, Dict]]]) -> List[Tuple[str, str]]:
+        exact = [(world, search) for world, rooms in worlds if search in rooms]
+        if exact:
+            return exact
+
+        search_terms = search.lower().replace("a ", "").replace("an ", "").replace("the ", "").split()
+        matches = []
+        for world, rooms in worlds:
+            for room_id, room in rooms.items():
+                room_desc = room.get("short_desc", "").lower()
+                if all(term in room_id for term in search_terms) or all(term in room_desc for term in search_terms):
+                    matches.append((world, room_id))
+        return matches
+
+    async def find_path(self, character: Dict, target_room: str, target_world: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Find the shortest list of exit directions from the character's room to a
+        target room, going through portals whose requirements the character meets.
+        Returns None if there is no such path.
+
+        The breadth-first search stops once it reaches the target and is kept,
+        frontier and all, so later searches from the same room carry on from
+        where it stopped rather than starting over.
+        """
+        source = (self.current_world, character["current_room"])
+        target = (target_world or self.current_world, target_room)
+
+        # Portals are the only character-dependent edges, so searches are shared by
+        # every character who can use the same set of portals
+        search = self.path_searches.pop((source, self._usable_portals(character)), None)
+        metrics.count("path_cache_hits" if search is not None and target in search[0] else "path_cache_misses")
+        if search is None:
+            search = ({source: None}, deque([source]))
+        else:
+            self._path_entries -= len(search[0])
+        tree, frontier = search
+        await self._extend_path_search(character, tree, frontier, target)
+        # Worlds the search loaded bring more portals, so the key is taken again
+        self._cache_path_search((source, self._usable_portals(character)), tree, frontier)
+
+        if target not in tree:
+            return None
+        path = []
+        node = target
+        while node != source:
+            node, direction = tree[node]
+            path.append(direction)
+        path.reverse()
+        return path
+
+    def _usable_portals(self, character: Dict) -> frozenset:
+        """The portals in loaded worlds whose requirements the character meets."""
+        return frozenset(
+            (world, room_id, direction)
+            for world, portals in self.portals.items()
+            for room_id, direction, exit_data in portals
+            if self.check_world_transition_requirements(character, exit_data.get("requirements", {}))[0]
+        )
+
+    async def _extend_path_search(self, character: Dict, tree: Dict, frontier: deque, target: Tuple[str, str]) -> None:
+        """
+        Carry a breadth-first search on until it reaches target or runs out of
+        rooms; tree maps each room found to (previous room, direction). A world
+        is read only when the search has to go on from a room in it, and loaded
+        unless the loaded worlds already fill the room budget. Other commands
+        get a turn every PATH_STEPS_PER_YIELD rooms.
+        """
+        unloaded: Dict[str, Dict[str, Dict]] = {}  # Worlds this search read without loading them
+        steps = 0
+        while frontier and target not in tree:
+            steps += 1
+            if steps % self.PATH_STEPS_PER_YIELD == 0:
+                await asyncio.sleep(0)
+            node = frontier.popleft()
+            world, room_id = node
+            rooms = self.room_index.get(world, unloaded.get(world))
+            if rooms is None:
+                # The search only now needs what lies beyond the portal
+                world_data = await self._read_path_world(world)
+                if world in self.room_index:
+                    rooms = self.room_index[world]  # Loaded by another command meanwhile
+                elif world_data is not None and self._loaded_rooms() < self.max_loaded_rooms:
+                    self._install_world(world, world_data)
+                    rooms = self.room_index[world]
+                else:
+                    rooms = {room["id"]: room for room in (world_data or {}).get("rooms", [])}
+                    unloaded[world] = rooms
+            room = rooms.get(room_id)
+            if not room:
+                continue
+            for direction, exit_data in room.get("exits", {}).items():
+                if isinstance(exit_data, dict):
+                    if exit_data.get("type") != "world_transition":
+                        continue
+                    if not self.check_world_transition_requirements(character, exit_data.get("requirements", {}))[0]:
+                        continue
+                    next_node = (exit_data["target_world"], exit_data["target_room"])
+                else:
+                    next_node = (world, exit_data)
+                if next_node not in tree:
+                    tree[next_node] = (node, direction)
+                    frontier.append(next_node)
+
+    async def _read_path_world(self, world_name: str) -> Optional[Dict]:
+        """Read a world for a path search in a worker thread; None if it can't be read."""
+        try:
+            return await asyncio.to_thread(self._read_world, world_name)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _cache_path_search(self, key: Tuple, tree: Dict, frontier: deque) -> None:
+        """Keep a search for reuse, dropping the least recently used ones beyond MAX_PATH_ENTRIES rooms."""
+        self.path_searches[key] = (tree, frontier)
+        self._path_entries += len(tree)
+        while self._path_entries > self.MAX_PATH_ENTRIES and len(self.path_searches) > 1:
+            _, (old_tree, _) = self.path_searches.popitem(last=False)
+            self._path_entries -= len(old_tree)
+
+    def _clear_path_searches(self) -> None:
+        self.path_searches.clear()
+        self._path_entries = 0
+
+    def _validate_world(self, world_name: str) -> None:
         """Validate world data for broken links and invalid references."""
-        room_ids = {room["id"] for room in self.current_world.get("rooms", [])}
-        
-        for room in self.current_world.get("rooms", []):
-            for direction, target_room_id in room.get("exits", {}).items():
-                if target_room_id not in room_ids:
-                    print(f"Warning: Room {room['id']} has invalid exit {direction} to non-existent room {target_room_id}")
+        # Worlds beyond the loaded ones' portals are read to check portal targets, not loaded
+        worlds = dict(self.loaded_worlds)
+        worlds.update(self._unloaded_portal_worlds())
+        validator = ContentValidator(worlds, items=self.data_manager.items_data,
+                                     npcs=self.data_manager.npcs_data)
+        validator.validate()
+        for issue in validator.errors:
+            if issue.world == world_name:
+                print(f"Warning: {issue.message}")
 
     def set_ai_helper(self, ai_helper):
         """Set the AI helper for enhanced descriptions."""
@@ -61,7 +459,7 @@ class WorldManager:
 
     def get_time_of_day(self) -> str:
         """Get the current time of day period."""
-        hour = datetime.now().hour
+        hour = datetime.fromtimestamp(self.clock()).hour
         if 5 <= hour < 8:
             return "dawn"
         elif 8 <= hour < 12:
@@ -103,7 +501,9 @@ class WorldManager:
                 "Focus on how the time of day affects the scene."
             )
             
-            enhanced = await self.ai_helper.generate_response(prompt, context)
+            metrics.count("ai_calls")
+            with metrics.timed("ai"):
+                enhanced = await self.ai_helper.generate_response(prompt, context)
             return enhanced if enhanced != prompt else base_description
             
         except Exception:
@@ -123,23 +523,68 @@ class WorldManager:
         if show_long and self.ai_helper:
             description = await self.get_enhanced_description(base_desc, room)
         
-        # Add exits information
-        exits = room.get("exits", {})
-        if exits:
-            normal_exits = []
-            special_exits = []
-            for direction, exit_data in exits.items():
-                if isinstance(exit_data, dict) and exit_data.get("type") == "world_transition":
-                    special_exits.append(f"{direction} ({exit_data['description']})")
-                else:
-                    normal_exits.append(direction)
-            
-            if normal_exits:
-                description += f"\nExits: {', '.join(normal_exits)}"
-            if special_exits:
-                description += f"\nSpecial exits: {', '.join(special_exits)}"
+        # Exits, items, NPCs and enemies
+        return description + self._render_room_details(room_id, room)
+
+    def _room_items_changed(self, room_id: str) -> None:
+        """Note that a room in the current world now holds other items than its world file says."""
+        self.item_changed_rooms.setdefault(self.current_world, set()).add(room_id)
+        self.room_changed(room_id)
+
+    def room_changed(self, room_id: str, world: Optional[str] = None) -> None:
+        """Note that a room's items, NPCs or mobs changed, so its cached description text is rebuilt."""
+        world = world or self.current_world
+        # Rooms never rendered have nothing to invalidate, which keeps spawning a big world cheap
+        if room_id in self.room_renders.get(world, {}):
+            self._last_room_version += 1
+            self.room_versions.setdefault(world, {})[room_id] = self._last_room_version
+
+    def _render_room_details(self, room_id: str, room: Dict) -> str:
+        """
+        The exits, items, NPCs and enemies lines of a room's description. The
+        exits only change with the content, the rest when the room's version
+        does; either is rebuilt only then.
+        """
+        # Respawns due now bump the room's version, so they must run before it is read
+        self.process_respawns()
+        world = self.current_world
+        content_version = self.data_manager.content_version
+        room_version = self.room_versions.get(world, {}).get(room_id, 0)
+        renders = self.room_renders.setdefault(world, {})
+        cached = renders.get(room_id)
+        if cached is not None and cached[0] is room and cached[1] == content_version:
+            if cached[3] == room_version:
+                metrics.count("room_cache_hits")
+                return cached[2] + cached[4]
+            exits_text = cached[2]
         else:
-            description += "\nThere are no obvious exits."
+            exits_text = self._render_exits(room)
+        metrics.count("room_cache_misses")
+        contents_text = self._render_room_contents(room_id, room)
+        renders[room_id] = (room, content_version, exits_text, room_version, contents_text)
+        return exits_text + contents_text
+
+    def _render_exits(self, room: Dict) -> str:
+        exits = room.get("exits", {})
+        if not exits:
+            return "\nThere are no obvious exits."
+        description = ""
+        normal_exits = []
+        special_exits = []
+        for direction, exit_data in exits.items():
+            if isinstance(exit_data, dict) and exit_data.get("type") == "world_transition":
+                special_exits.append(f"{direction} ({exit_data['description']})")
+            else:
+                normal_exits.append(direction)
+
+        if normal_exits:
+            description += f"\nExits: {', '.join(normal_exits)}"
+        if special_exits:
+            description += f"\nSpecial exits: {', '.join(special_exits)}"
+        return description
+
+    def _render_room_contents(self, room_id: str, room: Dict) -> str:
+        description = ""
 
         # Add items information
         items = room.get("items", [])
@@ -164,16 +609,7 @@ class WorldManager:
                 description += "\nPresent here: " + ", ".join(npc_descriptions)
 
         # Add mobs information
-        mobs_data = self.data_manager.load_json("mobs.json")
-        present_mobs = []
-        for mob in mobs_data.get("mobs", []):
-            if room_id in mob.get("spawn_areas", []):
-                # Skip if mob has been defeated in this room
-                if hasattr(self.data_manager, 'character_manager') and \
-                   self.data_manager.character_manager and \
-                   self.data_manager.character_manager.is_mob_defeated(mob["id"]):
-                    continue
-                present_mobs.append(mob["short_desc"])
+        present_mobs = [mob.prototype.short_desc for mob in self.get_room_mobs(room_id)]
         if present_mobs:
             description += "\nEnemies here: " + ", ".join(present_mobs)
 
@@ -181,17 +617,83 @@ class WorldManager:
 
     def get_room(self, room_id: str, character: Optional[Dict] = None) -> Optional[Dict]:
         """Get room data by ID and check for item respawns."""
-        world = self.loaded_worlds.get(self.current_world)
-        if not world:
+        metrics.count("get_room")
+        room = self.room_index.get(self.current_world, {}).get(room_id)
+        if room and character:
+            # If character is provided, check their specific world state for respawns
+            self.check_item_respawn(room_id, character)
+        return room
+
+    def get_spawn_index(self) -> Dict[str, List[MobPrototype]]:
+        """Map each room ID to the mob prototypes that spawn there."""
+        if self.spawn_index is None:
+            index: Dict[str, List[MobPrototype]] = {}
+            for prototype in self.data_manager.get_mob_prototypes().values():
+                for room_id in prototype.spawn_areas:
+                    index.setdefault(room_id, []).append(prototype)
+            self.spawn_index = index
+        return self.spawn_index
+
+    def _spawn_world_mobs(self, world_name: str, world_data: Dict) -> None:
+        """Fill every room in a newly loaded world up to its mob population caps."""
+        spawn_index = self.get_spawn_index()
+        self.mob_instances[world_name] = {}
+        for room in world_data.get("rooms", []):
+            for prototype in spawn_index.get(room["id"], []):
+                for _ in range(prototype.max_per_room):
+                    if not self._spawn_in_room(world_name, room, prototype):
+                        break
+
+    def _hold_back_respawns(self, world_name: str) -> None:
+        """Remove the mobs of a freshly spawned world that were killed and haven't respawned yet."""
+        for _, world, room_id, mob_id in self.respawn_queue:
+            if world != world_name:
+                continue
+            room_mobs = self.mob_instances[world_name].get(room_id, [])
+            for i, mob in enumerate(room_mobs):
+                if mob.id == mob_id:
+                    del room_mobs[i]
+                    break
+
+    def _spawn_in_room(self, world_name: str, room: Dict, prototype: MobPrototype) -> Optional[MobInstance]:
+        """Spawn a mob in a room unless the mob's or the room's population cap is reached."""
+        room_mobs = self.mob_instances[world_name].setdefault(room["id"], [])
+        if "max_mobs" in room and len(room_mobs) >= room["max_mobs"]:
             return None
+        if sum(1 for mob in room_mobs if mob.prototype is prototype) >= prototype.max_per_room:
+            return None
+        mob = MobInstance(prototype)
+        room_mobs.append(mob)
+        self.room_changed(room["id"], world_name)
+        return mob
 
-        for room in world.get("rooms", []):
-            if room["id"] == room_id:
-                # If character is provided, check their specific world state for respawns
-                if character:
-                    self.check_item_respawn(room_id, character)
-                return room
-        return None
+    def get_room_mobs(self, room_id: str, world: Optional[str] = None) -> List[MobInstance]:
+        """Get the live mobs in a room."""
+        self.process_respawns()
+        world = world or self.current_world
+        return self.mob_instances.get(world, {}).get(room_id, [])
+
+    def despawn_mob(self, room_id: str, mob: MobInstance, world: Optional[str] = None) -> None:
+        """Remove a defeated mob from its room and schedule its respawn."""
+        world = world or self.current_world
+        room_mobs = self.mob_instances.get(world, {}).get(room_id, [])
+        for i, other in enumerate(room_mobs):
+            if other is mob:
+                del room_mobs[i]
+                self.room_changed(room_id, world)
+                break
+        due = self.clock() + mob.prototype.respawn_time
+        heapq.heappush(self.respawn_queue, (due, world, room_id, mob.id))
+
+    def process_respawns(self) -> None:
+        """Respawn mobs whose respawn timers have run out."""
+        now = self.clock()
+        while self.respawn_queue and self.respawn_queue[0][0] <= now:
+            _, world, room_id, mob_id = heapq.heappop(self.respawn_queue)
+            room = self.room_index.get(world, {}).get(room_id)
+            prototype = self.data_manager.get_mob(mob_id)
+            if room and prototype:
+                self._spawn_in_room(world, room, prototype)
 
     def get_exit_room_id(self, current_room_id: str, direction: str) -> Optional[Dict]:
         """Get the room ID for a given exit direction. Returns dict for world transitions."""
@@ -224,6 +726,7 @@ class WorldManager:
         if "items" not in room:
             room["items"] = []
         room["items"].append(item_id)
+        self._room_items_changed(room_id)
         return True
 
     def remove_item_from_room(self, room_id: str, item_id: str, character: Dict) -> bool:
@@ -234,6 +737,7 @@ class WorldManager:
             
         if item_id in room["items"]:
             room["items"].remove(item_id)
+            self._room_items_changed(room_id)
             
             # Initialize world_state if it doesn't exist
             if "world_state" not in character:
@@ -244,7 +748,7 @@ class WorldManager:
             if item and item.get("properties", {}).get("respawnable", False):
                 character["world_state"]["removed_items"][item_id] = {
                     "room": room_id,
-                    "time": time.time(),
+                    "time": self.clock(),
                     "world": self.current_world
                 }
             return True
@@ -308,12 +812,16 @@ class WorldManager:
 
         return True, ""
 
-    def change_world(self, new_world: str) -> bool:
-        """Change the current active world."""
-        if new_world not in self.loaded_worlds:
-            if not self.load_world(new_world):
-                return False
+    def change_world(self, new_world: str, character_name: Optional[str] = None) -> bool:
+        """Change the current active world, optionally recording which character moved there."""
+        if not self.load_world(new_world):
+            return False
+        if character_name:
+            for occupants in self.world_occupants.values():
+                occupants.discard(character_name)
+            self.world_occupants.setdefault(new_world, set()).add(character_name)
         self.current_world = new_world
+        self.evict_worlds()
         return True
 
     def check_item_respawn(self, room_id: str, character: Dict) -> None:
@@ -321,7 +829,7 @@ class WorldManager:
         if "world_state" not in character:
             character["world_state"] = {"removed_items": {}}
             
-        current_time = time.time()
+        current_time = self.clock()
         items_to_respawn = []
         
         # Check all removed items in character's state that belong to this room
@@ -349,4 +857,5 @@ class WorldManager:
             if room:
                 if "items" not in room:
                     room["items"] = []
-                room["items"].extend(items_to_respawn)
\ No newline at end of file
+                room["items"].extend(items_to_respawn)
+                self._room_items_changed(room_id)
\ No newline at end of file
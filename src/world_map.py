@@ -0,0 +1,254 @@
+"""Precomputed world map layouts and ASCII map rendering."""
+
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from .instrumentation import metrics
+
+# Map directions to coordinate changes
+DIRECTION_OFFSETS = {
+    "north": (0, -1),
+    "south": (0, 1),
+    "east": (1, 0),
+    "west": (-1, 0),
+    "up": (0, -1),  # Treat up as north for 2D representation
+    "down": (0, 1)  # Treat down as south for 2D representation
+}
+
+CELL_WIDTH = 20
+MAX_RADIUS = 10  # Larger map radii are clamped
+MAX_CACHED_MAPS = 64  # Radius maps kept per layout, least recently used dropped first
+
+
+class WorldLayout:
+    """
+    Grid coordinates for every room in a world, computed once per world load
+    by build(), which WorldManager runs in a worker thread.
+
+    Rooms are placed breadth-first along their exits. When an exit leads to a
+    cell that is already taken (exits that don't line up, or up/down next to
+    north/south) the room goes to a free neighbouring cell, or failing that
+    the next free cell along the row, instead of being left off the map. Each
+    group of connected rooms is laid out to the right of the previous one so
+    groups never overlap.
+
+    The whole-group map is rendered once per group, with the "you are here"
+    marker written in per call. Radius maps lay out only the rooms in range,
+    are clipped to the square around the centre room and are kept in a small
+    LRU cache. Reloading a world builds a fresh layout with empty caches.
+    """
+
+    def __init__(self, world_name: str, rooms: Dict[str, Dict]):
+        self.world_name = world_name
+        self.rooms = rooms  # Room ID -> room data
+        self.positions: Dict[str, Tuple[int, int]] = {}
+        self.grid: Dict[Tuple[int, int], str] = {}
+        self.components: Dict[str, int] = {}  # Room ID -> connected group index
+        self.bounds: List[Tuple[int, int, int, int]] = []  # Per group: min_x, min_y, max_x, max_y
+        self.group_maps: Dict[int, Tuple[str, Dict[str, int]]] = {}  # Group -> (map without marker, room -> marker offset)
+        self.radius_maps: "OrderedDict[Tuple[str, int], str]" = OrderedDict()  # (centre room, radius) -> map
+
+    def build(self) -> "WorldLayout":
+        """Assign every room a unique grid cell."""
+        next_x = 0
+        for room_id in self.rooms:
+            if room_id in self.components:
+                continue
+            component = len(self.bounds)
+            local = self._place(room_id, lambda rid: rid not in self.components)
+
+            # Shift the group so it starts to the right of everything placed so far
+            min_x = min(x for x, _ in local.values())
+            min_y = min(y for _, y in local.values())
+            shift_x = next_x - min_x
+            max_x = max_y = None
+            for rid, (x, y) in local.items():
+                pos = (x + shift_x, y - min_y)
+                self.positions[rid] = pos
+                self.grid[pos] = rid
+                self.components[rid] = component
+                max_x = pos[0] if max_x is None else max(max_x, pos[0])
+                max_y = pos[1] if max_y is None else max(max_y, pos[1])
+            self.bounds.append((next_x, 0, max_x, max_y))
+            next_x = max_x + 2
+        return self
+
+    def _place(self, start_id: str, placeable: Callable[[str], bool]) -> Dict[str, Tuple[int, int]]:
+        """Lay out the placeable rooms reachable from start_id on a local grid, with start_id at (0, 0)."""
+        local: Dict[str, Tuple[int, int]] = {}
+        taken: Dict[Tuple[int, int], str] = {}
+        skips: Dict[Tuple[int, int], Tuple[int, int]] = {}  # Taken cell -> a later cell in its row that may be free
+        queue = deque([(start_id, (0, 0))])
+        while queue:
+            room_id, cell = queue.popleft()
+            if room_id in local:
+                continue
+            if cell in taken:
+                cell = self._free_cell(cell, taken, skips)
+            local[room_id] = cell
+            taken[cell] = room_id
+
+            x, y = cell
+            for direction, target in self.rooms[room_id].get("exits", {}).items():
+                if isinstance(target, dict):  # Skip portal exits
+                    continue
+                if direction in DIRECTION_OFFSETS and target in self.rooms and target not in local and placeable(target):
+                    dx, dy = DIRECTION_OFFSETS[direction]
+                    queue.append((target, (x + dx, y + dy)))
+        return local
+
+    @staticmethod
+    def _free_cell(cell: Tuple[int, int], taken: Dict[Tuple[int, int], str],
+                   skips: Dict[Tuple[int, int], Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Find a free cell for a room whose wanted cell is taken: a free neighbour
+        if there is one, else the first free cell to the right along the row.
+        The row scan follows skips past runs of taken cells and shortens them
+        as it goes, so crowded rows cost near-constant time per room.
+        """
+        x, y = cell
+        for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+            neighbour = (x + dx, y + dy)
+            if neighbour not in taken:
+                return neighbour
+
+        visited = []
+        while cell in taken:
+            visited.append(cell)
+            cell = skips.get(cell, (cell[0] + 1, cell[1]))
+        for skipped in visited:
+            skips[skipped] = cell
+        return cell
+
+    def _connected(self, room_id: str, directions: Tuple[str, ...], neighbour_id: str,
+                   back_directions: Tuple[str, ...]) -> bool:
+        """Check for a regular exit between two rooms in either direction."""
+        exits = self.rooms[room_id].get("exits", {})
+        if any(exits.get(d) == neighbour_id for d in directions):
+            return True
+        back_exits = self.rooms[neighbour_id].get("exits", {})
+        return any(back_exits.get(d) == room_id for d in back_directions)
+
+    def rooms_within(self, center_id: str, radius: int) -> Set[str]:
+        """Find the rooms at most radius regular exits away from center_id."""
+        found = {center_id}
+        queue = deque([(center_id, 0)])
+        while queue:
+            room_id, distance = queue.popleft()
+            if distance == radius:
+                continue
+            for direction, target in self.rooms[room_id].get("exits", {}).items():
+                if isinstance(target, dict) or direction not in DIRECTION_OFFSETS:
+                    continue
+                if target in self.rooms and target not in found:
+                    found.add(target)
+                    queue.append((target, distance + 1))
+        return found
+
+    def render(self, center_id: str, radius: Optional[int] = None) -> Optional[str]:
+        """
+        Render the map around center_id, marking it with '*'. Without a radius
+        the whole group of connected rooms is drawn, which needs build() to have
+        run; with one, only rooms within that many steps, so the cost depends on
+        the radius and not the world size.
+        """
+        if center_id not in self.rooms:
+            return None
+        if radius is None:
+            return self._render_group(center_id)
+
+        radius = min(radius, MAX_RADIUS)
+        key = (center_id, radius)
+        cached = self.radius_maps.get(key)
+        metrics.count("map_cache_hits" if cached is not None else "map_cache_misses")
+        if cached is None:
+            visible = self.rooms_within(center_id, radius)
+            # The rooms in range are laid out on their own, centred on center_id,
+            # and any pushed out of the square around it by crowding are left off
+            grid = {
+                cell: room_id for room_id, cell in self._place(center_id, visible.__contains__).items()
+                if abs(cell[0]) <= radius and abs(cell[1]) <= radius
+            }
+            xs = [x for x, _ in grid]
+            ys = [y for _, y in grid]
+            text, offsets = self._render((min(xs), min(ys), max(xs), max(ys)), grid)
+            cached = self._mark(text, offsets[center_id])
+            self.radius_maps[key] = cached
+            if len(self.radius_maps) > MAX_CACHED_MAPS:
+                self.radius_maps.popitem(last=False)
+        else:
+            self.radius_maps.move_to_end(key)
+        return cached
+
+    def _render_group(self, center_id: str) -> str:
+        """Draw the whole group holding center_id, rendering the group only the first time."""
+        component = self.components[center_id]
+        rendered = self.group_maps.get(component)
+        metrics.count("map_cache_hits" if rendered is not None else "map_cache_misses")
+        if rendered is None:
+            rendered = self._render(self.bounds[component], self.grid)
+            self.group_maps[component] = rendered
+        text, offsets = rendered
+        return self._mark(text, offsets[center_id])
+
+    @staticmethod
+    def _mark(text: str, offset: int) -> str:
+        return text[:offset] + "*" + text[offset + 1:]
+
+    def _render(self, bounds: Tuple[int, int, int, int],
+                grid: Dict[Tuple[int, int], str]) -> Tuple[str, Dict[str, int]]:
+        """
+        Build the ASCII map for a viewport of a grid. Returns it without a
+        "you are here" marker, along with where each room's marker goes.
+        """
+        min_x, min_y, max_x, max_y = bounds
+
+        map_lines = []
+        map_lines.append(f"\nWorld Map: {self.world_name.title()}")
+        map_lines.append("=" * 40)
+        map_lines.append("Legend: * = You are here")
+        map_lines.append("       → ↑ ↓ = Regular connections")
+        map_lines.append("       ⊗ = Portal to another realm")
+        map_lines.append("")
+        line_start = sum(len(line) + 1 for line in map_lines)
+        offsets: Dict[str, int] = {}
+
+        blank = " " * CELL_WIDTH
+        for y in range(min_y, max_y + 1):
+            room_line = []
+            connection_line = []
+            vertical_line = []
+            column = line_start
+            for x in range(min_x, max_x + 1):
+                room_id = grid.get((x, y))
+                if room_id is None:
+                    room_line.append(blank)
+                    connection_line.append(blank)
+                    vertical_line.append(blank)
+                    column += CELL_WIDTH
+                    continue
+
+                cell = f" {room_id:<{CELL_WIDTH}}"
+                room_line.append(cell)
+                offsets[room_id] = column
+                column += len(cell)
+
+                east = grid.get((x + 1, y))
+                if east and x < max_x and self._connected(room_id, ("east",), east, ("west",)):
+                    connection_line.append("----" + "─" * (CELL_WIDTH - 4))
+                else:
+                    connection_line.append(blank)
+
+                south = grid.get((x, y + 1))
+                if south and y < max_y and self._connected(room_id, ("south", "down"), south, ("north", "up")):
+                    vertical_line.append("     |" + " " * (CELL_WIDTH - 6))
+                else:
+                    vertical_line.append(blank)
+
+            map_lines.append("".join(room_line))
+            line_start = column + 1
+            if y < max_y:
+                map_lines.append("".join(connection_line))
+                map_lines.append("".join(vertical_line))
+                line_start += len(map_lines[-2]) + len(map_lines[-1]) + 2
+
+        return "\n".join(map_lines), offsets
@@ -0,0 +1,284 @@
+"""
+Monte Carlo combat balance simulator.
+
+Simulates large batches of fights for every class, level and mob combination
+using the same rules as the game engine:
+
+- Damage follows CombatManager.calculate_damage: attack minus defense
+  (minimum 1), plus a uniform roll of -2..+2, never below 1.
+- The character strikes first each round; the mob only strikes back if it
+  survived the hit.
+- Loot is drawn from the same compiled LootTable that CombatManager.roll_loot
+  uses, so drop sets match the game exactly.
+- Character stats per level follow CharacterManager.create_character (base
+  stats plus class bonuses) and CombatManager.level_up, which is what the
+  game calls on a level up: a fixed +10 HP, +2 attack and +1 defense for
+  every class. The level_gains in classes.json are not applied in play.
+
+Every fight starts with both sides at full health. All rolls for a batch of
+fights are drawn at once with NumPy, so a million fights per matchup take
+well under a second.
+
+Usage (from the project root):
+    python tools/balance_simulator.py
+    python tools/balance_simulator.py --classes warrior --levels 1-5 --fights 1000000
+    python tools/balance_simulator.py --mobs wolf_001 spider_001 --json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.loot import LootTable
+
+# Starting stats before class bonuses (see CharacterManager.create_character)
+BASE_HP = 100
+BASE_ATTACK = 10
+BASE_DEFENSE = 5
+BASE_XP_TO_NEXT_LEVEL = 100
+
+# Gains per level from CombatManager.level_up, the same for every class
+LEVEL_HP = 10
+LEVEL_ATTACK = 2
+LEVEL_DEFENSE = 1
+
+# Fights are simulated in batches to keep the round matrices small
+BATCH_SIZE = 100_000
+
+
+def load_json(file_path: str) -> Dict:
+    """Load JSON data from a file."""
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
+def parse_levels(spec: str) -> List[int]:
+    """Parse a level spec like '1-5' or '1,3,5' into a list of levels."""
+    levels = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = part.split("-", 1)
+            levels.extend(range(int(start), int(end) + 1))
+        elif part:
+            levels.append(int(part))
+    return sorted(set(levels))
+
+
+def character_stats(class_data: Dict, level: int) -> Dict:
+    """Build a character's combat stats for a class at a given level."""
+    base = class_data["base_stats"]
+    extra_levels = level - 1
+
+    xp_to_next_level = BASE_XP_TO_NEXT_LEVEL
+    for _ in range(extra_levels):
+        xp_to_next_level = int(xp_to_next_level * 1.5)
+
+    return {
+        "level": level,
+        "max_hp": BASE_HP + base["hp_bonus"] + LEVEL_HP * extra_levels,
+        "attack": BASE_ATTACK + base["attack_bonus"] + LEVEL_ATTACK * extra_levels,
+        "defense": BASE_DEFENSE + base["defense_bonus"] + LEVEL_DEFENSE * extra_levels,
+        "xp_to_next_level": xp_to_next_level
+    }
+
+
+def base_damage(attacker_stats: Dict, defender_stats: Dict) -> int:
+    """Return the centre of the damage roll used by calculate_damage."""
+    return max(1, int(attacker_stats["attack"] - defender_stats["defense"]))
+
+
+def rounds_to_kill(rng: np.random.Generator, damage: int, hp: float, fights: int, max_rounds: int) -> np.ndarray:
+    """
+    Return, per fight, the 1-based round on which cumulative damage reaches hp.
+    Fights that would need more than max_rounds get max_rounds + 1.
+    """
+    rolls = rng.integers(damage - 2, damage + 3, size=(fights, max_rounds), dtype=np.int32)
+    np.maximum(rolls, 1, out=rolls)
+    totals = np.cumsum(rolls, axis=1)
+    killed = totals >= hp
+    rounds = np.argmax(killed, axis=1) + 1
+    rounds[~killed[:, -1]] = max_rounds + 1
+    return rounds
+
+
+def sample_loot(rng: np.random.Generator, table: LootTable, kills: int) -> Dict[str, int]:
+    """Draw loot for a number of kills from a compiled loot table."""
+    counts = {item_id: 0 for item_id, _ in table.entries}
+    if kills == 0:
+        return counts
+
+    if table.outcomes is None:
+        # Large tables are rolled per entry, exactly like LootTable.roll
+        for item_id, probability in table.entries:
+            counts[item_id] += int((rng.random(kills) < probability).sum())
+        return counts
+
+    # Vectorized alias method: pick a slot, then keep it or take its alias
+    alias_prob = np.array(table.alias_prob)
+    alias = np.array(table.alias)
+    slots = rng.integers(0, len(alias), size=kills)
+    keep = rng.random(kills) < alias_prob[slots]
+    picks = np.where(keep, slots, alias[slots])
+    outcome_counts = np.bincount(picks, minlength=len(table.outcomes))
+    for outcome, count in zip(table.outcomes, outcome_counts):
+        for item_id in outcome:
+            counts[item_id] += int(count)
+    return counts
+
+
+def simulate_matchup(rng: np.random.Generator, char_stats: Dict, mob: Dict, fights: int, round_seconds: float) -> Dict:
+    """Simulate a number of fights between one character build and one mob."""
+    mob_stats = mob["stats"]
+    char_damage = base_damage(char_stats, mob_stats)
+    mob_damage = base_damage(mob_stats, char_stats)
+
+    # The slowest possible kill still deals at least max(1, damage - 2) per round
+    max_rounds = math.ceil(mob_stats["max_hp"] / max(1, char_damage - 2))
+
+    loot_table = LootTable(mob["loot_table"])
+
+    ttk_chunks = []
+    wins = 0
+    deaths = 0
+    total_rounds = 0
+
+    remaining = fights
+    while remaining > 0:
+        batch = min(BATCH_SIZE, remaining)
+        remaining -= batch
+
+        mob_dies = rounds_to_kill(rng, char_damage, mob_stats["max_hp"], batch, max_rounds)
+        char_dies = rounds_to_kill(rng, mob_damage, char_stats["max_hp"], batch, max_rounds)
+
+        # The character strikes first, so a kill on the same round wins
+        won = mob_dies <= char_dies
+        wins += int(won.sum())
+        deaths += batch - int(won.sum())
+        total_rounds += int(np.where(won, mob_dies, char_dies).sum())
+        ttk_chunks.append(mob_dies[won])
+
+    loot_counts = sample_loot(rng, loot_table, wins)
+
+    ttk = np.concatenate(ttk_chunks) if ttk_chunks else np.array([], dtype=np.int64)
+    if len(ttk):
+        p50, p95, p99 = (float(v) for v in np.percentile(ttk, [50, 95, 99]))
+    else:
+        p50 = p95 = p99 = float("nan")
+
+    # Death penalty from process_combat_turn: lose 10% of XP to next level
+    xp_penalty = char_stats["xp_to_next_level"] // 10
+    net_xp = wins * mob_stats["xp_value"] - deaths * xp_penalty
+    hours = total_rounds * round_seconds / 3600
+    xp_per_hour = net_xp / hours if hours > 0 else 0.0
+    hours_to_level = char_stats["xp_to_next_level"] / xp_per_hour if xp_per_hour > 0 else float("inf")
+
+    return {
+        "fights": fights,
+        "win_rate": wins / fights,
+        "death_rate": deaths / fights,
+        "ttk_mean": float(ttk.mean()) if len(ttk) else float("nan"),
+        "ttk_p50": p50,
+        "ttk_p95": p95,
+        "ttk_p99": p99,
+        "xp_per_hour": xp_per_hour,
+        "hours_to_level": hours_to_level,
+        "loot_per_kill": {
+            item_id: (count / wins if wins else 0.0)
+            for item_id, count in loot_counts.items()
+        }
+    }
+
+
+def run_simulation(classes: List[Dict], mobs: List[Dict], levels: List[int], fights: int,
+                   seed: Optional[int], round_seconds: float) -> List[Dict]:
+    """Simulate every class/level/mob combination and return one row per matchup."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for mob in mobs:
+        for class_data in classes:
+            for level in levels:
+                char_stats = character_stats(class_data, level)
+                result = simulate_matchup(rng, char_stats, mob, fights, round_seconds)
+                result.update({
+                    "mob": mob["id"],
+                    "class": class_data["id"],
+                    "level": level
+                })
+                results.append(result)
+    return results
+
+
+def print_report(results: List[Dict], mobs: List[Dict]) -> None:
+    """Print a human-readable report grouped by mob."""
+    header = f"{'Class':<10}{'Lvl':>4}{'Win%':>8}{'Death%':>8}{'TTK p50':>9}{'p95':>6}{'p99':>6}{'XP/h':>10}{'Hrs/lvl':>9}"
+    for mob in mobs:
+        rows = [r for r in results if r["mob"] == mob["id"]]
+        stats = mob["stats"]
+        print(f"\n=== {mob['name']} ({mob['id']}) ===")
+        print(f"Level {mob['level']} | HP {stats['max_hp']} | Attack {stats['attack']} | "
+              f"Defense {stats['defense']} | XP {stats['xp_value']}")
+        print(header)
+        print("-" * len(header))
+        for r in rows:
+            print(f"{r['class']:<10}{r['level']:>4}{r['win_rate'] * 100:>8.1f}{r['death_rate'] * 100:>8.1f}"
+                  f"{r['ttk_p50']:>9.0f}{r['ttk_p95']:>6.0f}{r['ttk_p99']:>6.0f}"
+                  f"{r['xp_per_hour']:>10.0f}{r['hours_to_level']:>9.2f}")
+
+        # Loot rates do not depend on the attacker, so pool them across matchups
+        if mob["loot_table"]:
+            print("\nLoot per kill:")
+            total_fights = sum(r["fights"] * r["win_rate"] for r in rows)
+            for item_id in mob["loot_table"]:
+                drops = sum(r["loot_per_kill"][item_id] * r["fights"] * r["win_rate"] for r in rows)
+                rate = drops / total_fights if total_fights else 0.0
+                print(f"  {item_id:<24} {rate:.3f} (table: {mob['loot_table'][item_id]:.3f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo combat balance simulator")
+    parser.add_argument("--data-dir", default="data", help="Directory containing classes.json and mobs.json")
+    parser.add_argument("--classes", nargs="*", help="Class IDs to simulate (default: all)")
+    parser.add_argument("--mobs", nargs="*", help="Mob IDs to simulate (default: all)")
+    parser.add_argument("--levels", default="1-5", help="Character levels, e.g. '1-5' or '1,3,5' (default: 1-5)")
+    parser.add_argument("--fights", type=int, default=100_000, help="Fights per matchup (default: 100000)")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--round-seconds", type=float, default=3.0,
+                        help="Assumed wall-clock seconds per combat round, used for XP/hour (default: 3.0)")
+    parser.add_argument("--json", action="store_true", help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    classes = load_json(os.path.join(args.data_dir, "classes.json")).get("classes", [])
+    mobs = load_json(os.path.join(args.data_dir, "mobs.json")).get("mobs", [])
+    if args.classes:
+        classes = [c for c in classes if c["id"] in args.classes]
+    if args.mobs:
+        mobs = [m for m in mobs if m["id"] in args.mobs]
+    if not classes or not mobs:
+        print("Nothing to simulate: no matching classes or mobs found.")
+        return
+
+    levels = parse_levels(args.levels)
+    start = time.perf_counter()
+    results = run_simulation(classes, mobs, levels, args.fights, args.seed, args.round_seconds)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print_report(results, mobs)
+    total = len(results) * args.fights
+    print(f"\nSimulated {total:,} fights across {len(results)} matchups in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compile all static game content into a single pre-indexed bundle.
+
+Validates the content first (see validate_content.py), then writes
+data/content.bundle: items, NPCs, mobs, classes and every world in one
+versioned pickle, with item and NPC indexes prebuilt and strings interned.
+The game loads the bundle in one read at startup and falls back to the JSON
+files whenever the bundle is missing or older than any content file, so
+remember to recompile after editing content.
+
+characters.json is save data and is never bundled.
+
+Usage (from the project root):
+    python tools/compile_content.py
+    python tools/compile_content.py --data-dir data --force
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.content_bundle import compile_bundle, write_bundle
+from src.content_validator import ContentValidator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile game content into a single bundle")
+    parser.add_argument("--data-dir", default="data", help="Directory containing the content files (default: data)")
+    parser.add_argument("--force", action="store_true", help="Write the bundle even if validation finds errors")
+    args = parser.parse_args()
+
+    validator = ContentValidator.from_directory(args.data_dir)
+    validator.validate()
+    errors = validator.errors
+    for error in errors:
+        print(f"ERROR: {error}")
+    if errors and not args.force:
+        print(f"\n{len(errors)} validation errors; bundle not written (use --force to write it anyway).")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    bundle = compile_bundle(args.data_dir)
+    path = write_bundle(bundle, args.data_dir)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {path} ({os.path.getsize(path) / 1024:.1f} KiB) in {elapsed:.2f}s: "
+          f"{len(bundle['item_index'])} items, {len(bundle['npc_index'])} NPCs, "
+          f"{len(bundle['mobs'].get('mobs', []))} mobs, {len(bundle['worlds'])} worlds")
+
+
+if __name__ == "__main__":
+    main()
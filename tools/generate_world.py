@@ -0,0 +1,358 @@
+"""
+Generate synthetic game content for scale testing.
+
+Writes a complete data directory in the game's own schemas: one or more
+worlds of N rooms each (grid, tree or random-graph topology, every exit with
+a matching exit back, all rooms reachable), linked by portals, plus items,
+NPCs with dialogue trees and merchant stock, mobs with spawn areas and loot
+tables, and classes whose starting equipment uses the generated items.
+
+Output is deterministic for a given seed and options, and world files are
+streamed room by room: a million-room world takes about 20 seconds and
+little more memory than its exit table.
+
+The first world is always "default" and starts in forest_clearing_001, so
+the output passes validate_content.py and loads like the shipped content.
+
+Usage (from the project root):
+    python tools/generate_world.py --out generated --rooms 10000
+    python tools/generate_world.py --out big --rooms 1000000 --topology random --worlds 3 --seed 7
+    python tools/validate_content.py --data-dir big
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.content_validator import OPPOSITE_DIRECTIONS, START_ROOM, START_WORLD
+
+DIRECTIONS = ["north", "south", "east", "west", "northeast", "southwest", "northwest", "southeast", "up", "down"]
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+OPPOSITE_INDEX = [DIRECTION_INDEX[OPPOSITE_DIRECTIONS[direction]] for direction in DIRECTIONS]
+SLOTS = len(DIRECTIONS)
+
+ADJECTIVES = ["quiet", "damp", "sunlit", "narrow", "crumbling", "overgrown", "windswept", "echoing",
+              "misty", "ancient", "cramped", "vast", "frozen", "dusty", "flooded", "silent"]
+PLACES = ["clearing", "corridor", "hollow", "chamber", "glade", "ravine", "courtyard", "tunnel",
+          "meadow", "crypt", "ledge", "grotto", "thicket", "hall", "marsh", "ruin"]
+DETAILS = ["Moss clings to every surface.", "A cold draft comes from somewhere ahead.",
+           "Old footprints cross the ground here.", "Faint light filters in from above.",
+           "The air smells of smoke and rain.", "Something scurries away as you arrive.",
+           "Broken pottery lies scattered about.", "Water drips steadily nearby."]
+ITEM_KINDS = [
+    ("weapon", ["sword", "axe", "spear", "mace"]),
+    ("armor", ["helm", "breastplate", "shield", "greaves"]),
+    ("consumable", ["potion", "tonic", "ration", "draught"]),
+    ("material", ["pelt", "ore", "feather", "bone"]),
+    ("treasure", ["coin", "gem", "idol", "ring"]),
+]
+CREATURES = ["rat", "wolf", "bat", "spider", "goblin", "boar", "serpent", "wisp"]
+
+
+def room_id(world_index: int, index: int) -> str:
+    """Room IDs are unique across worlds, since mob spawn areas name rooms without a world."""
+    if world_index == 0:
+        return START_ROOM if index == 0 else f"room_{index}"
+    return f"gen{world_index}_room_{index}"
+
+
+def world_name(world_index: int) -> str:
+    return START_WORLD if world_index == 0 else f"gen_world_{world_index}"
+
+
+def _link(exits: array, a: int, b: int, slot: int) -> None:
+    exits[a * SLOTS + slot] = b
+    exits[b * SLOTS + OPPOSITE_INDEX[slot]] = a
+
+
+def _free_slot(exits: array, a: int, b: int, rng: random.Random) -> int:
+    """A direction free in room a whose opposite is free in room b, or -1."""
+    start = rng.randrange(SLOTS)
+    for offset in range(SLOTS):
+        slot = (start + offset) % SLOTS
+        if exits[a * SLOTS + slot] < 0 and exits[b * SLOTS + OPPOSITE_INDEX[slot]] < 0:
+            return slot
+    return -1
+
+
+def build_grid(rooms: int, rng: random.Random) -> array:
+    """Rooms laid out row by row on a square grid, linked north/south/east/west."""
+    exits = array('i', [-1]) * (rooms * SLOTS)
+    side = max(1, math.isqrt(rooms - 1) + 1) if rooms > 1 else 1
+    east, south = DIRECTION_INDEX["east"], DIRECTION_INDEX["south"]
+    for i in range(rooms):
+        if (i + 1) % side and i + 1 < rooms:
+            _link(exits, i, i + 1, east)
+        if i + side < rooms:
+            _link(exits, i, i + side, south)
+    return exits
+
+
+def build_tree(rooms: int, rng: random.Random, branching: int) -> array:
+    """A tree where room i hangs off room (i - 1) // branching in a random free direction."""
+    exits = array('i', [-1]) * (rooms * SLOTS)
+    for i in range(1, rooms):
+        parent = (i - 1) // branching
+        _link(exits, parent, i, _free_slot(exits, parent, i, rng))
+    return exits
+
+
+def build_random(rooms: int, rng: random.Random, extra_edges: float) -> array:
+    """A random spanning tree (so everything stays reachable) plus extra random two-way links."""
+    exits = array('i', [-1]) * (rooms * SLOTS)
+    for i in range(1, rooms):
+        while True:
+            parent = rng.randrange(i)
+            slot = _free_slot(exits, parent, i, rng)
+            if slot >= 0:
+                _link(exits, parent, i, slot)
+                break
+    for _ in range(int(rooms * extra_edges)):
+        a, b = rng.randrange(rooms), rng.randrange(rooms)
+        if a == b or b in exits[a * SLOTS:(a + 1) * SLOTS]:
+            continue
+        slot = _free_slot(exits, a, b, rng)
+        if slot >= 0:
+            _link(exits, a, b, slot)
+    return exits
+
+
+def make_items(count: int, rng: random.Random) -> List[Dict]:
+    items = []
+    for i in range(count):
+        item_type, nouns = ITEM_KINDS[i % len(ITEM_KINDS)]
+        adjective = rng.choice(ADJECTIVES)
+        noun = rng.choice(nouns)
+        properties = {"type": item_type, "weight": round(rng.uniform(0.1, 5.0), 1),
+                      "value": rng.randint(1, 500), "respawnable": rng.random() < 0.5}
+        if properties["respawnable"]:
+            properties["respawn_time"] = rng.choice([300, 600, 1800])
+        if item_type == "weapon":
+            properties["damage"] = rng.randint(2, 20)
+        item = {
+            "id": f"gen_{noun}_{i}",
+            "short_desc": f"a {adjective} {noun}",
+            "long_desc": f"A {adjective} {noun}. {rng.choice(DETAILS)}",
+            "properties": properties
+        }
+        if item_type == "consumable":
+            item["use_effect"] = {"type": "heal", "amount": rng.randint(10, 50)}
+        items.append(item)
+    return items
+
+
+def make_dialogue(rng: random.Random, depth: int, branching: int, merchant: bool) -> Dict:
+    """A topic tree: each topic leads to its children, which require it."""
+    topics = {}
+
+    def add(topic_id: str, parent: str, level: int) -> None:
+        children = [f"{topic_id}_{k}" for k in range(branching)] if level < depth else []
+        topic = {
+            "prompt": f"Tell me about the {rng.choice(PLACES)}.",
+            "response": f"The {rng.choice(ADJECTIVES)} {rng.choice(PLACES)}? {rng.choice(DETAILS)}",
+            "leads_to": children
+        }
+        if parent:
+            topic["requires_topic"] = parent
+        topics[topic_id] = topic
+        for child in children:
+            add(child, topic_id, level + 1)
+
+    add("rumors", "", 1)
+    if merchant:
+        topics["rumors"]["leads_to"].append("trade")
+        topics["trade"] = {
+            "prompt": "Let's trade.",
+            "response": "Use 'list' to see my wares, 'buy <item>' to purchase, or 'sell <item>' to sell.",
+            "requires_topic": "rumors",
+            "is_trade": True
+        }
+    return {"greeting": "Well met, traveler.", "topics": topics}
+
+
+def make_npcs(count: int, items: List[Dict], rng: random.Random, depth: int, branching: int) -> List[Dict]:
+    npcs = []
+    for i in range(count):
+        merchant = i % 5 == 0
+        name = f"{rng.choice(ADJECTIVES).title()} Stranger {i}"
+        npc = {
+            "id": f"gen_npc_{i}",
+            "name": name,
+            "short_desc": f"a {rng.choice(ADJECTIVES)} stranger",
+            "long_desc": f"{name} watches you carefully. {rng.choice(DETAILS)}",
+            "dialogue": make_dialogue(rng, depth, branching, merchant)
+        }
+        if merchant:
+            stock = rng.sample(items, min(5, len(items)))
+            npc["merchant_data"] = {
+                "inventory": {item["id"]: {"price": item["properties"]["value"], "quantity": rng.randint(1, 10)}
+                              for item in stock},
+                "buy_multiplier": 0.5,
+                "unlocked": True,
+                "premium_inventory": {}
+            }
+        npcs.append(npc)
+    return npcs
+
+
+def make_mobs(count: int, items: List[Dict], rng: random.Random, spawn_rooms: int,
+              worlds: int, rooms: int) -> List[Dict]:
+    mobs = []
+    for i in range(count):
+        level = rng.randint(1, 10)
+        hp = 15 + level * 10
+        creature = rng.choice(CREATURES)
+        spawn_areas = sorted({room_id(rng.randrange(worlds), rng.randrange(rooms)) for _ in range(spawn_rooms)})
+        mobs.append({
+            "id": f"gen_{creature}_{i}",
+            "name": f"{rng.choice(ADJECTIVES).title()} {creature.title()}",
+            "short_desc": f"a {rng.choice(ADJECTIVES)} {creature}",
+            "long_desc": f"A {creature} with an unfriendly look. {rng.choice(DETAILS)}",
+            "level": level,
+            "stats": {"max_hp": hp, "current_hp": hp, "attack": 2 + level * 2,
+                      "defense": 1 + level, "xp_value": 10 * level},
+            "loot_table": {item["id"]: round(rng.uniform(0.1, 0.8), 2) for item in rng.sample(items, min(2, len(items)))},
+            "spawn_areas": spawn_areas,
+            "max_per_room": rng.randint(1, 3),
+            "respawn_time": rng.choice([60, 300, 600])
+        })
+    return mobs
+
+
+def make_classes(items: List[Dict]) -> Dict:
+    """The shipped classes, with starting weapons swapped for generated ones."""
+    source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "classes.json")
+    with open(source, 'r') as f:
+        classes = json.load(f)
+    weapons = [item["id"] for item in items if item["properties"]["type"] == "weapon"]
+    armor = [item["id"] for item in items if item["properties"]["type"] == "armor"]
+    for class_data in classes.get("classes", []):
+        equipment = {}
+        for slot in class_data.get("starting_equipment", {}):
+            pool = weapons if slot == "weapon" else armor
+            if pool:
+                equipment[slot] = pool[0]
+        class_data["starting_equipment"] = equipment
+    return classes
+
+
+def write_world(path: str, world_index: int, exits: array, rooms: int, rng: random.Random,
+                item_ids: List[str], item_density: float, npc_rooms: Dict[int, List[str]],
+                portals: Dict[int, Dict]) -> None:
+    """Stream a world file to disk one room at a time."""
+    with open(path, 'w') as f:
+        header = {"name": f"Generated World {world_index}", "description": "Synthetic content for scale testing",
+                  "author": "generate_world.py", "version": "1.0"}
+        f.write(json.dumps(header)[:-1] + ', "rooms": [\n')
+        for i in range(rooms):
+            room_exits = {}
+            base = i * SLOTS
+            for slot in range(SLOTS):
+                target = exits[base + slot]
+                if target >= 0:
+                    room_exits[DIRECTIONS[slot]] = room_id(world_index, target)
+            if i in portals:
+                room_exits["portal"] = portals[i]
+            adjective, place = rng.choice(ADJECTIVES), rng.choice(PLACES)
+            room = {
+                "id": room_id(world_index, i),
+                "short_desc": f"A {adjective} {place}",
+                "long_desc": f"You stand in a {adjective} {place}. {rng.choice(DETAILS)}",
+                "exits": room_exits,
+                "items": [rng.choice(item_ids)] if item_ids and rng.random() < item_density else [],
+                "npcs": npc_rooms.get(i, [])
+            }
+            f.write(("" if i == 0 else ",\n") + json.dumps(room))
+        f.write("\n]}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic game content for scale testing")
+    parser.add_argument("--out", required=True, help="Data directory to write (created if missing)")
+    parser.add_argument("--rooms", type=int, default=1000, help="Rooms per world (default: 1000)")
+    parser.add_argument("--worlds", type=int, default=1, help="Worlds to generate, linked by portals (default: 1)")
+    parser.add_argument("--topology", choices=["grid", "tree", "random"], default="grid",
+                        help="How rooms are connected (default: grid)")
+    parser.add_argument("--branching", type=int, default=3, help="Children per room for --topology tree (default: 3)")
+    parser.add_argument("--extra-edges", type=float, default=0.5,
+                        help="Extra links per room for --topology random (default: 0.5)")
+    parser.add_argument("--items", type=int, default=200, help="Item definitions (default: 200)")
+    parser.add_argument("--item-density", type=float, default=0.1, help="Chance a room holds an item (default: 0.1)")
+    parser.add_argument("--npcs", type=int, default=50, help="NPCs, each placed in one room (default: 50)")
+    parser.add_argument("--topic-depth", type=int, default=3, help="Depth of each NPC's dialogue tree (default: 3)")
+    parser.add_argument("--mobs", type=int, default=50, help="Mob definitions (default: 50)")
+    parser.add_argument("--spawn-rooms", type=int, default=10, help="Spawn rooms per mob (default: 10)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--force", action="store_true", help="Overwrite an existing data directory")
+    args = parser.parse_args()
+
+    if args.rooms < 2 or args.worlds < 1:
+        parser.error("need at least 2 rooms and 1 world")
+    if not 1 <= args.branching <= SLOTS - 1:
+        parser.error(f"--branching must be between 1 and {SLOTS - 1}")
+    if os.path.exists(os.path.join(args.out, "worlds")):
+        if not args.force:
+            parser.error(f"{args.out} already has content; use --force to overwrite it")
+        shutil.rmtree(os.path.join(args.out, "worlds"))
+    os.makedirs(os.path.join(args.out, "worlds"), exist_ok=True)
+
+    start = time.perf_counter()
+    rng = random.Random(args.seed)
+    items = make_items(args.items, rng)
+    npcs = make_npcs(args.npcs, items, rng, args.topic_depth, 2)
+    mobs = make_mobs(args.mobs, items, rng, args.spawn_rooms, args.worlds, args.rooms)
+
+    def write(filename: str, data: Dict) -> None:
+        with open(os.path.join(args.out, filename), 'w') as f:
+            json.dump(data, f, indent=2)
+
+    write("items.json", {"items": items})
+    write("npcs.json", {"npcs": npcs})
+    write("mobs.json", {"mobs": mobs})
+    write("classes.json", make_classes(items))
+    if not os.path.exists(os.path.join(args.out, "characters.json")):
+        write("characters.json", {"characters": []})
+
+    # Each world's room 1 has a portal onward and the next world's room 0 one back
+    portals: Dict[int, Dict[int, Dict]] = {k: {} for k in range(args.worlds)}
+    for k in range(1, args.worlds):
+        portals[k - 1][1] = {"type": "world_transition", "target_world": world_name(k),
+                             "target_room": room_id(k, 0), "description": "A shimmering rift leads elsewhere."}
+        portals[k][0] = {"type": "world_transition", "target_world": world_name(k - 1),
+                         "target_room": room_id(k - 1, 1), "description": "A rift leads back the way you came."}
+
+    # Every NPC stands in exactly one room
+    npc_rooms: Dict[Tuple[int, int], List[str]] = {}
+    for npc in npcs:
+        npc_rooms.setdefault((rng.randrange(args.worlds), rng.randrange(args.rooms)), []).append(npc["id"])
+
+    item_ids = [item["id"] for item in items]
+    for k in range(args.worlds):
+        world_rng = random.Random(f"{args.seed}:{k}")
+        if args.topology == "grid":
+            exits = build_grid(args.rooms, world_rng)
+        elif args.topology == "tree":
+            exits = build_tree(args.rooms, world_rng, args.branching)
+        else:
+            exits = build_random(args.rooms, world_rng, args.extra_edges)
+        world_npcs = {room: ids for (world, room), ids in npc_rooms.items() if world == k}
+        write_world(os.path.join(args.out, "worlds", f"{world_name(k)}.json"), k, exits, args.rooms,
+                    world_rng, item_ids, args.item_density, world_npcs, portals[k])
+        del exits
+
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.worlds} {args.topology} worlds x {args.rooms} rooms, {len(items)} items, "
+          f"{len(npcs)} NPCs and {len(mobs)} mobs to {args.out} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 import json
 import os
+import sys
 from typing import Dict, List, Optional
 
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import write_json_atomic
+
 class ItemEditor:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
@@ -18,8 +23,7 @@ class ItemEditor:
 
     def save_items(self) -> None:
         """Save items to JSON file."""
-        with open(self.items_file, 'w') as f:
-            json.dump(self.items_data, f, indent=2)
+        write_json_atomic(self.items_file, self.items_data)
 
     def list_items(self) -> None:
         """List all items."""
@@ -0,0 +1,71 @@
+"""
+Upgrade every stored character to the current schema version.
+
+The game migrates characters.json when it starts, but that needs the whole
+store in memory. This tool streams it instead: characters are read, upgraded
+and written out one at a time, so memory use stays flat however large the
+store is. The result is written crash-safely (temp file, fsync, rename) and
+the previous file is kept as characters.json.bak1.
+
+Usage (from the project root):
+    python tools/migrate_characters.py
+    python tools/migrate_characters.py --file data/characters.json --dry-run
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.migrations import CURRENT_SCHEMA_VERSION, iter_characters, migrate_character
+from src.storage import replace_with_backups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate stored characters to the current schema")
+    parser.add_argument("--file", default=os.path.join("data", "characters.json"),
+                        help="Characters file to migrate (default: data/characters.json)")
+    parser.add_argument("--dry-run", action="store_true", help="Count what would change without writing")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"{args.file} not found.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    total = migrated = 0
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(args.file) + ".", suffix=".tmp",
+                                     dir=os.path.dirname(args.file) or ".")
+    try:
+        with open(args.file, 'r') as source, os.fdopen(fd, 'w') as out:
+            out.write('{\n  "characters": [')
+            for character in iter_characters(source):
+                migrated += migrate_character(character)
+                out.write(",\n    " if total else "\n    ")
+                out.write(json.dumps(character, indent=2).replace("\n", "\n    "))
+                total += 1
+            out.write("\n  ]\n}" if total else "]\n}")
+            out.flush()
+            os.fsync(out.fileno())
+    except (ValueError, KeyError, TypeError) as e:
+        os.unlink(temp_path)
+        print(f"Error: could not migrate {args.file}: {e}")
+        sys.exit(1)
+
+    if args.dry_run or not migrated:
+        os.unlink(temp_path)
+    else:
+        replace_with_backups(temp_path, args.file)
+
+    elapsed = time.perf_counter() - start
+    action = "would be upgraded" if args.dry_run else "upgraded"
+    print(f"{total} characters read, {migrated} {action} to schema version {CURRENT_SCHEMA_VERSION} "
+          f"in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
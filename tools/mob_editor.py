@@ -3,6 +3,10 @@ import os
 import sys
 from pathlib import Path
 
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import write_json_atomic
+
 def load_json(file_path):
     """Load JSON data from a file."""
     try:
@@ -13,8 +17,7 @@ def load_json(file_path):
 
 def save_json(file_path, data):
     """Save JSON data to a file."""
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    write_json_atomic(file_path, data)
 
 def get_mob_template():
     """Return a template for a new mob."""
@@ -32,7 +35,9 @@ def get_mob_template():
             "xp_value": 15
         },
         "loot_table": {},
-        "spawn_areas": []
+        "spawn_areas": [],
+        "max_per_room": 1,
+        "respawn_time": 300
     }
 
 def list_mobs(mobs_data):
@@ -76,6 +81,8 @@ def create_mob(mobs_data):
         mob["stats"]["attack"] = int(input("Enter attack value (default 5): ") or "5")
         mob["stats"]["defense"] = int(input("Enter defense value (default 2): ") or "2")
         mob["stats"]["xp_value"] = int(input("Enter XP value (default 15): ") or "15")
+        mob["max_per_room"] = int(input("Enter max per room (default 1): ") or "1")
+        mob["respawn_time"] = int(input("Enter respawn time in seconds (default 300): ") or "300")
     except ValueError:
         print("Error: Please enter valid numbers for stats!")
         return
@@ -158,6 +165,14 @@ def edit_mob(mobs_data):
         new_xp = input(f"XP Value [{mob['stats']['xp_value']}]: ").strip()
         if new_xp:
             mob["stats"]["xp_value"] = int(new_xp)
+        
+        new_max = input(f"Max per room [{mob.get('max_per_room', 1)}]: ").strip()
+        if new_max:
+            mob["max_per_room"] = int(new_max)
+        
+        new_respawn = input(f"Respawn time [{mob.get('respawn_time', 300)}]: ").strip()
+        if new_respawn:
+            mob["respawn_time"] = int(new_respawn)
     except ValueError:
         print("Error: Please enter valid numbers for stats!")
         return
@@ -0,0 +1,59 @@
+"""
+Validate all game content in one pass.
+
+Loads every world plus items.json, npcs.json, mobs.json and classes.json and
+reports broken references (errors) and likely mistakes (warnings):
+
+- Dangling exits and portals to missing worlds or rooms
+- One-way exits and rooms unreachable from the start room
+- Unknown items and NPCs referenced by rooms, mobs, merchants, quests,
+  portals and class starting equipment, and dialogue links to unknown topics
+- Items and NPCs that nothing refers to, and mobs that never spawn
+
+Exits with status 1 if there are errors (or warnings, with --strict).
+
+Usage (from the project root):
+    python tools/validate_content.py
+    python tools/validate_content.py --data-dir data --strict
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.content_validator import ContentValidator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate game content")
+    parser.add_argument("--data-dir", default="data", help="Directory containing the content files (default: data)")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+    parser.add_argument("--errors-only", action="store_true", help="Don't print warnings")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    validator = ContentValidator.from_directory(args.data_dir)
+    validator.validate()
+    elapsed = time.perf_counter() - start
+
+    errors = validator.errors
+    warnings = validator.warnings
+    for error in errors:
+        print(f"ERROR: {error}")
+    if not args.errors_only:
+        for warning in warnings:
+            print(f"WARNING: {warning}")
+
+    rooms = sum(len(world.get("rooms", [])) for world in validator.worlds.values())
+    print(f"\nChecked {len(validator.worlds)} worlds, {rooms} rooms in {elapsed:.2f}s: "
+          f"{len(errors)} errors, {len(warnings)} warnings")
+
+    if errors or (args.strict and warnings):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 import json
 import os
+import sys
 from typing import Dict, List, Optional, Set
 
+# Allow importing the game engine when run as a script from tools/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.content_validator import ContentValidator
+from src.storage import write_json_atomic
+
 class WorldEditor:
     def __init__(self, data_dir: str = "data/worlds"):
         self.data_dir = data_dir
@@ -44,30 +50,21 @@ class WorldEditor:
             return
         
         file_path = os.path.join(self.data_dir, f"{self.current_world}.json")
-        with open(file_path, 'w') as f:
-            json.dump(self.world_data, f, indent=2)
+        write_json_atomic(file_path, self.world_data)
 
     def validate_world(self) -> List[str]:
         """Validate the current world for errors."""
         if not self.current_world:
             return ["No world is currently loaded"]
 
-        errors = []
-        room_ids = {room["id"] for room in self.world_data.get("rooms", [])}
-
-        # Check for duplicate room IDs
-        seen_ids = set()
-        for room in self.world_data.get("rooms", []):
-            if room["id"] in seen_ids:
-                errors.append(f"Duplicate room ID: {room['id']}")
-            seen_ids.add(room["id"])
-
-        # Check for invalid exits
-        for room in self.world_data.get("rooms", []):
-            for direction, target_id in room.get("exits", {}).items():
-                if target_id not in room_ids:
-                    errors.append(f"Room {room['id']} has invalid exit {direction} to non-existent room {target_id}")
+        # Check against all content so portals, items and NPCs resolve, using the unsaved edits
+        validator = ContentValidator.from_directory(os.path.dirname(os.path.normpath(self.data_dir)))
+        validator.worlds[self.current_world] = self.world_data
+        validator.validate()
 
+        errors = [issue.message for issue in validator.errors if issue.world == self.current_world]
+        errors.extend(f"Warning: {issue.message}" for issue in validator.warnings
+                      if issue.world == self.current_world)
         return errors
 
     def list_rooms(self) -> None: